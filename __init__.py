@@ -11,21 +11,32 @@ from .typicality_utils import initialize_typical_frames
 
 from .typicality_utils import update_typical_frames
 
+from .typicality_utils import update_typical_frames_bulk
+
+from .typicality_utils import compact_typicality_journal
+
 from .typicality_utils import create_lexical_lookup_per_eventtype
 
+from .typicality_utils import create_lexical_lookups
+
+from .typicality_utils import refresh_lexical_lookups
+
+from .lexical_lookup import LexicalLookup
+
 from .lexicon_utils import lemmas_from_lu_name
 
+from .rdf_utils import load_premon
+
 ## loading
+# PreMOn is only loaded on first access of LexicalDataD2TAnnotationTool.premon,
+# or explicitly using load_premon
 import os
-from .rdf_utils import load_nt_graph
+from .rdf_utils import DEFAULT_PREMON_NT as premon_nt
+from .rdf_utils import get_premon
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
-premon_nt = os.path.join(dir_path, 'res/premon/premon-2018a-fn17-noinf.nt')
-if os.path.exists(premon_nt):
-    premon = load_nt_graph(nt_path=premon_nt)
-else:
-    print('please run bash install.sh')
-
-
-
 
+def __getattr__(name):
+    if name == 'premon':
+        return get_premon()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
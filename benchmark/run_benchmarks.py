@@ -0,0 +1,235 @@
+"""
+time each stage of the pipeline on synthetic FrameNets of several sizes, without network access
+
+usage (from the benchmark folder):
+    python run_benchmarks.py --scales 100,300,1000 --lus_per_frame 10 --num_event_types 10 --output results.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+
+sys.path.append('../../')
+
+from LexicalDataD2TAnnotationTool import lexicon_utils
+from LexicalDataD2TAnnotationTool import create_lexicon_data_annotation_tool
+from LexicalDataD2TAnnotationTool import add_frame_to_info, add_lu_to_info, add_lemma_to_pos_to_lu_urls
+from LexicalDataD2TAnnotationTool import initialize_typical_frames, update_typical_frames
+from LexicalDataD2TAnnotationTool import create_lexical_lookup_per_eventtype, create_lexical_lookups
+from LexicalDataD2TAnnotationTool import load_premon
+from LexicalDataD2TAnnotationTool.rdf_utils import load_nt_parallel
+
+import synthetic_framenet
+from synthetic_framenet import SyntheticFrameNet, write_premon_nt
+
+# without FrameNetNLTK (see install.sh), the lexical unit URIs are generated by the synthetic fixtures
+if not hasattr(lexicon_utils, 'generate_le_and_lu_rdf_uri'):
+    lexicon_utils.generate_lexicon_rdf_uri = synthetic_framenet.generate_lexicon_rdf_uri
+    lexicon_utils.generate_le_and_lu_rdf_uri = synthetic_framenet.generate_le_and_lu_rdf_uri
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+doc_folder = os.path.join(dir_path, '..', 'doc', 'lexicon_data_for_frame_annotation_tool')
+
+
+def run_pipeline(your_fn, tmp_dir, num_event_types=10, workers=1, output_format='pretty'):
+    """
+    run all stages of the pipeline on a FrameNet
+
+    :rtype: dict
+    :return: stage -> seconds
+    """
+    stage_to_seconds = {}
+
+    def timed(stage, function, **kwargs):
+        start = time.perf_counter()
+        function(**kwargs)
+        stage_to_seconds[stage] = time.perf_counter() - start
+
+    out_dir = os.path.join(tmp_dir, 'lexicon_data_for_frame_annotation_tool')
+    premon_nt_path = os.path.join(tmp_dir, 'premon.nt')
+    write_premon_nt(your_fn, premon_nt_path)
+
+    start = time.perf_counter()
+    premon = load_premon(path=premon_nt_path, reload=True)
+    stage_to_seconds['load_premon'] = time.perf_counter() - start
+
+    # cold start of the full PreMOn file, parsed by the workers
+    timed('load_nt_parallel', load_nt_parallel,
+          nt_path=premon_nt_path,
+          workers=workers)
+
+    timed('create_lexicon_data_annotation_tool', create_lexicon_data_annotation_tool,
+          path_readme=os.path.join(doc_folder, 'README.md'),
+          path_ud_information=os.path.join(doc_folder, 'part_of_speech_ud_info.json'),
+          path_mapping_ud_pos_to_fn_pos=os.path.join(doc_folder, 'ud_pos_to_fn_pos.json'),
+          output_folder=out_dir)
+
+    timed('add_frame_to_info', add_frame_to_info,
+          output_folder=out_dir,
+          fn_en=your_fn,
+          premon=premon,
+          workers=workers,
+          output_format=output_format)
+
+    timed('add_lu_to_info', add_lu_to_info,
+          your_fn=your_fn,
+          language='en',
+          premon=premon,
+          namespace='http://rdf.cltl.nl/',
+          major_version=1,
+          minor_version=7,
+          output_folder=out_dir,
+          workers=workers,
+          output_format=output_format)
+
+    timed('add_lemma_to_pos_to_lu_urls', add_lemma_to_pos_to_lu_urls,
+          output_folder=out_dir,
+          language='en',
+          output_format=output_format)
+
+    event_types = [f'Q{index}' for index in range(1, num_event_types + 1)]
+    frames = your_fn.frames()
+
+    start = time.perf_counter()
+    for event_type in event_types:
+        initialize_typical_frames(output_folder=out_dir,
+                                  fn_en=your_fn,
+                                  premon=premon,
+                                  event_type=event_type,
+                                  overwrite=True,
+                                  output_format=output_format)
+    stage_to_seconds['initialize_typical_frames'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index, event_type in enumerate(event_types):
+        frame_to_typicality = {frames[(index + offset) % len(frames)].name: round(1 - offset / 10, 1)
+                               for offset in range(10)}
+        update_typical_frames(output_folder=out_dir,
+                              premon=premon,
+                              event_type=event_type,
+                              frame_to_typicality=frame_to_typicality,
+                              frame_format='fn_label')
+    stage_to_seconds['update_typical_frames'] = time.perf_counter() - start
+
+    timed('create_lexical_lookup_per_eventtype', create_lexical_lookup_per_eventtype,
+          event_type=event_types[0],
+          language='en',
+          premon=premon,
+          output_folder=out_dir,
+          overwrite=True,
+          output_format=output_format,
+          expected_num_frames=None)
+
+    timed('create_lexical_lookups', create_lexical_lookups,
+          language='en',
+          premon=premon,
+          output_folder=out_dir,
+          event_types=event_types,
+          overwrite=True,
+          workers=workers,
+          output_format=output_format,
+          expected_num_frames=None)
+
+    return stage_to_seconds
+
+
+def get_scaling_exponent(sizes, seconds):
+    """
+    estimate k in seconds ~ size^k from the smallest and the largest size,
+    e.g., 1 for linear and 2 for quadratic stages
+
+    :rtype: float | None
+    """
+    if len(sizes) < 2 or min(seconds[0], seconds[-1]) <= 0 or sizes[0] == sizes[-1]:
+        return None
+    return math.log(seconds[-1] / seconds[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def run_benchmarks(scales,
+                   lus_per_frame=10,
+                   fes_per_frame=6,
+                   num_event_types=10,
+                   workers=1,
+                   output_format='pretty',
+                   seed=0,
+                   verbose=0):
+    """
+    run the pipeline on a synthetic FrameNet for each number of frames in scales
+
+    :rtype: dict
+    :return: 'scales' -> list of {'num_frames', 'num_lus', 'stages': stage -> seconds},
+    'scaling' -> stage -> scaling exponent (see get_scaling_exponent)
+    """
+    results = []
+    for num_frames in scales:
+        your_fn = SyntheticFrameNet(num_frames=num_frames,
+                                    lus_per_frame=lus_per_frame,
+                                    fes_per_frame=fes_per_frame,
+                                    seed=seed)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            stage_to_seconds = run_pipeline(your_fn,
+                                            tmp_dir,
+                                            num_event_types=num_event_types,
+                                            workers=workers,
+                                            output_format=output_format)
+        results.append({'num_frames': num_frames,
+                        'num_lus': len(your_fn.lus()),
+                        'stages': stage_to_seconds})
+        if verbose:
+            print(f'{your_fn}: {sum(stage_to_seconds.values()):.2f} seconds')
+
+    num_lus = [result['num_lus'] for result in results]
+    scaling = {stage: get_scaling_exponent(num_lus, [result['stages'][stage] for result in results])
+               for stage in results[0]['stages']}
+
+    return {'scales': results,
+            'scaling': scaling}
+
+
+def print_report(benchmark_results):
+    """
+    print the seconds per stage and scale, and the scaling exponent of each stage
+    """
+    results = benchmark_results['scales']
+    header = ['stage'] + [f'{result["num_frames"]} frames' for result in results] + ['scaling']
+    rows = []
+    for stage, exponent in benchmark_results['scaling'].items():
+        row = [stage] + [f'{result["stages"][stage]:.3f}s' for result in results]
+        row.append('n/a' if exponent is None else f'n^{exponent:.2f}')
+        rows.append(row)
+
+    widths = [max(len(row[index]) for row in [header] + rows)
+              for index in range(len(header))]
+    for row in [header] + rows:
+        print('  '.join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='time each stage of the pipeline on synthetic FrameNets')
+    parser.add_argument('--scales', default='100,300,1000',
+                        help='comma-separated numbers of frames')
+    parser.add_argument('--lus_per_frame', type=int, default=10)
+    parser.add_argument('--fes_per_frame', type=int, default=6)
+    parser.add_argument('--num_event_types', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output_format', default='pretty')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='path of a JSON file to which the results are written')
+    args = parser.parse_args()
+
+    benchmark_results = run_benchmarks(scales=[int(scale) for scale in args.scales.split(',')],
+                                       lus_per_frame=args.lus_per_frame,
+                                       fes_per_frame=args.fes_per_frame,
+                                       num_event_types=args.num_event_types,
+                                       workers=args.workers,
+                                       output_format=args.output_format,
+                                       seed=args.seed,
+                                       verbose=1)
+    print_report(benchmark_results)
+
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(benchmark_results, outfile, indent=4)
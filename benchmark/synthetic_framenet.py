@@ -0,0 +1,157 @@
+"""
+synthetic FrameNet and PreMOn fixtures for the benchmarks, which do not require network access
+
+SyntheticFrameNet offers the part of the NLTK FrameNet API used by this package
+(frames(), lu(), and frames with .name, .definition, .URL, .FE and .lexUnit),
+and write_premon_nt writes the matching PreMOn triples in N-Triples format.
+Small instances are also used as fixtures by the tests.
+"""
+import random
+from types import SimpleNamespace
+
+PREMON_RESOURCE = 'http://premon.fbk.eu/resource/fn17-'
+RDF_TYPE = '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>'
+RDFS_LABEL = '<http://www.w3.org/2000/01/rdf-schema#label>'
+PREMON_SEM_ROLE = '<http://premon.fbk.eu/ontology/core#semRole>'
+PREMON_FN_FRAME = '<http://premon.fbk.eu/ontology/fn#Frame>'
+
+POS_TAGS = ['N', 'V', 'A', 'ADV', 'PREP']
+FE_LABELS = ['Agent', 'Theme', 'Place', 'Time', 'Manner', 'Means', 'Purpose', 'Cause']
+CORE_TYPES = ['Core', 'Peripheral', 'Extra-Thematic']
+
+
+class SyntheticFrameNet:
+    """
+    a FrameNet-like object with a configurable number of frames, lexical units and frame elements.
+    The same seed results in the same FrameNet.
+
+    Lemmas are shared between frames, and some lexical unit names contain optional parts,
+    e.g., take (after).v and take [picture].v, as in FrameNet.
+
+    :param int num_frames: number of frames
+    :param int lus_per_frame: number of lexical units per frame
+    :param int fes_per_frame: number of frame elements per frame, at most len(FE_LABELS)
+    :param int num_lemmas: size of the lemma vocabulary, if None, half the number of lexical units
+    :param int seed: seed of the random generator
+    """
+    def __init__(self,
+                 num_frames=100,
+                 lus_per_frame=10,
+                 fes_per_frame=6,
+                 num_lemmas=None,
+                 seed=0):
+        assert fes_per_frame <= len(FE_LABELS), f'at most {len(FE_LABELS)} frame elements per frame'
+
+        rnd = random.Random(seed)
+        if num_lemmas is None:
+            num_lemmas = max(1, num_frames * lus_per_frame // 2)
+        lemmas = [f'lemma{index}' for index in range(num_lemmas)]
+
+        self._frames = []
+        self._id_to_lu = {}
+
+        for frame_index in range(num_frames):
+            frame_name = f'Frame_{frame_index}'
+
+            fes = {}
+            for fe_label in FE_LABELS[:fes_per_frame]:
+                fes[fe_label] = SimpleNamespace(name=fe_label,
+                                                definition=f'The {fe_label} of {frame_name}.',
+                                                coreType=rnd.choice(CORE_TYPES))
+
+            lus = {}
+            while len(lus) < lus_per_frame:
+                lemma = rnd.choice(lemmas)
+                variant = rnd.random()
+                if variant < 0.1:
+                    lemma = f'{lemma} (up)'
+                elif variant < 0.15:
+                    lemma = f'{lemma} [thing]'
+                elif variant < 0.3:
+                    lemma = f'{lemma} {rnd.choice(lemmas)}'
+
+                pos = rnd.choice(POS_TAGS)
+                lu_name = f'{lemma}.{pos.lower()}'
+                if lu_name in lus:
+                    continue
+
+                # the optional parts, e.g., (up) and [thing], are not lexemes
+                words = [word for word in lemma.split() if word[0] not in '([']
+                lexemes = [{'order': str(order), 'name': word, 'breakBefore': 'false', 'POS': pos}
+                           for order, word in enumerate(words, 1)]
+                lu = SimpleNamespace(ID=len(self._id_to_lu) + 1,
+                                     name=lu_name,
+                                     POS=pos,
+                                     definition=f'COD: {lu_name} in {frame_name}.',
+                                     lexemes=lexemes)
+                lus[lu_name] = lu
+                self._id_to_lu[lu.ID] = lu
+
+            frame = SimpleNamespace(ID=frame_index + 1,
+                                    name=frame_name,
+                                    definition=f'The definition of {frame_name}.',
+                                    URL=f'https://framenet2.icsi.berkeley.edu/fnReports/data/frame/{frame_name}.xml',
+                                    FE=fes,
+                                    lexUnit=lus)
+            for lu in lus.values():
+                lu.frame = frame
+            self._frames.append(frame)
+
+    def __repr__(self):
+        return f'SyntheticFrameNet({len(self._frames)} frames, {len(self._id_to_lu)} lexical units)'
+
+    def frames(self):
+        return list(self._frames)
+
+    def lus(self):
+        return list(self._id_to_lu.values())
+
+    def lu(self, fn_luid):
+        return self._id_to_lu[fn_luid]
+
+
+def get_premon_frame_uri(frame_name):
+    return f'{PREMON_RESOURCE}{frame_name.lower()}'
+
+
+def write_premon_nt(your_fn, nt_path):
+    """
+    write the PreMOn triples of the frames and frame elements of a FrameNet in N-Triples format,
+    i.e., the triples used by rdf_utils.PremonIndex
+
+    :param your_fn: e.g., a SyntheticFrameNet
+
+    :rtype: int
+    :return: the number of triples
+    """
+    num_triples = 0
+    with open(nt_path, 'w', encoding='utf-8') as outfile:
+        for frame in your_fn.frames():
+            frame_uri = get_premon_frame_uri(frame.name)
+            lines = [f'<{frame_uri}> {RDF_TYPE} {PREMON_FN_FRAME} .',
+                     f'<{frame_uri}> {RDFS_LABEL} "{frame.name}" .']
+            for fe_label in frame.FE:
+                fe_uri = f'{frame_uri}@{fe_label.lower()}'
+                lines.append(f'<{frame_uri}> {PREMON_SEM_ROLE} <{fe_uri}> .')
+                lines.append(f'<{fe_uri}> {RDFS_LABEL} "{fe_label}" .')
+
+            outfile.write('\n'.join(lines) + '\n')
+            num_triples += len(lines)
+
+    return num_triples
+
+
+def generate_lexicon_rdf_uri(namespace, language, major_version, minor_version):
+    """
+    lexicon URI in the benchmarks if FrameNetNLTK (see install.sh) is not installed
+    """
+    return f'{namespace}{language}-lexicon-{major_version}.{minor_version}'
+
+
+def generate_le_and_lu_rdf_uri(your_fn, namespace, language, major_version, minor_version, lu_id):
+    """
+    lexical entry, lexical form and lexical unit URIs in the benchmarks if FrameNetNLTK (see install.sh) is not installed
+    """
+    lu = your_fn.lu(lu_id)
+    base = f'{namespace}fn_{language}-{major_version}.{minor_version}'
+    return f'{base}-le-{lu.name}', f'{base}-leform-{lu.name}', f'{base}-lu-{lu_id}'
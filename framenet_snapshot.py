@@ -0,0 +1,219 @@
+from .io_utils import dump_data, load_data, find_data_path
+from .manifest_utils import framenet_fingerprint
+from .instrumentation import instrumented, count
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class SnapshotFrameElement:
+    __slots__ = ('name', 'definition', 'coreType')
+
+    def __init__(self, name, definition, coreType):
+        self.name = name
+        self.definition = definition
+        self.coreType = coreType
+
+    def __repr__(self):
+        return f'<fe name={self.name}>'
+
+
+class SnapshotLexicalUnit:
+    __slots__ = ('ID', 'name', 'POS', 'definition', 'lexemes', 'frame')
+
+    def __init__(self, ID, name, POS, definition, lexemes, frame=None):
+        self.ID = ID
+        self.name = name
+        self.POS = POS
+        self.definition = definition
+        self.lexemes = lexemes
+        self.frame = frame
+
+    def __repr__(self):
+        return f'<lu ID={self.ID} name={self.name}>'
+
+
+class SnapshotFrame:
+    __slots__ = ('name', 'definition', 'URL', 'FE', 'lexUnit')
+
+    def __init__(self, name, definition, URL, FE, lexUnit):
+        self.name = name
+        self.definition = definition
+        self.URL = URL
+        self.FE = FE
+        self.lexUnit = lexUnit
+
+    def __repr__(self):
+        return f'<frame name={self.name}>'
+
+
+class FrameNetSnapshot:
+    """
+    compact snapshot of the parts of a FrameNet in NLTK format that are used by this package,
+    which can be passed instead of the NLTK FrameNet to add_frame_to_info, add_lu_to_info and initialize_typical_frames:
+
+    frames(): frames with .name, .definition, .URL,
+    .FE (label -> frame element with .name, .definition and .coreType)
+    and .lexUnit (lu name -> lexical unit with .ID, .name, .POS, .definition, .lexemes and .frame)
+    lu(fn_luid): the lexical unit with an ID
+
+    The NLTK FrameNet is traversed once by from_framenet, see also get_framenet_snapshot.
+
+    :param list frames: list of SnapshotFrame
+    :param str source_fingerprint: see manifest_utils.framenet_fingerprint of the FrameNet the snapshot was created from
+    """
+    def __init__(self, frames, source_fingerprint=None):
+        self._frames = frames
+        self.source_fingerprint = source_fingerprint
+
+        self._id_to_lu = {}
+        for frame in frames:
+            for lu in frame.lexUnit.values():
+                self._id_to_lu[lu.ID] = lu
+
+    def __repr__(self):
+        return f'FrameNetSnapshot({len(self._frames)} frames, {len(self._id_to_lu)} lexical units)'
+
+    def frames(self):
+        return list(self._frames)
+
+    def lus(self):
+        return list(self._id_to_lu.values())
+
+    def lu(self, fn_luid):
+        assert fn_luid in self._id_to_lu, f'no lexical unit found with ID {fn_luid}'
+        return self._id_to_lu[fn_luid]
+
+    @classmethod
+    @instrumented
+    def from_framenet(cls, your_fn, source_fingerprint=None):
+        """
+        traverse a FrameNet in NLTK format once
+
+        :param your_fn: a FrameNet in NLTK format, e.g., nltk.corpus.framenet
+        :param str source_fingerprint: see manifest_utils.framenet_fingerprint, computed if not provided
+
+        :rtype: FrameNetSnapshot
+        """
+        frames = []
+        for fn_frame in your_fn.frames():
+            fes = {fe_label: SnapshotFrameElement(name=fe.name,
+                                                  definition=fe.definition,
+                                                  coreType=fe.coreType)
+                   for fe_label, fe in fn_frame.FE.items()}
+
+            lus = {}
+            for lu_name, fn_lu in fn_frame.lexUnit.items():
+                lexemes = [{key: str(value) for key, value in lexeme.items()}
+                           for lexeme in getattr(fn_lu, 'lexemes', [])]
+                lus[lu_name] = SnapshotLexicalUnit(ID=fn_lu.ID,
+                                                   name=fn_lu.name,
+                                                   POS=fn_lu.POS,
+                                                   definition=fn_lu.definition,
+                                                   lexemes=lexemes)
+
+            frame = SnapshotFrame(name=fn_frame.name,
+                                  definition=fn_frame.definition,
+                                  URL=fn_frame.URL,
+                                  FE=fes,
+                                  lexUnit=lus)
+            for lu in lus.values():
+                lu.frame = frame
+            frames.append(frame)
+
+        count('frames', len(frames))
+        count('lus', sum(len(frame.lexUnit) for frame in frames))
+
+        if source_fingerprint is None:
+            source_fingerprint = framenet_fingerprint(your_fn)
+
+        return cls(frames, source_fingerprint=source_fingerprint)
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        :return: JSON-serializable representation of the snapshot, see from_dict
+        """
+        frames = []
+        for frame in self._frames:
+            frames.append([frame.name,
+                           frame.definition,
+                           frame.URL,
+                           [[fe_label, fe.name, fe.definition, fe.coreType]
+                            for fe_label, fe in frame.FE.items()],
+                           [[lu_name, lu.ID, lu.name, lu.POS, lu.definition, lu.lexemes]
+                            for lu_name, lu in frame.lexUnit.items()]])
+
+        return {'format_version': SNAPSHOT_FORMAT_VERSION,
+                'source_fingerprint': self.source_fingerprint,
+                'frames': frames}
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        """
+        :rtype: FrameNetSnapshot
+        """
+        assert the_dict['format_version'] == SNAPSHOT_FORMAT_VERSION, f'unsupported snapshot format: {the_dict["format_version"]}'
+
+        frames = []
+        for name, definition, url, fes, lus in the_dict['frames']:
+            frame = SnapshotFrame(name=name,
+                                  definition=definition,
+                                  URL=url,
+                                  FE={fe_label: SnapshotFrameElement(fe_name, fe_definition, core_type)
+                                      for fe_label, fe_name, fe_definition, core_type in fes},
+                                  lexUnit={})
+            for lu_name, lu_id, name_of_lu, pos, lu_definition, lexemes in lus:
+                frame.lexUnit[lu_name] = SnapshotLexicalUnit(lu_id, name_of_lu, pos, lu_definition, lexemes, frame=frame)
+            frames.append(frame)
+
+        return cls(frames, source_fingerprint=the_dict['source_fingerprint'])
+
+    def save(self, path, output_format='gzip'):
+        """
+        save the snapshot, see io_utils.dump_data
+
+        :rtype: str
+        :return: the path of the written file
+        """
+        return dump_data(self.to_dict(), path, output_format=output_format)
+
+    @classmethod
+    def load(cls, path):
+        """
+        load a snapshot saved with FrameNetSnapshot.save
+
+        :rtype: FrameNetSnapshot
+        """
+        return cls.from_dict(load_data(path))
+
+
+@instrumented
+def get_framenet_snapshot(your_fn, path, output_format='gzip', verbose=0):
+    """
+    load the snapshot of a FrameNet in NLTK format from path,
+    the snapshot is (re)created if it does not exist or if it was created from another version of the FrameNet
+    (see manifest_utils.framenet_fingerprint)
+
+    :param your_fn: a FrameNet in NLTK format, e.g., nltk.corpus.framenet
+    :param str path: path of the snapshot, e.g., fn_en_snapshot.json
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
+
+    :rtype: FrameNetSnapshot
+    """
+    fingerprint = framenet_fingerprint(your_fn)
+
+    if find_data_path(path) is not None:
+        the_dict = load_data(path)
+        if all([the_dict.get('format_version') == SNAPSHOT_FORMAT_VERSION,
+                the_dict.get('source_fingerprint') == fingerprint]):
+            return FrameNetSnapshot.from_dict(the_dict)
+        if verbose:
+            print(f'snapshot at {path} is stale, recreating it')
+
+    snapshot = FrameNetSnapshot.from_framenet(your_fn, source_fingerprint=fingerprint)
+    snapshot_path = snapshot.save(path, output_format=output_format)
+
+    if verbose:
+        print(f'written {snapshot} to {snapshot_path}')
+
+    return snapshot
@@ -8,9 +8,9 @@ cd res
 mkdir premon
 cd premon
 wget https://knowledgestore.fbk.eu/files/premon/dataset/latest/premon-2018a-fn17-noinf.tql.gz
-gunzip premon-2018a-fn17-noinf.tql.gz
 cd ../..
-python -c 'import rdf_utils;g = rdf_utils.load_nquads_file(path_to_nquad_file="res/premon/premon-2018a-fn17-noinf.tql");rdf_utils.convert_nquads_to_nt(g, output_path="res/premon/premon-2018a-fn17-noinf.nt")'
+python -c 'import rdf_utils;rdf_utils.convert_nquads_to_nt_streaming(nquads_path="res/premon/premon-2018a-fn17-noinf.tql.gz", output_path="res/premon/premon-2018a-fn17-noinf.nt", verbose=1)'
+python -c 'import rdf_utils;rdf_utils.compile_premon_snapshot(nt_path="res/premon/premon-2018a-fn17-noinf.nt", verbose=1)'
 
 cd res
 git clone https://github.com/cltl/FrameNetNLTK
@@ -0,0 +1,265 @@
+import sys
+import json
+import time
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# the report to which the stages currently report, None if the pipeline is not instrumented
+_active_report = None
+
+# the statistics of a process of run_in_pool that count for the stages that started the pool
+_WORKER_STAGE = '<worker>'
+
+
+def get_max_rss():
+    """
+    :rtype: int | None
+    :return: the maximum resident set size of the process in bytes, None if it is not available, e.g., on Windows
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # in bytes on macOS, in kilobytes on Linux
+    if sys.platform == 'darwin':
+        return max_rss
+    return max_rss * 1024
+
+
+class InstrumentationReport:
+    """
+    statistics per stage (i.e., instrumented function) of a pipeline run, see instrument.
+
+    The statistics of a stage include those of the stages it calls,
+    e.g., the SPARQL queries of add_frame_to_info also count for the stages that called it.
+    Work done in the processes of run_in_pool is counted by the stage that started the pool:
+    each process returns its statistics with its result, which are merged in the main process (see merge).
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stage_to_stats = {}
+        self._stack = []
+        # maximum resident set size of the process when each active stage started
+        self._start_max_rss = []
+
+    def get_stats(self, stage):
+        if stage not in self.stage_to_stats:
+            self.stage_to_stats[stage] = {
+                'calls': 0,
+                'seconds': 0.0,
+                'sparql_queries': 0,
+                'frames': 0,
+                'lus': 0,
+                'bytes_written': {},
+                'peak_memory_bytes': 0
+            }
+        return self.stage_to_stats[stage]
+
+    def _update_peak_memory(self):
+        """
+        update the peak memory of the active stages:
+        with trace_memory, the peak of the memory allocated by Python since the last update,
+        otherwise, how much the maximum resident set size of the process increased since the stage started
+        """
+        if self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            # reset_peak requires Python 3.9, before that the peak is the peak since tracing started
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            for stats in self._stack:
+                stats['peak_memory_bytes'] = max(stats['peak_memory_bytes'], peak)
+            return
+
+        max_rss = get_max_rss()
+        if max_rss is None:
+            return
+        for stats, start_max_rss in zip(self._stack, self._start_max_rss):
+            stats['peak_memory_bytes'] = max(stats['peak_memory_bytes'], max_rss - start_max_rss)
+
+    def start_stage(self, stage):
+        self._update_peak_memory()
+        stats = self.get_stats(stage)
+        stats['calls'] += 1
+        self._stack.append(stats)
+        self._start_max_rss.append(get_max_rss() or 0)
+        return time.perf_counter()
+
+    def end_stage(self, start):
+        self._update_peak_memory()
+        stats = self._stack.pop()
+        self._start_max_rss.pop()
+        stats['seconds'] += time.perf_counter() - start
+
+    def count(self, counter, number=1):
+        for stats in self._stack:
+            stats[counter] += number
+
+    def record_bytes_written(self, path, num_bytes):
+        for stats in self._stack:
+            bytes_written = stats['bytes_written']
+            bytes_written[path] = bytes_written.get(path, 0) + num_bytes
+
+    def merge(self, stage_to_stats):
+        """
+        merge the statistics of a process of run_in_pool (see collect_worker_stats):
+        the counters and bytes written of the process count for the active stages,
+        the stages called in the process are added to the statistics of those stages
+        """
+        for stage, worker_stats in stage_to_stats.items():
+            if stage == _WORKER_STAGE:
+                for counter in ['sparql_queries', 'frames', 'lus']:
+                    self.count(counter, worker_stats[counter])
+                for path, num_bytes in worker_stats['bytes_written'].items():
+                    self.record_bytes_written(path, num_bytes)
+                continue
+
+            stats = self.get_stats(stage)
+            for key in ['calls', 'seconds', 'sparql_queries', 'frames', 'lus']:
+                stats[key] += worker_stats[key]
+            for path, num_bytes in worker_stats['bytes_written'].items():
+                stats['bytes_written'][path] = stats['bytes_written'].get(path, 0) + num_bytes
+            stats['peak_memory_bytes'] = max(stats['peak_memory_bytes'], worker_stats['peak_memory_bytes'])
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        :return: stage -> statistics (calls, seconds, sparql_queries, frames, lus,
+        bytes_written: path -> number of bytes, peak_memory_bytes)
+        """
+        return {stage: dict(stats, bytes_written=dict(stats['bytes_written']))
+                for stage, stats in self.stage_to_stats.items()}
+
+    def to_json(self, path=None):
+        """
+        export the report as JSON
+
+        :param str path: if provided, the JSON is written to this path
+
+        :rtype: str
+        """
+        the_json = json.dumps(self.to_dict(), indent=4, sort_keys=True)
+        if path is not None:
+            with open(path, 'w') as outfile:
+                outfile.write(the_json)
+        return the_json
+
+    def print_summary(self):
+        """
+        print one line per stage, in the order in which the stages were started
+        """
+        for stage, stats in self.stage_to_stats.items():
+            num_bytes = sum(stats['bytes_written'].values())
+            print(f'{stage}: {stats["calls"]} calls, {stats["seconds"]:.3f}s, '
+                  f'{stats["sparql_queries"]} SPARQL queries, {stats["frames"]} frames, {stats["lus"]} LUs, '
+                  f'{num_bytes} bytes written, peak memory {stats["peak_memory_bytes"]} bytes')
+
+
+@contextmanager
+def instrument(trace_memory=False):
+    """
+    collect an InstrumentationReport of the instrumented functions called in the with block
+
+    with instrument() as report:
+        add_frame_to_info(...)
+    report.to_json('report.json')
+
+    :param bool trace_memory: if True, the peak memory of a stage is the peak of the memory allocated by Python
+    during the stage (tracemalloc), which slows down the pipeline.
+    Otherwise, it is how much the stage increased the maximum resident set size of the process,
+    which is 0 for a stage that uses less memory than an earlier stage.
+
+    :rtype: InstrumentationReport
+    """
+    global _active_report
+
+    previous_report = _active_report
+    report = InstrumentationReport(trace_memory=trace_memory)
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    _active_report = report
+    try:
+        yield report
+    finally:
+        _active_report = previous_report
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def instrumented(function):
+    """
+    decorator that reports calls of a function as a stage to the active report, if any
+    """
+    stage = f'{function.__module__.rsplit(".", 1)[-1]}.{function.__qualname__}'
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        report = _active_report
+        if report is None:
+            return function(*args, **kwargs)
+
+        start = report.start_stage(stage)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            report.end_stage(start)
+
+    return wrapper
+
+
+def collect_worker_stats(function, *args):
+    """
+    call a function in a process of run_in_pool, collecting its statistics if the pool was started
+    by an instrumented stage, i.e., if the process inherited an active report
+
+    :rtype: tuple
+    :return: (the result of the function, the statistics to pass to merge_worker_stats, None if not instrumented)
+    """
+    global _active_report
+
+    if _active_report is None:
+        return function(*args), None
+
+    parent_report = _active_report
+    report = InstrumentationReport(trace_memory=parent_report.trace_memory)
+    report._stack.append(report.get_stats(_WORKER_STAGE))
+    report._start_max_rss.append(get_max_rss() or 0)
+
+    _active_report = report
+    try:
+        result = function(*args)
+    finally:
+        _active_report = parent_report
+
+    return result, report.to_dict()
+
+
+def merge_worker_stats(stage_to_stats):
+    """
+    merge the statistics returned by collect_worker_stats into the active report, if any
+    """
+    if _active_report is not None and stage_to_stats is not None:
+        _active_report.merge(stage_to_stats)
+
+
+def count(counter, number=1):
+    """
+    add to a counter of the active stages: sparql_queries | frames | lus
+    """
+    if _active_report is not None:
+        _active_report.count(counter, number)
+
+
+def record_bytes_written(path, num_bytes):
+    """
+    add the number of bytes written to a file to the active stages
+    """
+    if _active_report is not None:
+        _active_report.record_bytes_written(path, num_bytes)
@@ -0,0 +1,200 @@
+import io
+import os
+import json
+import gzip
+
+from .instrumentation import record_bytes_written
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# output format -> file extension that replaces .json
+OUTPUT_FORMATS = {
+    'pretty': '.json',
+    'minified': '.json',
+    'gzip': '.json.gz',
+    'msgpack': '.msgpack'
+}
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# first bytes of a msgpack map or array
+MSGPACK_FIRST_BYTES = set(range(0x80, 0xa0)) | {0xdc, 0xdd, 0xde, 0xdf}
+
+
+def get_base_path(path):
+    """
+    remove the extension of one of the output formats from a path,
+    e.g., lu_to_info.json.gz -> lu_to_info
+    """
+    for extension in sorted(set(OUTPUT_FORMATS.values()), key=len, reverse=True):
+        if path.endswith(extension):
+            return path[:-len(extension)]
+    return path
+
+
+def get_output_path(path, output_format='pretty'):
+    """
+    get the path to which data is written in an output format,
+    e.g., lu_to_info.json -> lu_to_info.json.gz for gzip
+
+    :param str path: path with or without the extension of one of the output formats
+    :param str output_format: pretty | minified | gzip | msgpack
+    """
+    assert output_format in OUTPUT_FORMATS, f'{output_format} is not supported: {" | ".join(OUTPUT_FORMATS)}'
+    return get_base_path(path) + OUTPUT_FORMATS[output_format]
+
+
+def find_data_path(path):
+    """
+    find the file with the data of a path in any of the output formats
+
+    :param str path: path with or without the extension of one of the output formats
+
+    :rtype: str | None
+    :return: the path of the existing file, None if there is none
+    """
+    if os.path.isfile(path):
+        return path
+
+    base_path = get_base_path(path)
+    for extension in OUTPUT_FORMATS.values():
+        if os.path.isfile(base_path + extension):
+            return base_path + extension
+
+    return None
+
+
+def detect_output_format(path):
+    """
+    detect the output format of a file written by dump_data
+
+    :param str path: path of an existing file
+
+    :rtype: str
+    :return: pretty | minified | gzip | msgpack
+    """
+    with open(path, 'rb') as infile:
+        start = infile.read(2)
+
+    if start.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if start and start[0] in MSGPACK_FIRST_BYTES:
+        return 'msgpack'
+    if start[1:2] == b'\n':
+        return 'pretty'
+    return 'minified'
+
+
+def _sort_keys(data):
+    if isinstance(data, dict):
+        return {key: _sort_keys(data[key])
+                for key in sorted(data)}
+    if isinstance(data, (list, tuple)):
+        return [_sort_keys(value) for value in data]
+    return data
+
+
+def dumps_data(data, output_format='pretty'):
+    """
+    serialize data in one of the output formats
+
+    :param data: JSON-serializable data
+    :param str output_format: pretty | minified | gzip | msgpack
+
+    :rtype: bytes
+    """
+    assert output_format in OUTPUT_FORMATS, f'{output_format} is not supported: {" | ".join(OUTPUT_FORMATS)}'
+
+    if output_format == 'pretty':
+        return json.dumps(data,
+                          indent=4,
+                          ensure_ascii=False,
+                          sort_keys=True).encode('utf-8')
+
+    if output_format == 'msgpack':
+        assert msgpack is not None, 'the msgpack output format requires msgpack: pip install msgpack'
+        return msgpack.packb(_sort_keys(data), use_bin_type=True)
+
+    minified = json.dumps(data,
+                          ensure_ascii=False,
+                          sort_keys=True,
+                          separators=(',', ':')).encode('utf-8')
+    if output_format == 'gzip':
+        # mtime=0 so that the same data results in the same bytes
+        # (GzipFile instead of gzip.compress, which only accepts mtime from Python 3.8 on)
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as outfile:
+            outfile.write(minified)
+        return buffer.getvalue()
+
+    return minified
+
+
+def dump_data(data, path, output_format='pretty'):
+    """
+    write data to disk in one of the output formats.
+    Files with the same data in another output format are removed.
+
+    :param data: JSON-serializable data
+    :param str path: path with or without the extension of one of the output formats,
+    the extension of the output format is used
+    :param str output_format: pretty | minified | gzip | msgpack
+
+    :rtype: str
+    :return: the path of the written file
+    """
+    output_path = get_output_path(path, output_format)
+
+    content = dumps_data(data, output_format)
+    with open(output_path, 'wb') as outfile:
+        outfile.write(content)
+    record_bytes_written(output_path, len(content))
+
+    remove_data(output_path, keep=output_path)
+
+    return output_path
+
+
+def remove_data(path, keep=None):
+    """
+    remove the files with the data of a path in all output formats
+
+    :param str path: path with or without the extension of one of the output formats
+    :param str keep: path of a file that should not be removed
+    """
+    base_path = get_base_path(path)
+    for extension in set(OUTPUT_FORMATS.values()):
+        other_path = base_path + extension
+        if other_path != keep and os.path.exists(other_path):
+            os.remove(other_path)
+
+
+def loads_data(content):
+    """
+    deserialize data in any of the output formats, which is detected from the content
+
+    :param bytes content: see dumps_data
+    """
+    if content.startswith(GZIP_MAGIC):
+        content = gzip.decompress(content)
+    elif content and content[0] in MSGPACK_FIRST_BYTES:
+        assert msgpack is not None, 'reading msgpack data requires msgpack: pip install msgpack'
+        return msgpack.unpackb(content, raw=False, strict_map_key=False)
+
+    return json.loads(content.decode('utf-8'))
+
+
+def load_data(path):
+    """
+    load data written by dump_data, the output format is detected automatically
+
+    :param str path: path with or without the extension of one of the output formats
+    """
+    data_path = find_data_path(path)
+    assert data_path is not None, f'{path} does not exist in any of the output formats'
+
+    with open(data_path, 'rb') as infile:
+        return loads_data(infile.read())
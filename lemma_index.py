@@ -0,0 +1,298 @@
+import os
+import json
+import mmap
+import struct
+
+from .io_utils import load_data
+from .instrumentation import instrumented, record_bytes_written
+from .manifest_utils import read_fingerprint
+from .shard_utils import sharded_lookup_exists, get_sharded_lookup_folder
+from .normalized_utils import load_lexicon_table, normalized_to_lexical_lookup
+from .typicality_utils import load_lexicon, get_lexicon_fingerprint, get_lexical_lookup_path
+
+MAGIC = b'LEMIDX01'
+
+# magic, number of lemmas, number of bytes of the metadata
+HEADER = struct.Struct('<8sII')
+OFFSET = struct.Struct('<Q')
+KEY_LENGTH = struct.Struct('<I')
+
+
+def write_lemma_index(lemma_to_value, path, metadata=None):
+    """
+    write a read-only lemma index, which is opened with LemmaIndex:
+
+    header: MAGIC, number of lemmas (uint32), number of bytes of the metadata (uint32)
+    metadata: JSON
+    offsets: number of lemmas + 1 uint64 file offsets of the records, the last one is the end of the file
+    records, sorted by the UTF-8 encoded lemma: length of the lemma (uint32), the UTF-8 encoded lemma, the value as JSON
+
+    The index is written to a temporary file that replaces the index,
+    so that processes that opened the previous index keep reading a complete file.
+
+    :param dict lemma_to_value: lemma -> JSON-serializable value
+    :param str path: path of the index
+    :param dict metadata: JSON-serializable metadata, see LemmaIndex.metadata
+
+    :rtype: str
+    :return: the path of the index
+    """
+    records = []
+    for lemma, value in lemma_to_value.items():
+        key = lemma.encode('utf-8')
+        content = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        records.append((key, content))
+    records.sort()
+
+    metadata_content = json.dumps(metadata or {}, ensure_ascii=False, sort_keys=True).encode('utf-8')
+
+    offsets = []
+    offset = HEADER.size + len(metadata_content) + OFFSET.size * (len(records) + 1)
+    for key, content in records:
+        offsets.append(offset)
+        offset += KEY_LENGTH.size + len(key) + len(content)
+    offsets.append(offset)
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as outfile:
+        outfile.write(HEADER.pack(MAGIC, len(records), len(metadata_content)))
+        outfile.write(metadata_content)
+        outfile.write(b''.join(OFFSET.pack(offset) for offset in offsets))
+        for key, content in records:
+            outfile.write(KEY_LENGTH.pack(len(key)))
+            outfile.write(key)
+            outfile.write(content)
+    os.replace(tmp_path, path)
+    record_bytes_written(path, offsets[-1])
+
+    return path
+
+
+class LemmaIndex:
+    """
+    read-only lemma index written by write_lemma_index.
+
+    The file is memory-mapped and a lemma is found by binary search over the sorted lemmas,
+    so opening the index does not parse it, and the worker processes of an annotation server
+    that open the same index share its pages through the page cache of the operating system.
+    Only the value of a requested lemma is decoded.
+
+    Open the index in each process, e.g., after forking, since a memory map can not be pickled.
+
+    with LemmaIndex(path) as index:
+        index.get('verkiezing')
+
+    :param str path: path of the index
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as infile:
+            self._mmap = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._num_lemmas, metadata_length = HEADER.unpack_from(self._mmap, 0)
+        assert magic == MAGIC, f'{path} is not a lemma index'
+
+        self._metadata_start = HEADER.size
+        self._offsets_start = HEADER.size + metadata_length
+        self._metadata = None
+
+    def __repr__(self):
+        return f'LemmaIndex({self.path!r}, {self._num_lemmas} lemmas)'
+
+    def __len__(self):
+        return self._num_lemmas
+
+    def __contains__(self, lemma):
+        return self._find(lemma) is not None
+
+    def __iter__(self):
+        for position in range(self._num_lemmas):
+            yield self._get_key(position).decode('utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def metadata(self):
+        """
+        the metadata of the index, decoded on first access
+
+        :rtype: dict
+        """
+        if self._metadata is None:
+            self._metadata = json.loads(self._mmap[self._metadata_start:self._offsets_start].decode('utf-8'))
+        return self._metadata
+
+    def _get_offset(self, position):
+        return OFFSET.unpack_from(self._mmap, self._offsets_start + OFFSET.size * position)[0]
+
+    def _get_key(self, position):
+        offset = self._get_offset(position)
+        key_length = KEY_LENGTH.unpack_from(self._mmap, offset)[0]
+        start = offset + KEY_LENGTH.size
+        return self._mmap[start:start + key_length]
+
+    def _find(self, lemma):
+        """
+        :rtype: int | None
+        :return: the position of the lemma, None if it is not in the index
+        """
+        key = lemma.encode('utf-8')
+        low, high = 0, self._num_lemmas
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self._num_lemmas and self._get_key(low) == key:
+            return low
+        return None
+
+    def get(self, lemma, default=None):
+        """
+        get the value of a lemma
+
+        :param str lemma: e.g., verkiezing
+
+        :return: the decoded value, default if the lemma is not in the index
+        """
+        position = self._find(lemma)
+        if position is None:
+            return default
+
+        offset = self._get_offset(position)
+        key_length = KEY_LENGTH.unpack_from(self._mmap, offset)[0]
+        start = offset + KEY_LENGTH.size + key_length
+        end = self._get_offset(position + 1)
+        return json.loads(self._mmap[start:end].decode('utf-8'))
+
+    def __getitem__(self, lemma):
+        value = self.get(lemma)
+        if value is None:
+            raise KeyError(lemma)
+        return value
+
+    def close(self):
+        self._mmap.close()
+
+
+def get_lexicon_index_path(output_folder, language):
+    """
+    :rtype: str
+    :return: lexicons/LANGUAGE/lemma_to_pos_to_lus.idx in the output folder
+    """
+    return os.path.join(output_folder, 'lexicons', language, 'lemma_to_pos_to_lus.idx')
+
+
+def get_lexical_lookup_index_path(output_folder, language, event_type):
+    """
+    :rtype: str
+    :return: typicality/lexical_lookup/LANGUAGE/EVENT_TYPE.idx in the output folder
+    """
+    lexical_lookup_path = get_lexical_lookup_path(output_folder, language, event_type)
+    return lexical_lookup_path[:-len('.json')] + '.idx'
+
+
+@instrumented
+def compile_lexicon_index(output_folder, language, verbose=0):
+    """
+    compile lu_to_info.json and lemma_to_pos_to_lus.json of a language (see add_lemma_to_pos_to_lu_urls)
+    into a lemma index at lexicons/LANGUAGE/lemma_to_pos_to_lus.idx, which maps
+
+    LEMMA
+        POS
+            list of {'lu_uri', 'lu_name', 'frame_uri', 'frame_label', 'lexicon_uri'},
+            in the order of lemma_to_pos_to_lus.json
+
+    The metadata contains 'kind': lexicon, 'language' and 'source_fingerprint' (see typicality_utils.get_lexicon_fingerprint).
+
+    :rtype: str
+    :return: the path of the index
+    """
+    lu_to_info, lemma_to_pos_to_lus = load_lexicon(output_folder, language)
+
+    lemma_to_pos_to_records = {}
+    for lemma, pos_to_lus in lemma_to_pos_to_lus.items():
+        pos_to_records = {}
+        for pos, lu_uris in pos_to_lus.items():
+            pos_to_records[pos] = [{'lu_uri': lu_uri,
+                                    'lu_name': lu_to_info[lu_uri]['lu_name'],
+                                    'frame_uri': lu_to_info[lu_uri]['frame_uri'],
+                                    'frame_label': lu_to_info[lu_uri]['frame_label'],
+                                    'lexicon_uri': lu_to_info[lu_uri]['lexicon_uri']}
+                                   for lu_uri in lu_uris]
+        lemma_to_pos_to_records[lemma] = pos_to_records
+
+    metadata = {'kind': 'lexicon',
+                'language': language,
+                'source_fingerprint': get_lexicon_fingerprint(output_folder, language)}
+
+    index_path = write_lemma_index(lemma_to_pos_to_records,
+                                   get_lexicon_index_path(output_folder, language),
+                                   metadata=metadata)
+    if verbose:
+        print(f'written lemma index with {len(lemma_to_pos_to_records)} lemmas to {index_path}')
+
+    return index_path
+
+
+def load_lexical_lookup(lexical_lookup_path):
+    """
+    load the lexical lookup of an event type in any layout (see typicality_utils.write_lexical_lookup)
+
+    :param str lexical_lookup_path: path of the lexical lookup in the single file layout
+
+    :rtype: dict
+    :return: the lexical lookup in the single file layout
+    """
+    if sharded_lookup_exists(lexical_lookup_path):
+        folder = get_sharded_lookup_folder(lexical_lookup_path)
+        index = load_data(os.path.join(folder, 'index.json'))
+        lexical_lookup = {}
+        for shard_path in index['shards'].values():
+            lexical_lookup.update(load_data(os.path.join(folder, shard_path)))
+        return {'ordered_frames': load_data(os.path.join(folder, index['ordered_frames'])),
+                'lexical_lookup': lexical_lookup}
+
+    the_json = load_data(lexical_lookup_path)
+    if 'frame_ids' in the_json:
+        table = load_lexicon_table(os.path.dirname(lexical_lookup_path))
+        return normalized_to_lexical_lookup(table, the_json)
+
+    return the_json
+
+
+@instrumented
+def compile_lexical_lookup_index(output_folder, language, event_type, verbose=0):
+    """
+    compile the lexical lookup of an event type (see create_lexical_lookup_per_eventtype)
+    into a lemma index at typicality/lexical_lookup/LANGUAGE/EVENT_TYPE.idx,
+    which maps a LEMMA to its value in 'lexical_lookup'.
+
+    The metadata contains 'kind': lexical_lookup, 'language', 'event_type', 'ordered_frames'
+    and 'source_fingerprint' (the fingerprint of the inputs of the lexical lookup, see refresh_lexical_lookups).
+
+    :rtype: str
+    :return: the path of the index
+    """
+    lexical_lookup_path = get_lexical_lookup_path(output_folder, language, event_type)
+    the_json = load_lexical_lookup(lexical_lookup_path)
+
+    metadata = {'kind': 'lexical_lookup',
+                'language': language,
+                'event_type': event_type,
+                'ordered_frames': the_json['ordered_frames'],
+                'source_fingerprint': read_fingerprint(lexical_lookup_path)}
+
+    index_path = write_lemma_index(the_json['lexical_lookup'],
+                                   get_lexical_lookup_index_path(output_folder, language, event_type),
+                                   metadata=metadata)
+    if verbose:
+        print(f'written lemma index of the lexical lookup of {event_type} to {index_path}')
+
+    return index_path
@@ -0,0 +1,127 @@
+from functools import lru_cache
+
+from .typicality_utils import load_lexicon, load_typicality_scores, get_event_types
+from .typicality_utils import get_dropdown_values
+
+
+class LexicalLookup:
+    """
+    query the lexical lookup of any event type without writing it to disk.
+
+    The lexicon of a language (lu_to_info.json and lemma_to_pos_to_lus.json) is loaded once.
+    The ranked dropdown entries of a lemma and pos are computed on demand,
+    and are the same as in the lexical lookup created by create_lexical_lookup_per_eventtype.
+
+    Both the typicality scores of the event types and the dropdown entries are kept in a bounded LRU cache.
+
+    :param str output_folder: the main folder for the lexical data
+    :param str language: supported: nl | en
+    :param int cache_size: maximum number of (lemma, pos, event_type) entries in the cache
+    :param int scores_cache_size: maximum number of event types of which the typicality scores are cached
+    """
+    def __init__(self,
+                 output_folder,
+                 language,
+                 cache_size=1024,
+                 scores_cache_size=128):
+        self.output_folder = output_folder
+        self.language = language
+
+        self.lu_to_info, self.lemma_to_pos_to_lus = load_lexicon(output_folder, language)
+
+        # event type -> version, which is part of the cache keys, see invalidate
+        self._event_type_to_version = {}
+        self._get_scores = lru_cache(maxsize=scores_cache_size)(self._load_scores)
+        self._get_values = lru_cache(maxsize=cache_size)(self._compute_values)
+
+    def __repr__(self):
+        return f'LexicalLookup(output_folder={self.output_folder!r}, language={self.language!r})'
+
+    def __contains__(self, lemma):
+        return lemma in self.lemma_to_pos_to_lus
+
+    def _load_scores(self, event_type, version):
+        return load_typicality_scores(self.output_folder, event_type)
+
+    def _compute_values(self, lemma, pos, event_type, version):
+        lu_uris = self.lemma_to_pos_to_lus.get(lemma, {}).get(pos, [])
+        values = get_dropdown_values(lu_uris=lu_uris,
+                                     lu_to_info=self.lu_to_info,
+                                     frame_to_score=self._get_scores(event_type, version))
+        # cached as tuples, so that callers can not modify the cache
+        return tuple(tuple(value) for value in values)
+
+    def get_event_types(self):
+        """
+        get the event types for which there are typicality scores
+
+        :rtype: list
+        """
+        return get_event_types(self.output_folder)
+
+    def get(self, lemma, pos, event_type):
+        """
+        get the ranked dropdown entries of a lemma and pos for an event type
+
+        :param str lemma: e.g., verkiezing
+        :param str pos: e.g., N
+        :param str event_type: e.g., Q40231
+
+        :rtype: list
+        :return: list of [typicality_score, dropdown_label, frame_uri, lu_uri, lu_name, lexicon_url],
+        sorted by typicality score. Empty if the lemma and pos are not in the lexicon.
+        Raises an AssertionError if there are no typicality scores for the event type.
+        """
+        version = self._event_type_to_version.get(event_type, 0)
+        return [list(value)
+                for value in self._get_values(lemma, pos, event_type, version)]
+
+    def get_lemma(self, lemma, event_type):
+        """
+        get the entry of a lemma in the lexical lookup of an event type
+
+        :rtype: dict
+        :return: POS -> ranked dropdown entries (see get), and 'all_frames' -> sorted list of frame uris.
+        Empty if the lemma is not in the lexicon.
+        """
+        if lemma not in self.lemma_to_pos_to_lus:
+            return {}
+
+        pos_to_dropdown = {pos: self.get(lemma, pos, event_type)
+                           for pos in self.lemma_to_pos_to_lus[lemma]}
+        pos_to_dropdown['all_frames'] = sorted({value[2]
+                                                for values in pos_to_dropdown.values()
+                                                for value in values})
+        return pos_to_dropdown
+
+    def clear_cache(self):
+        """
+        discard all cached typicality scores and dropdown entries,
+        e.g., after update_typical_frames was called.
+        """
+        self._get_scores.cache_clear()
+        self._get_values.cache_clear()
+        self._event_type_to_version.clear()
+
+    def invalidate(self, event_type=None):
+        """
+        discard the cached typicality scores and dropdown entries of an event type,
+        e.g., after update_typical_frames was called for it.
+        The cached entries of the other event types are kept,
+        the discarded ones are no longer used and are evicted by the LRU caches.
+
+        :param str event_type: e.g., Q40231, if None, the whole cache is discarded (see clear_cache)
+        """
+        if event_type is None:
+            self.clear_cache()
+            return
+
+        self._event_type_to_version[event_type] = self._event_type_to_version.get(event_type, 0) + 1
+
+    def cache_info(self):
+        """
+        :rtype: dict
+        :return: 'scores' and 'values' -> functools cache statistics (hits, misses, maxsize, currsize)
+        """
+        return {'scores': self._get_scores.cache_info(),
+                'values': self._get_values.cache_info()}
@@ -1,13 +1,16 @@
 import os
 import shutil
-import json
 import re
-from collections import defaultdict
 
 from .rdf_utils import get_rdf_uri
-from .rdf_utils import get_fe_uris_and_labels
+from .rdf_utils import get_fe_uris_and_labels_of_frames
+from .rdf_utils import get_premon_index
 
-from .utils import remove_and_create_folder
+from .utils import remove_and_create_folder, file_sha256, run_in_pool
+from .manifest_utils import compute_fingerprint, framenet_fingerprint, premon_fingerprint
+from .manifest_utils import is_up_to_date, record_artifact
+from .io_utils import dump_data, load_data, find_data_path, get_output_path
+from .instrumentation import instrumented, count, record_bytes_written
 
 try:
     from .res.FrameNetNLTK import generate_le_and_lu_rdf_uri, generate_lexicon_rdf_uri
@@ -47,10 +50,12 @@ def lemma_from_lexemes(lexemes,
     lemma = ''.join(parts)
     return lemma
 
+@instrumented
 def create_lexicon_data_annotation_tool(path_readme,
                                         path_ud_information,
                                         path_mapping_ud_pos_to_fn_pos,
                                         output_folder,
+                                        incremental=False,
                                         verbose=0):
     """
     create a folder with FrameNet information to be used in the annotation tool
@@ -60,61 +65,63 @@ def create_lexicon_data_annotation_tool(path_readme,
     :param str path_ud_information: JSON file mapping UD pos tag to more information about the label
     :param str path_mapping_ud_pos_to_fn_pos: JSON file mapping UD pos tag to FN pos tag
     :param str output_folder: where the folder should be stored, e.g., "lexicon_data_annotation_tool"
+    :param bool incremental: if True, the existing folder is kept and files are only copied
+    if their content changed according to the manifest of the folder
     """
     # recreate folder if needed
-    if os.path.exists(output_folder):
+    if os.path.exists(output_folder) and not incremental:
         shutil.rmtree(output_folder)
-    os.mkdir(output_folder)
+    if not os.path.exists(output_folder):
+        os.mkdir(output_folder)
 
     pos_folder = os.path.join(output_folder, 'part_of_speech')
     if not os.path.exists(pos_folder):
         os.mkdir(pos_folder)
 
-    # write readme
-    output_path_readme = os.path.join(output_folder, 'README.md')
-    shutil.copy(path_readme, output_path_readme)
+    for input_path, artifact, description in [
+        (path_readme, 'README.md', 'README'),
+        (path_ud_information, 'part_of_speech/part_of_speech_ud_info.json', 'UD information'),
+        (path_mapping_ud_pos_to_fn_pos, 'part_of_speech/ud_pos_to_fn_pos.json', 'mapping UD to FN')
+    ]:
+        output_path = os.path.join(output_folder, artifact)
+        fingerprint = compute_fingerprint({'input': file_sha256(input_path)})
 
-    if verbose:
-        print(f'written README to {output_path_readme}')
-
-    # write UD information
-    output_path_ud_information = os.path.join(pos_folder, 'part_of_speech_ud_info.json')
-    shutil.copy(path_ud_information, output_path_ud_information)
+        if incremental and is_up_to_date(output_folder, artifact, fingerprint):
+            if verbose:
+                print(f'{output_path} is up to date')
+            continue
 
-    if verbose:
-        print(f'written UD information to {output_path_ud_information}')
+        shutil.copy(input_path, output_path)
+        record_bytes_written(output_path, os.path.getsize(output_path))
+        record_artifact(output_folder, artifact, fingerprint)
 
-    # write mapping UD pos to FN pos
-    output_path_mapping_ud_fn = os.path.join(pos_folder, 'ud_pos_to_fn_pos.json')
-    shutil.copy(path_mapping_ud_pos_to_fn_pos, output_path_mapping_ud_fn)
-
-    if verbose:
-        print(f'written mapping UD to FN to {output_path_mapping_ud_fn}')
+        if verbose:
+            print(f'written {description} to {output_path}')
 
 
-def add_frame_to_info(output_folder,
-                      fn_en,
-                      premon,
-                      verbose=0):
+def _frame_to_info_of_chunk(state, frame_indices):
     """
-    add the file frame_to_info.json to the folder with lexical data
-    for the annotation tool
-
-    :param str output_folder: output folder containing the lexical data for the annotation tool
-    :param fn_en: english framenet in the nltk format
+    frame rdf uri -> info for the frames in state['frames'] with the provided indices
     """
-    frame_rdf_uri_to_info = {}
+    premon = state['premon']
 
-    for frame in fn_en.frames():
+    frames_and_uris = []
+    for frame_index in frame_indices:
+        frame = state['frames'][frame_index]
+        frame_rdf_uri = get_rdf_uri(premon_nt=premon,
+                                    frame_label=frame.name)
+        frames_and_uris.append((frame, frame_rdf_uri))
 
-        label = frame.name
+    # resolve the frame elements of all frames at once
+    frame_uri_to_label_to_fe_uri = get_fe_uris_and_labels_of_frames(premon_nt=premon,
+                                                                    frame_uris=[frame_rdf_uri
+                                                                                for _, frame_rdf_uri in frames_and_uris])
 
-        frame_rdf_uri = get_rdf_uri(premon_nt=premon,
-                                    frame_label=label)
+    frame_rdf_uri_to_info = {}
+    for frame, frame_rdf_uri in frames_and_uris:
 
         fes = []
-        label_to_fe_uri = get_fe_uris_and_labels(premon_nt=premon,
-                                                 frame_uri=frame_rdf_uri)
+        label_to_fe_uri = frame_uri_to_label_to_fe_uri[frame_rdf_uri]
 
         for fe_label, fe in frame.FE.items():
             fe_rdf_uri = label_to_fe_uri[fe_label]
@@ -136,6 +143,57 @@ def add_frame_to_info(output_folder,
 
         frame_rdf_uri_to_info[frame_rdf_uri] = info
 
+    return frame_rdf_uri_to_info
+
+
+@instrumented
+def add_frame_to_info(output_folder,
+                      fn_en,
+                      premon,
+                      incremental=False,
+                      workers=1,
+                      output_format='pretty',
+                      verbose=0):
+    """
+    add the file frame_to_info.json to the folder with lexical data
+    for the annotation tool
+
+    :param str output_folder: output folder containing the lexical data for the annotation tool
+    :param fn_en: english framenet in the nltk format or a FrameNetSnapshot (see framenet_snapshot.get_framenet_snapshot)
+    :param premon: PreMOn graph or PremonIndex
+    :param bool incremental: if True, the file is not regenerated
+    if FrameNet and PreMOn did not change since it was created
+    :param int workers: number of processes over which the frames are divided
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
+    """
+    premon = get_premon_index(premon)
+
+    artifact = get_output_path('lexicons/frame_to_info.json', output_format)
+    # the fingerprint is only needed for an incremental run, without it, the next incremental run regenerates the file
+    fingerprint = None
+    if incremental:
+        fingerprint = compute_fingerprint({'framenet': framenet_fingerprint(fn_en),
+                                           'premon': premon_fingerprint(premon),
+                                           'output_format': output_format})
+        if is_up_to_date(output_folder, artifact, fingerprint):
+            if verbose:
+                print(f'{artifact} is up to date')
+            return
+
+    frames = fn_en.frames()
+    state = {
+        'frames': frames,
+        'premon': premon
+    }
+
+    frame_rdf_uri_to_info = {}
+    for chunk_result in run_in_pool(_frame_to_info_of_chunk,
+                                    num_items=len(frames),
+                                    state=state,
+                                    workers=workers):
+        frame_rdf_uri_to_info.update(chunk_result)
+    count('frames', len(frame_rdf_uri_to_info))
+
     if verbose:
         print()
         print(f'found {len(frame_rdf_uri_to_info)} frames')
@@ -144,19 +202,77 @@ def add_frame_to_info(output_folder,
     if not os.path.exists(lexicons_folder):
         os.mkdir(lexicons_folder)
 
-    output_path_frame_to_info = os.path.join(lexicons_folder, 'frame_to_info.json')
-    with open(output_path_frame_to_info, mode='w', encoding='utf8') as outfile:
-        json.dump(frame_rdf_uri_to_info,
-                  outfile,
-                  indent=4,
-                  ensure_ascii=False,
-                  sort_keys=True)
+    output_path_frame_to_info = dump_data(frame_rdf_uri_to_info,
+                                          os.path.join(lexicons_folder, 'frame_to_info.json'),
+                                          output_format=output_format)
+
+    record_artifact(output_folder, artifact, fingerprint)
 
     if verbose:
         print(f'written frame_to_info to {output_path_frame_to_info}')
 
 
 
+def _lu_to_info_of_chunk(state, frame_indices):
+    """
+    lu rdf uri -> info for the lexical units of the frames in state['frames'] with the provided indices
+    """
+    your_fn = state['your_fn']
+    premon = state['premon']
+    namespace = state['namespace']
+    rdf_lang = state['rdf_lang']
+    major_version = state['major_version']
+    minor_version = state['minor_version']
+
+    lexicon_url = generate_lexicon_rdf_uri(namespace=namespace,
+                                           language=rdf_lang,
+                                           major_version=major_version,
+                                           minor_version=minor_version)
+
+    lu_to_info = {}
+    for frame_index in frame_indices:
+        frame = state['frames'][frame_index]
+
+        label = frame.name
+
+        frame_rdf_uri = get_rdf_uri(premon_nt=premon,
+                                    frame_label=label)
+
+        for lu_label, lu in frame.lexUnit.items():
+            pos = lu.POS
+
+            le_rdf_uri, leform_rdf_uri, lu_rdf_uri = generate_le_and_lu_rdf_uri(your_fn=your_fn,
+                                                                                namespace=namespace,
+                                                                                language=rdf_lang,
+                                                                                major_version=major_version,
+                                                                                minor_version=minor_version,
+                                                                                lu_id=lu.ID)
+
+            # get lexical entries
+            lexical_entries = set()
+
+            main_lu_lemma, lu_pos = lu_label.rsplit('.', 1)
+            all_lu_lemmas = lemmas_from_lu_name(lu_lemma=main_lu_lemma)
+
+            for lu_lemma in all_lu_lemmas:
+                lexical_entries.add((lu_lemma, pos))
+
+            info = {
+                'lu_id' : lu.ID,
+                'lu_definition' : lu.definition,
+                'lu_name' : lu_label,
+                'lexical_entries' : sorted(lexical_entries),
+                'frame_uri' : frame_rdf_uri,
+                'frame_label' : label,
+                'lexicon_uri' : lexicon_url
+            }
+
+            lu_to_info[lu_rdf_uri] = info
+
+    return lu_to_info
+
+
+@instrumented
 def add_lu_to_info(your_fn,
                    language,
                    premon,
@@ -164,6 +280,9 @@ def add_lu_to_info(your_fn,
                    major_version,
                    minor_version,
                    output_folder,
+                   incremental=False,
+                   workers=1,
+                   output_format='pretty',
                    verbose=0):
     """
     Create one file at:
@@ -179,14 +298,23 @@ def add_lu_to_info(your_fn,
         'lexical_entries' : list of tuples (lemma, pos)
         'lexicon_uri' : uri of the lexicon to which this lu belongs
 
-    :param your_fn: a FrameNet in NLTK format
+    :param your_fn: a FrameNet in NLTK format or a FrameNetSnapshot (see framenet_snapshot.get_framenet_snapshot)
     :param str language: nl (Dutch) and en (English) are supported
-    :param str premon: PreMOn graph, load probably from res/premon/premon-2018a-fn17-noinf.nt
+    :param premon: PreMOn graph, load probably from res/premon/premon-2018a-fn17-noinf.nt,
+    or a PremonIndex
     :param str namespace: the namespace to use to generate lu_urls, e.g., http://rdf.cltl.nl/
     :param int major_version: major version of your framenet
     :param int minor_version: minor version of your framenet
     :param str output_folder: output folder containing the lexical data for the annotation tool
     :param str mw_separator: how to join multi-word expressions, e.g., with ' ' or '_'
+    :param bool incremental: if True, the language folder is kept and lu_to_info.json is not regenerated
+    if FrameNet, PreMOn and the namespace and version parameters did not change since it was created
+    :param int workers: number of processes over which the frames are divided
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
+
+    :rtype: dict
+    :return: lu_to_info, which can be passed to add_lemma_to_pos_to_lu_urls.
+    None if lu_to_info.json was up to date.
     """
     assert language in {'en', 'nl'}, f'specified language ({language}) is not supported: nl | en'
 
@@ -202,72 +330,96 @@ def add_lu_to_info(your_fn,
     if not os.path.exists(lexicons_folder):
         os.mkdir(lexicons_folder)
     lang_dir = os.path.join(lexicons_folder, language)
-    remove_and_create_folder(lang_dir)
+
+    premon = get_premon_index(premon)
+
+    artifact = get_output_path(f'lexicons/{language}/lu_to_info.json', output_format)
+    # the fingerprint is only needed for an incremental run, without it, the next incremental run regenerates the file
+    fingerprint = None
+    if incremental:
+        fingerprint = compute_fingerprint({'framenet': framenet_fingerprint(your_fn),
+                                           'premon': premon_fingerprint(premon),
+                                           'language': language,
+                                           'namespace': namespace,
+                                           'major_version': major_version,
+                                           'minor_version': minor_version,
+                                           'output_format': output_format})
+        if is_up_to_date(output_folder, artifact, fingerprint):
+            if verbose:
+                print(f'{artifact} is up to date')
+            return
+        if not os.path.exists(lang_dir):
+            os.mkdir(lang_dir)
+    else:
+        remove_and_create_folder(lang_dir)
+
+    frames = your_fn.frames()
+    state = {
+        'frames': frames,
+        'your_fn': your_fn,
+        'premon': premon,
+        'namespace': namespace,
+        'rdf_lang': rdf_lang,
+        'major_version': major_version,
+        'minor_version': minor_version
+    }
 
     # create dict
     lu_to_info = {}
+    for chunk_result in run_in_pool(_lu_to_info_of_chunk,
+                                    num_items=len(frames),
+                                    state=state,
+                                    workers=workers):
+        lu_to_info.update(chunk_result)
+    count('frames', len(frames))
+    count('lus', len(lu_to_info))
 
-    for frame in your_fn.frames():
-
-        label = frame.name
-
-        frame_rdf_uri = get_rdf_uri(premon_nt=premon,
-                                    frame_label=label)
-
-        for lu_label, lu in frame.lexUnit.items():
-            pos = lu.POS
+    if verbose:
+        print(f'found info for {len(lu_to_info)} LUs')
 
-            lexicon_url = generate_lexicon_rdf_uri(namespace=namespace,
-                                                   language=rdf_lang,
-                                                   major_version=major_version,
-                                                   minor_version=minor_version)
+    # save
+    output_path = dump_data(lu_to_info,
+                            os.path.join(lang_dir, 'lu_to_info.json'),
+                            output_format=output_format)
 
-            le_rdf_uri, leform_rdf_uri, lu_rdf_uri = generate_le_and_lu_rdf_uri(your_fn=your_fn,
-                                                                                namespace=namespace,
-                                                                                language=rdf_lang,
-                                                                                major_version=major_version,
-                                                                                minor_version=minor_version,
-                                                                                lu_id=lu.ID)
+    record_artifact(output_folder, artifact, fingerprint)
 
-            # get lexical entries
-            lexical_entries = set()
+    if verbose:
+        print(f'written lu_to_info to {output_path}')
 
-            main_lu_lemma, lu_pos = lu_label.rsplit('.', 1)
-            all_lu_lemmas = lemmas_from_lu_name(lu_lemma=main_lu_lemma)
+    return lu_to_info
 
-            for lu_lemma in all_lu_lemmas:
-                lexical_entries.add((lu_lemma, pos))
 
-            info = {
-                'lu_id' : lu.ID,
-                'lu_definition' : lu.definition,
-                'lu_name' : lu_label,
-                'lexical_entries' : list(lexical_entries),
-                'frame_uri' : frame_rdf_uri,
-                'frame_label' : label,
-                'lexicon_uri' : lexicon_url
-            }
+def build_lemma_to_pos_to_lus(lu_records):
+    """
+    map each lemma to a POS to the lu urls of the lexical units with that lexical entry,
+    in one pass over the lexical units
 
-            lu_to_info[lu_rdf_uri] = info
+    :param lu_records: iterable of (lu_url, lu_info), e.g., lu_to_info.items(),
+    in which lu_info contains 'lexical_entries' (see add_lu_to_info)
 
-    if verbose:
-        print(f'found info for {len(lu_to_info)} LUs')
+    :rtype: dict
+    :return: lemma -> pos -> list of lu urls, in the order of lu_records without duplicates
+    """
+    # dicts with None values are used as insertion-ordered sets
+    lemma_to_pos_to_lus = {}
 
-    # save
-    output_path = os.path.join(lang_dir, 'lu_to_info.json')
-    with open(output_path, mode='w', encoding='utf-8') as outfile:
-        json.dump(lu_to_info,
-                  outfile,
-                  indent=4,
-                  ensure_ascii=False,
-                  sort_keys=True)
+    for lu_url, lu_info in lu_records:
+        for (lemma, pos) in lu_info['lexical_entries']:
+            pos_to_lus = lemma_to_pos_to_lus.setdefault(lemma, {})
+            pos_to_lus.setdefault(pos, {})[lu_url] = None
 
-    if verbose:
-        print(f'written lu_to_info to {output_path}')
+    return {lemma: {pos: list(lu_urls)
+                    for pos, lu_urls in pos_to_lus.items()}
+            for lemma, pos_to_lus in lemma_to_pos_to_lus.items()}
 
 
+@instrumented
 def add_lemma_to_pos_to_lu_urls(output_folder,
                                 language,
+                                incremental=False,
+                                output_format='pretty',
+                                lu_to_info=None,
                                 verbose=0):
     """
     in the output folder, there exists:
@@ -282,43 +434,60 @@ def add_lemma_to_pos_to_lu_urls(output_folder,
 
     :param str output_folder: output folder containing the lexical data for the annotation tool
     :param str language: nl (Dutch) and en (English) are supported
+    :param bool incremental: if True, the file is not regenerated if lu_to_info.json
+    did not change since it was created
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
+    :param dict lu_to_info: the output of add_lu_to_info, if provided, lu_to_info.json is not read from disk.
+    With incremental=True, its fingerprint is computed from its content instead of from lu_to_info.json,
+    so switching between passing lu_to_info and reading it from disk regenerates the file once.
     """
     assert language in {'en', 'nl'}, f'specified language ({language}) is not supported: nl | en'
 
-    lu_to_info_path = os.path.join(output_folder,
-                                   'lexicons',
-                                   language,
-                                   'lu_to_info.json')
-
-    error_message = f'{lu_to_info_path} does not exist, please first create lu_to_info.json'
-    assert os.path.exists(lu_to_info_path), error_message
+    artifact = get_output_path(f'lexicons/{language}/lemma_to_pos_to_lus.json', output_format)
 
-    lu_to_info = json.load(open(lu_to_info_path))
+    if lu_to_info is None:
+        lu_to_info_path = os.path.join(output_folder,
+                                       'lexicons',
+                                       language,
+                                       'lu_to_info.json')
 
+        error_message = f'{lu_to_info_path} does not exist, please first create lu_to_info.json'
+        lu_to_info_path = find_data_path(lu_to_info_path)
+        assert lu_to_info_path is not None, error_message
 
-    lemma_to_pos_to_lus = {}
+    # the fingerprint is only needed for an incremental run, without it, the next incremental run regenerates the file
+    fingerprint = None
+    if incremental:
+        if lu_to_info is None:
+            lu_to_info_fingerprint = file_sha256(lu_to_info_path)
+        else:
+            lu_to_info_fingerprint = compute_fingerprint(lu_to_info)
 
-    for lu_url, lu_info in lu_to_info.items():
-        for (lemma, pos) in lu_info['lexical_entries']:
+        fingerprint = compute_fingerprint({'lu_to_info': lu_to_info_fingerprint,
+                                           'output_format': output_format})
+        if is_up_to_date(output_folder, artifact, fingerprint):
+            if verbose:
+                print(f'{artifact} is up to date')
+            return
 
-            if lemma not in lemma_to_pos_to_lus:
-                lemma_to_pos_to_lus[lemma] = defaultdict(list)
+    if lu_to_info is None:
+        lu_to_info = load_data(lu_to_info_path)
+    count('lus', len(lu_to_info))
 
-            if lu_url not in lemma_to_pos_to_lus[lemma][pos]:
-                lemma_to_pos_to_lus[lemma][pos].append(lu_url)
+    # in the order of the keys of lu_to_info.json, so that the output does not depend on
+    # whether lu_to_info is read from disk or passed in memory
+    lemma_to_pos_to_lus = build_lemma_to_pos_to_lus(sorted(lu_to_info.items()))
 
     output_path = os.path.join(output_folder,
                                'lexicons',
                                 language,
                                 'lemma_to_pos_to_lus.json')
 
-    with open(output_path, 'w') as outfile:
-        json.dump(lemma_to_pos_to_lus,
-                  outfile,
-                  indent=4,
-                  ensure_ascii=False,
-                  sort_keys=True
-                  )
+    output_path = dump_data(lemma_to_pos_to_lus,
+                            output_path,
+                            output_format=output_format)
+    record_artifact(output_folder, artifact, fingerprint)
+
     if verbose:
         print(f'written {output_path} to disk')
         print(f'{len(lemma_to_pos_to_lus)} lemmas contain a mapping to an LU.')
@@ -0,0 +1,203 @@
+import os
+import json
+import hashlib
+
+from .utils import file_sha256
+from .rdf_utils import get_premon_index
+from .io_utils import get_base_path
+
+MANIFEST_FILENAME = 'manifest.json'
+
+# extension of the files with the fingerprint of one artifact, stored next to the artifact
+FINGERPRINT_EXTENSION = '.fingerprint'
+
+# FrameNet files of which the content determines the frames and lexical units
+FRAMENET_INDEX_FILES = ['frameIndex.xml', 'luIndex.xml']
+
+# FrameNet folders with the definitions, frame elements and lexemes of the frames and lexical units
+FRAMENET_CONTENT_FOLDERS = ['frame', 'lu']
+
+
+def compute_fingerprint(inputs):
+    """
+    compute a fingerprint of the inputs of an artifact
+
+    :param dict inputs: JSON-serializable mapping from input name to value, e.g., a file hash
+
+    :rtype: str
+    :return: sha256 hexdigest
+    """
+    serialized = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def folder_fingerprint(folder):
+    """
+    compute a fingerprint of the names, sizes and modification times of the files in a folder,
+    without reading the files
+
+    :rtype: str
+    """
+    files = []
+    if os.path.isdir(folder):
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append([entry.name, stat.st_size, stat.st_mtime_ns])
+    return compute_fingerprint(sorted(files))
+
+
+def framenet_fingerprint(your_fn):
+    """
+    compute a fingerprint of a FrameNet in NLTK format.
+
+    If the FrameNet is read from a folder, e.g., nltk's framenet or a FrameNet loaded using FrameNetNLTK,
+    the content of the frame and lu index files is hashed, and the names, sizes and modification times
+    of the files in the frame and lu folders are included (see folder_fingerprint),
+    so editing a frame or lexical unit, or copying the FrameNet folder, changes the fingerprint.
+    For a FrameNetSnapshot, the fingerprint of the FrameNet it was created from is used.
+    For other objects, the frames, frame elements and lexical units are traversed.
+
+    :param your_fn: a FrameNet in NLTK format
+
+    :rtype: str
+    """
+    source_fingerprint = getattr(your_fn, 'source_fingerprint', None)
+    if source_fingerprint is not None:
+        return source_fingerprint
+
+    root = getattr(your_fn, '_root', None)
+    if root is not None:
+        root = str(getattr(root, 'path', root))
+        paths = [os.path.join(root, filename)
+                 for filename in FRAMENET_INDEX_FILES]
+        if all(os.path.exists(path) for path in paths):
+            inputs = {filename: file_sha256(path)
+                      for filename, path in zip(FRAMENET_INDEX_FILES, paths)}
+            for folder in FRAMENET_CONTENT_FOLDERS:
+                inputs[folder] = folder_fingerprint(os.path.join(root, folder))
+            return compute_fingerprint(inputs)
+
+    frames = []
+    for frame in your_fn.frames():
+        frames.append([frame.name,
+                       sorted(frame.FE),
+                       sorted([lu_name, lu.ID, lu.POS]
+                              for lu_name, lu in frame.lexUnit.items())])
+    return compute_fingerprint(frames)
+
+
+def premon_fingerprint(premon):
+    """
+    compute a fingerprint of PreMOn
+
+    :param premon: PreMOn graph or PremonIndex
+
+    :rtype: str
+    """
+    premon_index = get_premon_index(premon)
+    if premon_index.source_hash is not None:
+        return premon_index.source_hash
+
+    the_dict = premon_index.to_dict()
+    return compute_fingerprint({key: sorted(value.items()) if isinstance(value, dict) else sorted(value)
+                                for key, value in the_dict.items()
+                                if key != 'source_hash'})
+
+
+def load_manifest(output_folder):
+    """
+    load the manifest of the output folder, which maps an artifact,
+    i.e., a path relative to the output folder, to the fingerprint of its inputs
+
+    :rtype: dict
+    """
+    manifest_path = os.path.join(output_folder, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return {}
+
+    with open(manifest_path, encoding='utf-8') as infile:
+        return json.load(infile)
+
+
+def is_up_to_date(output_folder, artifact, fingerprint):
+    """
+    check whether the artifact exists and was created from inputs with this fingerprint
+
+    :param str output_folder: output folder containing the lexical data for the annotation tool
+    :param str artifact: path relative to the output folder, e.g., lexicons/frame_to_info.json
+    :param str fingerprint: see compute_fingerprint
+
+    :rtype: bool
+    """
+    if not os.path.exists(os.path.join(output_folder, artifact)):
+        return False
+
+    return load_manifest(output_folder).get(artifact) == fingerprint
+
+
+def record_artifact(output_folder, artifact, fingerprint):
+    """
+    store the fingerprint of the inputs of an artifact in the manifest
+
+    :param str output_folder: output folder containing the lexical data for the annotation tool
+    :param str artifact: path relative to the output folder, e.g., lexicons/frame_to_info.json
+    :param str fingerprint: see compute_fingerprint
+    """
+    manifest = load_manifest(output_folder)
+    manifest[artifact] = fingerprint
+
+    manifest_path = os.path.join(output_folder, MANIFEST_FILENAME)
+    with open(manifest_path, mode='w', encoding='utf-8') as outfile:
+        json.dump(manifest,
+                  outfile,
+                  indent=4,
+                  ensure_ascii=False,
+                  sort_keys=True)
+
+
+def get_fingerprint_path(path):
+    """
+    get the path of the fingerprint stored next to an artifact,
+    e.g., lexical_lookup/nl/Q40231.json -> lexical_lookup/nl/Q40231.fingerprint
+
+    :param str path: path of the artifact with or without the extension of one of the output formats
+    """
+    return get_base_path(path) + FINGERPRINT_EXTENSION
+
+
+def read_fingerprint(path):
+    """
+    read the fingerprint stored next to an artifact
+
+    :rtype: str | None
+    :return: the fingerprint, None if there is none
+    """
+    fingerprint_path = get_fingerprint_path(path)
+    if not os.path.exists(fingerprint_path):
+        return None
+
+    with open(fingerprint_path, encoding='utf-8') as infile:
+        return infile.read().strip()
+
+
+def write_fingerprint(path, fingerprint):
+    """
+    store the fingerprint of the inputs of an artifact next to the artifact,
+    which is useful for artifacts of which there are too many to keep in the manifest
+
+    :param str path: path of the artifact
+    :param str fingerprint: see compute_fingerprint
+    """
+    with open(get_fingerprint_path(path), mode='w', encoding='utf-8') as outfile:
+        outfile.write(fingerprint)
+
+
+def remove_fingerprint(path):
+    """
+    remove the fingerprint stored next to an artifact, if existing
+    """
+    fingerprint_path = get_fingerprint_path(path)
+    if os.path.exists(fingerprint_path):
+        os.remove(fingerprint_path)
@@ -0,0 +1,195 @@
+import os
+from collections import deque
+
+from .io_utils import dump_data, load_data
+
+
+class MultiwordMatcher:
+    """
+    find the single-word and multiword lemmas of a lexicon (lemma_to_pos_to_lus.json) in a lemmatized sentence.
+
+    The lemmas are split into tokens on whitespace, e.g., give up -> [give, up],
+    and compiled into an Aho-Corasick automaton over tokens,
+    so a sentence is matched in time linear in its number of tokens and matches.
+
+    The matcher only consists of lists and dictionaries, so it can be pickled,
+    or saved with to_dict / save and restored with from_dict / load.
+
+    :param dict lemma_to_pos_to_lus: see typicality_utils.load_lexicon
+    :param bool lowercase: if True, lemmas and tokens are lowercased before matching
+    """
+    def __init__(self, lemma_to_pos_to_lus, lowercase=True):
+        self.lowercase = lowercase
+        self.lemma_to_pos_to_lus = lemma_to_pos_to_lus
+
+        # patterns: id -> lemmas with these tokens, and id -> number of tokens
+        self.lemmas = []
+        self.lengths = []
+
+        # the automaton: per state, token -> next state, the pattern that ends in the state (-1 for none),
+        # the failure transition and the nearest state on the failure path in which a pattern ends
+        self.goto = [{}]
+        self.output = [-1]
+        self.fail = [0]
+        self.output_link = [0]
+
+        for lemma in sorted(lemma_to_pos_to_lus):
+            self._add_pattern(lemma)
+        self._compile()
+
+    def __repr__(self):
+        return f'MultiwordMatcher({len(self.lemmas)} lemmas, {len(self.goto)} states)'
+
+    def _tokenize(self, text):
+        if self.lowercase:
+            text = text.lower()
+        return text.split()
+
+    def _add_pattern(self, lemma):
+        tokens = self._tokenize(lemma)
+        if not tokens:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][token] = next_state
+                self.goto.append({})
+                self.output.append(-1)
+            state = next_state
+
+        # lemmas that are the same after tokenization, e.g., after lowercasing, end in the same state
+        if self.output[state] == -1:
+            self.output[state] = len(self.lemmas)
+            self.lemmas.append([lemma])
+            self.lengths.append(len(tokens))
+        else:
+            self.lemmas[self.output[state]].append(lemma)
+
+    def _compile(self):
+        """
+        compute the failure and output transitions in breadth-first order
+        """
+        self.fail = [0] * len(self.goto)
+        self.output_link = [0] * len(self.goto)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self.fail[state]
+                while fail_state and token not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+                fail_state = self.goto[fail_state].get(token, 0)
+                if fail_state == next_state:
+                    fail_state = 0
+
+                self.fail[next_state] = fail_state
+                if self.output[fail_state] != -1:
+                    self.output_link[next_state] = fail_state
+                else:
+                    self.output_link[next_state] = self.output_link[fail_state]
+
+    def match(self, tokens):
+        """
+        find all lemmas of the lexicon in a lemmatized sentence, including overlapping ones
+
+        :param list tokens: the lemmas of the tokens of a sentence, e.g., ['she', 'give', 'up', 'smoking']
+
+        :rtype: list
+        :return: list of (start, end, lemma) with the span tokens[start:end],
+        ordered by end and then from the longest to the shortest span,
+        e.g., [(1, 2, 'give'), (1, 3, 'give up'), (2, 3, 'up'), (3, 4, 'smoking')]
+        """
+        matches = []
+        state = 0
+        for index, token in enumerate(tokens):
+            if self.lowercase:
+                token = token.lower()
+
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+
+            output_state = state if self.output[state] != -1 else self.output_link[state]
+            while output_state:
+                pattern = self.output[output_state]
+                start = index + 1 - self.lengths[pattern]
+                for lemma in self.lemmas[pattern]:
+                    matches.append((start, index + 1, lemma))
+                output_state = self.output_link[output_state]
+
+        return matches
+
+    def get_candidates(self, tokens):
+        """
+        get the lexical unit candidates of a lemmatized sentence
+
+        :param list tokens: the lemmas of the tokens of a sentence
+
+        :rtype: list
+        :return: list of (start, end, lemma, pos_to_lus), see match,
+        in which pos_to_lus is the entry of the lemma in lemma_to_pos_to_lus.json
+        """
+        return [(start, end, lemma, self.lemma_to_pos_to_lus[lemma])
+                for start, end, lemma in self.match(tokens)]
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        :return: JSON-serializable representation of the matcher, see from_dict
+        """
+        return {
+            'lowercase': self.lowercase,
+            'lemma_to_pos_to_lus': self.lemma_to_pos_to_lus,
+            'lemmas': self.lemmas,
+            'lengths': self.lengths,
+            'goto': self.goto,
+            'output': self.output,
+            'fail': self.fail,
+            'output_link': self.output_link
+        }
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        """
+        restore a matcher from to_dict without compiling it again
+
+        :rtype: MultiwordMatcher
+        """
+        matcher = cls.__new__(cls)
+        for attribute, value in the_dict.items():
+            setattr(matcher, attribute, value)
+        return matcher
+
+    def save(self, path, output_format='pretty'):
+        """
+        save the compiled matcher, see io_utils.dump_data
+
+        :rtype: str
+        :return: the path of the written file
+        """
+        return dump_data(self.to_dict(), path, output_format=output_format)
+
+    @classmethod
+    def load(cls, path):
+        """
+        load a matcher saved with MultiwordMatcher.save
+
+        :rtype: MultiwordMatcher
+        """
+        return cls.from_dict(load_data(path))
+
+    @classmethod
+    def from_folder(cls, output_folder, language, lowercase=True):
+        """
+        compile the matcher of lexicons/LANGUAGE/lemma_to_pos_to_lus.json in the output folder
+
+        :rtype: MultiwordMatcher
+        """
+        lemma_to_pos_to_lus = load_data(os.path.join(output_folder, 'lexicons', language, 'lemma_to_pos_to_lus.json'))
+        return cls(lemma_to_pos_to_lus, lowercase=lowercase)
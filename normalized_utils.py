@@ -0,0 +1,208 @@
+import os
+from operator import itemgetter
+
+from .io_utils import dump_data, load_data, find_data_path, get_output_path, detect_output_format
+from .manifest_utils import compute_fingerprint
+
+LEXICON_TABLE_FILENAME = 'lexicon_table.json'
+
+
+def get_lexicon_table_path(lexical_lookup_folder):
+    """
+    get the path of the table shared by the normalized lexical lookups of a language,
+    e.g., typicality/lexical_lookup/LANGUAGE/lexicon_table.json
+    """
+    return os.path.join(lexical_lookup_folder, LEXICON_TABLE_FILENAME)
+
+
+def build_lexicon_table(frame_uri_to_label, lu_to_info, lemma_to_pos_to_lus):
+    """
+    create the table shared by the normalized lexical lookups of a language.
+    The frames and lexical units are stored column-wise and are referred to by their position (ID):
+
+    'fingerprint': fingerprint of the content of the table, which the normalized lexical lookups refer to
+    'frames'
+        'uri': list of PreMOn frame URIs, sorted
+        'label': list of frame labels
+    'lexicons'
+        'uri': list of lexicon URIs
+    'lus'
+        'uri': list of lu urls, sorted
+        'name': list of lu names
+        'frame_id': list of frame IDs
+        'lexicon_id': list of lexicon IDs
+    'lemma_to_pos_to_lu_ids'
+        LEMMA
+            POS: list of lu IDs, in the order of lemma_to_pos_to_lus.json
+
+    :param dict frame_uri_to_label: PreMOn frame URI -> frame label, for all frames that can have a typicality score
+    :param dict lu_to_info: see typicality_utils.load_lexicon
+    :param dict lemma_to_pos_to_lus: see typicality_utils.load_lexicon
+
+    :rtype: dict
+    """
+    frame_uris = sorted(frame_uri_to_label)
+    frame_uri_to_id = {frame_uri: frame_id for frame_id, frame_uri in enumerate(frame_uris)}
+
+    lu_uris = sorted(lu_to_info)
+    lu_uri_to_id = {lu_uri: lu_id for lu_id, lu_uri in enumerate(lu_uris)}
+
+    lexicon_uris = sorted({lu_info['lexicon_uri'] for lu_info in lu_to_info.values()})
+    lexicon_uri_to_id = {lexicon_uri: lexicon_id for lexicon_id, lexicon_uri in enumerate(lexicon_uris)}
+
+    table = {
+        'frames': {
+            'uri': frame_uris,
+            'label': [frame_uri_to_label[frame_uri] for frame_uri in frame_uris]
+        },
+        'lexicons': {
+            'uri': lexicon_uris
+        },
+        'lus': {
+            'uri': lu_uris,
+            'name': [lu_to_info[lu_uri]['lu_name'] for lu_uri in lu_uris],
+            'frame_id': [frame_uri_to_id[lu_to_info[lu_uri]['frame_uri']] for lu_uri in lu_uris],
+            'lexicon_id': [lexicon_uri_to_id[lu_to_info[lu_uri]['lexicon_uri']] for lu_uri in lu_uris]
+        },
+        'lemma_to_pos_to_lu_ids': {
+            lemma: {pos: [lu_uri_to_id[lu_uri] for lu_uri in lu_uris_of_pos]
+                    for pos, lu_uris_of_pos in pos_to_lus.items()}
+            for lemma, pos_to_lus in lemma_to_pos_to_lus.items()
+        }
+    }
+    table['fingerprint'] = compute_fingerprint(table)
+
+    return table
+
+
+def write_lexicon_table(table, lexical_lookup_folder, output_format='pretty'):
+    """
+    write the table shared by the normalized lexical lookups of a language,
+    unless a table with the same content exists in the same output format
+
+    :rtype: str
+    :return: the path of the table
+    """
+    table_path = get_lexicon_table_path(lexical_lookup_folder)
+    existing_path = find_data_path(table_path)
+    if existing_path == get_output_path(table_path, output_format):
+        if detect_output_format(existing_path) == output_format:
+            if load_data(existing_path).get('fingerprint') == table['fingerprint']:
+                return existing_path
+
+    return dump_data(table, table_path, output_format=output_format)
+
+
+def load_lexicon_table(lexical_lookup_folder):
+    """
+    load the table shared by the normalized lexical lookups of a language
+
+    :rtype: dict
+    """
+    table_path = get_lexicon_table_path(lexical_lookup_folder)
+    assert find_data_path(table_path) is not None, f'{table_path} does not exist, please create the lexical lookups with layout=normalized'
+    return load_data(table_path)
+
+
+def build_normalized_lexical_lookup(frame_to_score, table):
+    """
+    create the normalized lexical lookup of an event type:
+
+    'table': the fingerprint of the table (see build_lexicon_table)
+    'frame_ids': list of frame IDs, sorted by typicality score
+    'scores': list of the typicality scores of the frames in frame_ids
+
+    :param dict frame_to_score: PreMOn frame URI -> typicality score
+    :param dict table: see build_lexicon_table
+
+    :rtype: dict
+    """
+    frame_uri_to_id = {frame_uri: frame_id for frame_id, frame_uri in enumerate(table['frames']['uri'])}
+
+    unknown_frame_uris = set(frame_to_score) - set(frame_uri_to_id)
+    assert not unknown_frame_uris, f'frames with a typicality score that are not in the table: {sorted(unknown_frame_uris)}'
+
+    # same order as ordered_frames in the other layouts
+    ordered = sorted(((score, frame_uri_to_id[frame_uri]) for frame_uri, score in frame_to_score.items()),
+                     key=itemgetter(0),
+                     reverse=True)
+
+    return {
+        'table': table['fingerprint'],
+        'frame_ids': [frame_id for _, frame_id in ordered],
+        'scores': [score for score, _ in ordered]
+    }
+
+
+def get_frame_id_to_score(normalized_lookup):
+    return dict(zip(normalized_lookup['frame_ids'], normalized_lookup['scores']))
+
+
+def load_lemma_from_normalized_lookup(table, normalized_lookup, lemma, frame_id_to_score=None):
+    """
+    get the entry of a lemma in the lexical lookup of an event type from the normalized layout,
+    i.e., what a client does to build the dropdown entries
+
+    :param dict table: see load_lexicon_table
+    :param dict normalized_lookup: see build_normalized_lexical_lookup
+    :param dict frame_id_to_score: see get_frame_id_to_score, computed if not provided
+
+    :rtype: dict
+    :return: the same as the entry of the lemma in the lexical lookup of the single layout, None if the lemma is unknown
+    """
+    assert normalized_lookup['table'] == table['fingerprint'], 'the normalized lexical lookup was created with another table'
+
+    pos_to_lu_ids = table['lemma_to_pos_to_lu_ids'].get(lemma)
+    if pos_to_lu_ids is None:
+        return None
+
+    if frame_id_to_score is None:
+        frame_id_to_score = get_frame_id_to_score(normalized_lookup)
+
+    frames = table['frames']
+    lus = table['lus']
+    lexicon_uris = table['lexicons']['uri']
+
+    pos_to_dropdown = {}
+    frames_for_lemma = set()
+    for pos, lu_ids in pos_to_lu_ids.items():
+        values = []
+        for lu_id in lu_ids:
+            frame_id = lus['frame_id'][lu_id]
+            score = frame_id_to_score[frame_id]
+            lu_name = lus['name'][lu_id]
+            values.append([score,
+                           f'{frames["label"][frame_id]} ({lu_name}) ({score})',
+                           frames['uri'][frame_id],
+                           lus['uri'][lu_id],
+                           lu_name,
+                           lexicon_uris[lus['lexicon_id'][lu_id]]])
+            frames_for_lemma.add(frames['uri'][frame_id])
+
+        values.sort(key=itemgetter(0),
+                    reverse=True)
+        pos_to_dropdown[pos] = values
+
+    pos_to_dropdown['all_frames'] = sorted(frames_for_lemma)
+    return pos_to_dropdown
+
+
+def normalized_to_lexical_lookup(table, normalized_lookup):
+    """
+    convert a normalized lexical lookup to the lexical lookup of the single layout
+
+    :rtype: dict
+    """
+    frames = table['frames']
+    frame_id_to_score = get_frame_id_to_score(normalized_lookup)
+
+    ordered_frames = [[score, f'{frames["label"][frame_id]} ({score})', frames['uri'][frame_id]]
+                      for frame_id, score in zip(normalized_lookup['frame_ids'], normalized_lookup['scores'])]
+
+    lexical_lookup = {lemma: load_lemma_from_normalized_lookup(table, normalized_lookup, lemma, frame_id_to_score)
+                      for lemma in table['lemma_to_pos_to_lu_ids']}
+
+    return {
+        'ordered_frames': ordered_frames,
+        'lexical_lookup': lexical_lookup
+    }
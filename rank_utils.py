@@ -1,11 +1,42 @@
-import operator
+import heapq
 
 
 
 
+def get_top_keys(set_of_keys,
+                 key_to_value,
+                 k=None):
+    """
+    get the keys with the highest values, keys with the same value keep their order in set_of_keys
+
+    with k, only the k highest keys are selected using a heap,
+    which is faster than sorting all keys if k is much smaller than the number of keys
+
+    :param set_of_keys: iterable of keys, duplicates are ignored
+    :param key_to_value: dictionary mapping keys to values
+    :param int k: number of keys to return, if None, all keys are returned
+
+    :rtype: list
+    :return: list of keys, sorted by value
+    """
+    unique_keys = list(dict.fromkeys(set_of_keys))
+    get_value = key_to_value.__getitem__
+
+    if k is None or k >= len(unique_keys):
+        return sorted(unique_keys,
+                      key=get_value,
+                      reverse=True)
+
+    # heapq.nlargest is equivalent to sorted(..., reverse=True)[:k], also for ties
+    return heapq.nlargest(k,
+                          unique_keys,
+                          key=get_value)
+
+
 def rank_keys(set_of_keys,
               key_to_value,
-              key_to_label=None):
+              key_to_label=None,
+              k=None):
     """
     rank a list of keys
 
@@ -13,18 +44,17 @@ def rank_keys(set_of_keys,
 
     :param set_of_keys: set of keys
     :param key_to_value: dictionary mapping keys to values
+    :param int k: only return the k keys with the highest values, see get_top_keys
 
     :rtype: list
     :return: list of tuples (key, value)
     """
     ordered = []
 
-    relevant_dict = {key: key_to_value[key]
-                     for key in set_of_keys}
-
-    for key, value in sorted(relevant_dict.items(),
-                             key=operator.itemgetter(1),
-                             reverse=True):
+    for key in get_top_keys(set_of_keys,
+                            key_to_value,
+                            k=k):
+        value = key_to_value[key]
 
         label = value
         if key_to_label:
@@ -33,10 +63,42 @@ def rank_keys(set_of_keys,
 
         ordered.append((key, label))
 
-    assert len(ordered) == len(set_of_keys), f'{ordered}\n{set_of_keys}'
+    expected_length = len(set(set_of_keys))
+    if k is not None:
+        expected_length = min(k, expected_length)
+    assert len(ordered) == expected_length, f'{ordered}\n{set_of_keys}'
     return ordered
 
+
+def rank_keys_batch(sets_of_keys,
+                    key_to_value,
+                    key_to_label=None,
+                    k=None):
+    """
+    rank many sets of keys against the same key_to_value,
+    labels are only created for the returned keys
+
+    :param sets_of_keys: iterable of sets of keys
+    :param key_to_value: dictionary mapping keys to values
+    :param key_to_label: see rank_keys
+    :param int k: only return the k keys with the highest values per set of keys
+
+    :rtype: list
+    :return: for each set of keys, the output of rank_keys
+    """
+    return [rank_keys(set_of_keys,
+                      key_to_value,
+                      key_to_label=key_to_label,
+                      k=k)
+            for set_of_keys in sets_of_keys]
+
 list_of_keys = ["a", "b", "c"]
 key_to_value = {"a": 100, "b": 0, "c": 50}
 result = rank_keys(set_of_keys=list_of_keys, key_to_value=key_to_value)
-assert result == [('a', 100), ('c', 50), ('b', 0)]
\ No newline at end of file
+assert result == [('a', 100), ('c', 50), ('b', 0)]
+
+result = rank_keys(set_of_keys=list_of_keys, key_to_value=key_to_value, key_to_label={"a": "A", "c": "C"}, k=2)
+assert result == [('a', 'A (100)'), ('c', 'C (50)')]
+
+result = rank_keys_batch(sets_of_keys=[["a", "b"], ["b", "c"]], key_to_value=key_to_value, k=1)
+assert result == [[('a', 100)], [('c', 50)]]
@@ -1,40 +1,467 @@
-from rdflib import ConjunctiveGraph, Graph
+import os
+import re
+import gzip
+import json
+import pickle
+import sqlite3
+import weakref
+from array import array
+from collections import defaultdict, OrderedDict
+
+from rdflib import ConjunctiveGraph, Graph, URIRef, BNode, Literal
+from rdflib.namespace import RDF, RDFS
+
+try:
+    from .utils import file_sha256, run_in_pool
+    from .instrumentation import instrumented, count, record_bytes_written
+except ImportError:
+    # imported as a top-level module, e.g., in install.sh
+    from utils import file_sha256, run_in_pool
+    from instrumentation import instrumented, count, record_bytes_written
+
+
+RDF_TYPE = str(RDF.type)
+RDFS_LABEL = str(RDFS.label)
+PREMON_SEM_ROLE = 'http://premon.fbk.eu/ontology/core#semRole'
+PREMON_FN_FRAME = 'http://premon.fbk.eu/ontology/fn#Frame'
+
+# the predicates that are queried by this package
+PREMON_PREDICATES = (RDF_TYPE, RDFS_LABEL, PREMON_SEM_ROLE)
+
+# one term of an N-Triples or N-Quads line: IRI, blank node or literal
+NQUAD_TERM = re.compile(r'''
+    <[^>]*>
+    | _:[^\s.]+(?:\.[^\s.]+)*
+    | "(?:[^"\\]|\\.)*"(?:@[A-Za-z0-9-]+|\^\^<[^>]*>)?
+''', re.VERBOSE)
+
+# escape sequences in N-Triples IRIs and literals
+NT_ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+NT_ECHARS = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+DEFAULT_PREMON_NT = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                 'res/premon/premon-2018a-fn17-noinf.nt')
+
+# (path, full_graph) -> loaded PreMOn, see load_premon
+_premon_cache = {}
+_shared_premon = None
+
+# rdflib graph -> SparqlCache, see enable_sparql_cache
+_graph_to_sparql_cache = weakref.WeakKeyDictionary()
+
+
+class SparqlCache:
+    """
+    cache of the results of the SPARQL queries of this module on one version of an N-Triples file,
+    with an in-memory LRU tier and an on-disk tier (SQLite) that is shared by processes and runs.
+
+    The results are stored per query and sha256 of the N-Triples file,
+    so results of another version of the file are never used.
+
+    :param str path: path of the SQLite database, see get_sparql_cache_path
+    :param str source_hash: sha256 of the N-Triples file
+    :param int maxsize: maximum number of queries in the in-memory tier
+    """
+    def __init__(self, path, source_hash, maxsize=4096):
+        self.path = path
+        self.source_hash = source_hash
+        self.maxsize = maxsize
+
+        self._memory = OrderedDict()
+        self._connection = None
+        self._pid = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'SparqlCache({self.path!r}, source_hash={self.source_hash[:12]!r})'
+
+    def _get_connection(self):
+        # a SQLite connection can not be used in a forked process, see utils.run_in_pool
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS sparql_results '
+                                     '(source_hash TEXT, query TEXT, result TEXT, PRIMARY KEY (source_hash, query))')
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def _remember(self, query, result):
+        self._memory[query] = result
+        self._memory.move_to_end(query)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, query):
+        """
+        :rtype: list | None
+        :return: the cached result of the query, None if it is not cached
+        """
+        if query in self._memory:
+            self._memory.move_to_end(query)
+            self.memory_hits += 1
+            return self._memory[query]
+
+        row = self._get_connection().execute('SELECT result FROM sparql_results WHERE source_hash = ? AND query = ?',
+                                             (self.source_hash, query)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        result = json.loads(row[0])
+        self._remember(query, result)
+        self.disk_hits += 1
+        return result
+
+    def put(self, query, result):
+        """
+        cache the result of a query
+
+        :param list result: JSON-serializable rows
+        """
+        self._remember(query, result)
+        connection = self._get_connection()
+        connection.execute('INSERT OR REPLACE INTO sparql_results VALUES (?, ?, ?)',
+                           (self.source_hash, query, json.dumps(result)))
+        connection.commit()
+
+    def clear(self, all_versions=False):
+        """
+        remove the cached results of this version of the N-Triples file,
+        or of all versions if all_versions is True
+        """
+        self._memory.clear()
+        connection = self._get_connection()
+        if all_versions:
+            connection.execute('DELETE FROM sparql_results')
+        else:
+            connection.execute('DELETE FROM sparql_results WHERE source_hash = ?', (self.source_hash,))
+        connection.commit()
+
+    def info(self):
+        """
+        :rtype: dict
+        :return: memory_hits, disk_hits, misses and the number of queries in the in-memory tier
+        """
+        return {'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_size': len(self._memory)}
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+
+class PremonIndex:
+    """
+    in-memory index of the PreMOn frames and frame elements
+
+    it is built in one pass over the relevant triples and can be passed
+    as the premon argument to all functions that accept the PreMOn graph,
+    in which case the lookups are dictionary lookups instead of SPARQL queries.
+
+    frame_label_to_uri: frame label -> frame uri
+    uri_to_label: frame or frame element uri -> label
+    frame_uri_to_fe_label_to_uri: frame uri -> frame element label -> frame element uri
+    """
+    def __init__(self):
+        self.frame_label_to_uri = {}
+        self.uri_to_label = {}
+        self.frame_uri_to_fe_label_to_uri = {}
+
+        # labels and uris for which the graph does not provide exactly one answer
+        self.ambiguous_frame_labels = set()
+        self.ambiguous_uris = set()
+
+        # sha256 of the N-Triples file the index was built from, if known
+        self.source_hash = None
+
+    @classmethod
+    def from_triples(cls, triples):
+        """
+        create the index from an iterable of (subject, predicate, object) triples.
+        Only rdf:type, rdfs:label and semRole triples are used.
+
+        :param triples: iterable of triples (rdflib terms or strings)
+
+        :rtype: PremonIndex
+        """
+        frame_uris = set()
+        uri_to_labels = defaultdict(set)
+        frame_uri_to_fe_uris = defaultdict(set)
+
+        for s, p, o in triples:
+            p = str(p)
+            if p == RDF_TYPE:
+                if str(o) == PREMON_FN_FRAME:
+                    frame_uris.add(str(s))
+            elif p == RDFS_LABEL:
+                uri_to_labels[str(s)].add(str(o))
+            elif p == PREMON_SEM_ROLE:
+                frame_uri_to_fe_uris[str(s)].add(str(o))
+
+        index = cls()
+
+        for uri, labels in uri_to_labels.items():
+            if len(labels) != 1:
+                index.ambiguous_uris.add(uri)
+            index.uri_to_label[uri] = min(labels)
+
+        for frame_uri in frame_uris:
+            for label in uri_to_labels.get(frame_uri, ()):
+                if label in index.frame_label_to_uri:
+                    index.ambiguous_frame_labels.add(label)
+                index.frame_label_to_uri[label] = frame_uri
+
+        for frame_uri, fe_uris in frame_uri_to_fe_uris.items():
+            label_to_fe_uri = {}
+            for fe_uri in sorted(fe_uris):
+                if fe_uri in index.uri_to_label:
+                    label_to_fe_uri[index.uri_to_label[fe_uri]] = fe_uri
+            index.frame_uri_to_fe_label_to_uri[frame_uri] = label_to_fe_uri
+
+        return index
+
+    @classmethod
+    @instrumented
+    def from_graph(cls, graph):
+        """
+        create the index from the PreMOn graph
+
+        :param rdflib.graph.Graph graph: the PreMOn graph
+
+        :rtype: PremonIndex
+        """
+        def relevant_triples():
+            for predicate in [RDF_TYPE, RDFS_LABEL, PREMON_SEM_ROLE]:
+                yield from graph.triples((None, URIRef(predicate), None))
+
+        return cls.from_triples(relevant_triples())
+
+    @classmethod
+    def from_compact_store(cls, store):
+        """
+        create the index from a CompactTripleStore, e.g., loaded with load_nt_parallel
+
+        :rtype: PremonIndex
+        """
+        def relevant_triples():
+            for predicate in [RDF_TYPE, RDFS_LABEL, PREMON_SEM_ROLE]:
+                for s, p, o in store.triples((None, f'<{predicate}>', None)):
+                    yield get_term_value(s), predicate, get_term_value(o)
+
+        return cls.from_triples(relevant_triples())
+
+    def __len__(self):
+        return len(self.frame_label_to_uri)
+
+    def to_dict(self):
+        return {
+            'frame_label_to_uri': self.frame_label_to_uri,
+            'uri_to_label': self.uri_to_label,
+            'frame_uri_to_fe_label_to_uri': self.frame_uri_to_fe_label_to_uri,
+            'ambiguous_frame_labels': self.ambiguous_frame_labels,
+            'ambiguous_uris': self.ambiguous_uris,
+            'source_hash': self.source_hash
+        }
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        index = cls()
+        for attribute, value in the_dict.items():
+            setattr(index, attribute, value)
+        return index
+
+    def get_frame_uri(self, frame_label):
+        assert frame_label in self.frame_label_to_uri, f'no frame found with label {frame_label}'
+        assert frame_label not in self.ambiguous_frame_labels, f'more than one frame found with label {frame_label}'
+        return self.frame_label_to_uri[frame_label]
+
+    def get_label(self, uri):
+        assert uri in self.uri_to_label, f'expected one label for {uri}, got none'
+        assert uri not in self.ambiguous_uris, f'expected one label for {uri}, got more than one'
+        return self.uri_to_label[uri]
+
+    def get_fe_uris_and_labels(self, frame_uri):
+        label_to_fe_uri = self.frame_uri_to_fe_label_to_uri.get(frame_uri, {})
+        for fe_uri in label_to_fe_uri.values():
+            assert fe_uri not in self.ambiguous_uris, f'expected one label for {fe_uri}'
+        return dict(label_to_fe_uri)
+
+    def get_fe_uris_and_labels_of_frames(self, frame_uris=None):
+        return get_fe_uris_and_labels_of_frames(self, frame_uris=frame_uris)
+
+
+def get_premon_index(premon):
+    """
+    return a PremonIndex for the PreMOn graph.
+    If premon is already a PremonIndex, it is returned as is.
+
+    :param premon: PreMOn graph or PremonIndex
+
+    :rtype: PremonIndex
+    """
+    if isinstance(premon, PremonIndex):
+        return premon
+    if isinstance(premon, CompactTripleStore):
+        return PremonIndex.from_compact_store(premon)
+    return PremonIndex.from_graph(premon)
+
+
+def get_sparql_cache_path(nt_path):
+    """
+    the default path of the SPARQL cache of an N-Triples file,
+    e.g., res/premon/premon-2018a-fn17-noinf.sparql_cache.sqlite
+    """
+    return os.path.splitext(nt_path)[0] + '.sparql_cache.sqlite'
+
+
+def enable_sparql_cache(graph, nt_path, cache_path=None, maxsize=4096):
+    """
+    cache the results of the SPARQL queries of this module (get_rdf_uri, get_rdf_label,
+    get_fe_uris_and_labels and get_fe_uris_and_labels_of_frames) on a graph loaded from an N-Triples file.
+
+    :param rdflib.graph.Graph graph: the graph loaded from nt_path
+    :param str nt_path: path of the N-Triples file, of which the sha256 is part of the cache key
+    :param str cache_path: path of the on-disk tier, default: see get_sparql_cache_path
+    :param int maxsize: maximum number of queries in the in-memory tier
+
+    :rtype: SparqlCache
+    """
+    if cache_path is None:
+        cache_path = get_sparql_cache_path(nt_path)
+
+    sparql_cache = SparqlCache(cache_path,
+                               source_hash=file_sha256(nt_path),
+                               maxsize=maxsize)
+    _graph_to_sparql_cache[graph] = sparql_cache
+    return sparql_cache
+
+
+def get_sparql_cache(graph):
+    """
+    :rtype: SparqlCache | None
+    :return: the SPARQL cache of a graph, see enable_sparql_cache
+    """
+    return _graph_to_sparql_cache.get(graph)
+
+
+def run_query(graph, the_query, variables):
+    """
+    run a SPARQL query, of which the result is taken from the SPARQL cache of the graph if possible
+
+    :param rdflib.graph.Graph graph: e.g., PreMOn
+    :param str the_query: a SPARQL SELECT query
+    :param list variables: the variables of which the values are returned
+
+    :rtype: list
+    :return: list of rows, a row contains the string value (or None) of each variable
+    """
+    sparql_cache = get_sparql_cache(graph)
+    if sparql_cache is not None:
+        result = sparql_cache.get(the_query)
+        if result is not None:
+            return result
+
+    count('sparql_queries')
+    result = []
+    for row in graph.query(the_query):
+        values = row.asdict()
+        result.append([str(values[variable]) if values.get(variable) is not None else None
+                       for variable in variables])
+
+    if sparql_cache is not None:
+        sparql_cache.put(the_query, result)
+
+    return result
+
 
 
 def get_fe_uris_and_labels(premon_nt, frame_uri):
-    # get roles
-    roles_of_frames = """SELECT ?o WHERE {
-        <%s> <http://premon.fbk.eu/ontology/core#semRole> ?o
-    }"""
-    the_query = roles_of_frames % frame_uri
+    if isinstance(premon_nt, PremonIndex):
+        return premon_nt.get_fe_uris_and_labels(frame_uri)
+
+    frame_uri_to_label_to_fe_uri = get_fe_uris_and_labels_of_frames(premon_nt,
+                                                                    frame_uris=[frame_uri])
+    return frame_uri_to_label_to_fe_uri[frame_uri]
+
+
+@instrumented
+def get_fe_uris_and_labels_of_frames(premon_nt, frame_uris=None):
+    """
+    get the frame element uris and labels of many frames at once,
+    using one SPARQL query (or the PremonIndex) instead of one query per frame element
+
+    :param premon_nt: PreMOn graph or PremonIndex
+    :param frame_uris: iterable of frame uris, if None, all frames with frame elements are returned
+
+    :rtype: dict
+    :return: frame uri -> frame element label -> frame element uri
+    """
+    if isinstance(premon_nt, PremonIndex):
+        if frame_uris is None:
+            frame_uris = premon_nt.frame_uri_to_fe_label_to_uri
+        return {frame_uri: premon_nt.get_fe_uris_and_labels(frame_uri)
+                for frame_uri in frame_uris}
 
-    results = premon_nt.query(the_query)
+    # restrict the query to the requested frames, so that asking for one frame does not scan all frames
+    frame_values = ''
+    if frame_uris is not None:
+        frame_uris = set(frame_uris)
+        if not frame_uris:
+            return {}
+        frame_values = 'VALUES ?frame { %s }' % ' '.join(f'<{frame_uri}>' for frame_uri in sorted(frame_uris))
 
-    label_to_fe_uri = dict()
-    for result in results:
-        fe_uri = str(result.asdict()['o'])
+    roles_and_labels_of_frames = """SELECT ?frame ?fe ?label WHERE {
+        %s
+        ?frame <http://premon.fbk.eu/ontology/core#semRole> ?fe .
+        OPTIONAL { ?fe rdfs:label ?label }
+    }""" % frame_values
 
-        label = get_rdf_label(premon_nt, fe_uri)
-        label_to_fe_uri[label] = fe_uri
+    fe_uri_to_labels = defaultdict(set)
+    frame_uri_to_fe_uris = defaultdict(set)
+    for frame_uri, fe_uri, label in run_query(premon_nt, roles_and_labels_of_frames, ['frame', 'fe', 'label']):
+        frame_uri_to_fe_uris[frame_uri].add(fe_uri)
+        if label is not None:
+            fe_uri_to_labels[fe_uri].add(label)
 
-    return label_to_fe_uri
+    frame_uri_to_label_to_fe_uri = {frame_uri: {}
+                                    for frame_uri in (frame_uris or [])}
+    for frame_uri, fe_uris in frame_uri_to_fe_uris.items():
+        label_to_fe_uri = frame_uri_to_label_to_fe_uri.setdefault(frame_uri, {})
+        for fe_uri in fe_uris:
+            labels = fe_uri_to_labels[fe_uri]
+            assert len(labels) == 1, f'expected one label for {fe_uri}, got {labels}'
+            label_to_fe_uri[min(labels)] = fe_uri
+
+    return frame_uri_to_label_to_fe_uri
 
 def get_rdf_uri(premon_nt, frame_label):
+    if isinstance(premon_nt, PremonIndex):
+        return premon_nt.get_frame_uri(frame_label)
+
     frame_query = """SELECT ?s WHERE {
         ?s rdf:type <http://premon.fbk.eu/ontology/fn#Frame> .
         ?s rdfs:label "%s" .
     }"""
     the_query = frame_query % frame_label
-    results = [result
-               for result in premon_nt.query(the_query)]
+    results = run_query(premon_nt, the_query, ['s'])
 
     assert len(results) == 1, f'query should only have one result: {the_query}\n{results}'
 
-    for result in results:
-        frame_rdf_uri = str(result.asdict()['s'])
+    frame_rdf_uri = results[0][0]
 
     return frame_rdf_uri
 
+@instrumented
 def load_nquads_file(path_to_nquad_file):
     """
     load rdf file in nquads format
@@ -51,6 +478,7 @@ def load_nquads_file(path_to_nquad_file):
         g.parse(infile, format="nquads")
     return g
 
+@instrumented
 def convert_nquads_to_nt(g, output_path):
     """
 
@@ -61,6 +489,75 @@ def convert_nquads_to_nt(g, output_path):
     """
     g.serialize(destination=output_path, format='nt')
 
+def split_nquad_line(line):
+    """
+    split one line of an N-Quads (or N-Triples) file into its terms,
+    which are returned in N-Triples syntax, e.g., '<http://...>' or '"label"@en'
+
+    :param str line: a line of an N-Quads file
+
+    :rtype: list | None
+    :return: [subject, predicate, object] or [subject, predicate, object, graph],
+    None for empty lines and comments
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+
+    terms = NQUAD_TERM.findall(line)
+    if len(terms) not in {3, 4} or not line.endswith('.'):
+        raise ValueError(f'could not parse N-Quads line: {line}')
+
+    return terms
+
+
+@instrumented
+def convert_nquads_to_nt_streaming(nquads_path,
+                                   output_path,
+                                   predicates=None,
+                                   verbose=0):
+    """
+    convert an N-Quads file to N-Triples by dropping the graph column,
+    one line at a time, so that the memory usage does not depend on the size of the file.
+
+    Unlike convert_nquads_to_nt, triples that occur in more than one graph
+    are written more than once, which is harmless when the file is loaded into a graph.
+
+    :param str nquads_path: path to rdf file in nquad format, gzipped if it ends with .gz
+    :param str output_path: path of the N-Triples file
+    :param predicates: if provided, only triples with one of these predicate uris are kept,
+    e.g., PREMON_PREDICATES for the predicates used by this package
+
+    :rtype: int
+    :return: number of triples written
+    """
+    predicate_terms = None
+    if predicates is not None:
+        predicate_terms = {f'<{predicate}>' for predicate in predicates}
+
+    opener = gzip.open if nquads_path.endswith('.gz') else open
+
+    num_triples = 0
+    with opener(nquads_path, mode='rt', encoding='utf-8') as infile, \
+         open(output_path, mode='w', encoding='utf-8') as outfile:
+        for line in infile:
+            terms = split_nquad_line(line)
+            if terms is None:
+                continue
+            if predicate_terms is not None and terms[1] not in predicate_terms:
+                continue
+
+            outfile.write(f'{terms[0]} {terms[1]} {terms[2]} .\n')
+            num_triples += 1
+
+    record_bytes_written(output_path, os.path.getsize(output_path))
+
+    if verbose:
+        print(f'written {num_triples} triples from {nquads_path} to {output_path}')
+
+    return num_triples
+
+@instrumented
 def load_nt_graph(nt_path):
     g = Graph()
     with open(nt_path, 'rb') as infile:
@@ -69,25 +566,421 @@ def load_nt_graph(nt_path):
     return g
 
 
+def get_term_value(term):
+    """
+    get the value of a term in N-Triples syntax, i.e., the IRI of an IRI and the lexical form of a literal,
+    e.g., '<http://premon.fbk.eu/resource/fn17-appointing>' -> 'http://premon.fbk.eu/resource/fn17-appointing'
+    and '"Appointing"@en' -> 'Appointing'. Blank nodes are returned as is.
+
+    :rtype: str
+    """
+    if term.startswith('<'):
+        value = term[1:-1]
+    elif term.startswith('"'):
+        value = term[1:term.rindex('"')]
+    else:
+        return term
+
+    if '\\' not in value:
+        return value
+
+    def unescape(match):
+        code_point = match.group(1) or match.group(2)
+        if code_point is not None:
+            return chr(int(code_point, 16))
+        return NT_ECHARS.get(match.group(3), match.group(0))
+
+    return NT_ESCAPE.sub(unescape, value)
+
+
+class CompactTripleStore:
+    """
+    compact in-memory triple store, which uses much less memory than an rdflib graph.
+
+    Each distinct term is stored once, as a string in N-Triples syntax, e.g., '<http://...>' or '"label"@en',
+    and the triples are stored per predicate as two arrays with the IDs of the subjects and objects.
+    Duplicate triples are not removed.
+    """
+    def __init__(self):
+        self.terms = []
+        self._term_to_id = {}
+        self._predicate_to_subjects_and_objects = {}
+
+    def __repr__(self):
+        return f'CompactTripleStore({len(self)} triples, {len(self.terms)} terms)'
+
+    def __len__(self):
+        return sum(len(subjects) for subjects, _ in self._predicate_to_subjects_and_objects.values())
+
+    def _get_id(self, term):
+        term_id = self._term_to_id.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self._term_to_id[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def add(self, triple):
+        """
+        :param tuple triple: (subject, predicate, object) in N-Triples syntax
+        """
+        s, p, o = triple
+        predicate_id = self._get_id(p)
+        if predicate_id not in self._predicate_to_subjects_and_objects:
+            self._predicate_to_subjects_and_objects[predicate_id] = (array('L'), array('L'))
+        subjects, objects = self._predicate_to_subjects_and_objects[predicate_id]
+        subjects.append(self._get_id(s))
+        objects.append(self._get_id(o))
+
+    def add_columns(self, terms, predicate_to_subjects_and_objects):
+        """
+        add the triples of another store, e.g., of the byte ranges parsed by a worker of load_nt_parallel.
+        Each term of the other store is looked up once, its triples are added by mapping their term IDs.
+
+        :param list terms: the terms of the other store, the ID of a term is its position
+        :param dict predicate_to_subjects_and_objects: predicate ID -> (array of subject IDs, array of object IDs)
+        """
+        id_map = array('L', [self._get_id(term) for term in terms])
+        for predicate_id, (subjects, objects) in predicate_to_subjects_and_objects.items():
+            predicate_id = id_map[predicate_id]
+            if predicate_id not in self._predicate_to_subjects_and_objects:
+                self._predicate_to_subjects_and_objects[predicate_id] = (array('L'), array('L'))
+            all_subjects, all_objects = self._predicate_to_subjects_and_objects[predicate_id]
+            all_subjects.extend(map(id_map.__getitem__, subjects))
+            all_objects.extend(map(id_map.__getitem__, objects))
+
+    def to_graph(self, bnode_prefix=''):
+        """
+        convert the store into an rdflib graph, each distinct term is converted into an rdflib term once
+
+        :param str bnode_prefix: prefix of the blank node labels, see _to_rdflib_term
+
+        :rtype: rdflib.graph.Graph
+        """
+        rdflib_terms = [_to_rdflib_term(term, bnode_prefix) for term in self.terms]
+
+        graph = Graph()
+        for predicate_id, (subjects, objects) in self._predicate_to_subjects_and_objects.items():
+            predicate = rdflib_terms[predicate_id]
+            graph.addN((rdflib_terms[subject_id], predicate, rdflib_terms[object_id], graph)
+                       for subject_id, object_id in zip(subjects, objects))
+        return graph
+
+    def triples(self, pattern=(None, None, None)):
+        """
+        iterate over the triples that match a pattern
+
+        :param tuple pattern: (subject, predicate, object) in N-Triples syntax, None matches any term
+
+        :return: generator of (subject, predicate, object) in N-Triples syntax
+        """
+        s, p, o = [self._term_to_id.get(term, -1) if term is not None else None
+                   for term in pattern]
+
+        if p is None:
+            predicate_ids = list(self._predicate_to_subjects_and_objects)
+        else:
+            predicate_ids = [p] if p in self._predicate_to_subjects_and_objects else []
+
+        for predicate_id in predicate_ids:
+            subjects, objects = self._predicate_to_subjects_and_objects[predicate_id]
+            for subject_id, object_id in zip(subjects, objects):
+                if (s is None or s == subject_id) and (o is None or o == object_id):
+                    yield self.terms[subject_id], self.terms[predicate_id], self.terms[object_id]
+
+
+def get_line_aligned_ranges(path, num_ranges):
+    """
+    split a file into byte ranges that start and end at line boundaries
+
+    :rtype: list
+    :return: list of (start, end) byte offsets, at most num_ranges
+    """
+    size = os.path.getsize(path)
+
+    boundaries = [0]
+    with open(path, 'rb') as infile:
+        for index in range(1, num_ranges):
+            position = size * index // num_ranges
+            if position <= boundaries[-1]:
+                continue
+            infile.seek(position)
+            # the line that contains position belongs to the previous range
+            infile.readline()
+            boundaries.append(infile.tell())
+    boundaries.append(size)
+
+    return [(start, end)
+            for start, end in zip(boundaries, boundaries[1:])
+            if end > start]
+
+
+def _to_rdflib_term(term, bnode_prefix):
+    """
+    convert a term in N-Triples syntax to an rdflib term, as the rdflib N-Triples parser does.
+    Blank node labels get bnode_prefix, so that they do not clash with the blank nodes of other files.
+    """
+    if term.startswith('<'):
+        return URIRef(get_term_value(term))
+    if term.startswith('_:'):
+        return BNode(f'{bnode_prefix}{term[2:]}')
+
+    value = get_term_value(term)
+    suffix = term[term.rindex('"') + 1:]
+    if suffix.startswith('@'):
+        return Literal(value, lang=suffix[1:])
+    if suffix.startswith('^^'):
+        return Literal(value, datatype=URIRef(get_term_value(suffix[2:])))
+    return Literal(value)
+
+
+def _parse_nt_ranges(state, range_indices):
+    """
+    parse the byte ranges in state['ranges'] with the provided indices into a CompactTripleStore,
+    so that the terms are interned in the worker and only the distinct terms and arrays of IDs
+    are sent back to the main process
+
+    :rtype: tuple
+    :return: (terms, predicate ID -> (array of subject IDs, array of object IDs)), see CompactTripleStore.add_columns
+    """
+    predicate_terms = state['predicate_terms']
+
+    store = CompactTripleStore()
+    with open(state['nt_path'], 'rb') as infile:
+        for range_index in range_indices:
+            start, end = state['ranges'][range_index]
+            infile.seek(start)
+            for line in infile.read(end - start).decode('utf-8').splitlines():
+                terms = split_nquad_line(line)
+                if terms is None:
+                    continue
+                if predicate_terms is not None and terms[1] not in predicate_terms:
+                    continue
+                store.add(terms[:3])
+
+    return store.terms, store._predicate_to_subjects_and_objects
+
+
+@instrumented
+def load_nt_parallel(nt_path,
+                     workers=None,
+                     predicates=None,
+                     store='compact',
+                     verbose=0):
+    """
+    load an N-Triples file by splitting it into line-aligned byte ranges
+    that are parsed by a pool of processes (see utils.run_in_pool)
+
+    :param str nt_path: path to the N-Triples file, e.g., res/premon/premon-2018a-fn17-noinf.nt
+    :param int workers: number of processes, default: the number of CPUs
+    :param predicates: if provided, only triples with one of these predicate uris are kept,
+    e.g., PREMON_PREDICATES for the predicates used by this package
+    :param str store: compact | graph
+    compact: a CompactTripleStore, which can be passed to get_premon_index.
+    Each worker interns the terms of its ranges and returns its distinct terms and arrays of term IDs,
+    which the main process merges by mapping the IDs (see CompactTripleStore.add_columns).
+    graph: an rdflib graph with the same triples as load_nt_graph.
+    The merged store is converted into the graph in the main process (see CompactTripleStore.to_graph),
+    so only use it if you need the rdflib graph.
+    With one worker and without predicates, load_nt_graph is used.
+
+    :rtype: rdflib.graph.Graph | CompactTripleStore
+    """
+    assert store in {'compact', 'graph'}, f'{store} is not supported: compact | graph'
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 and store == 'graph' and predicates is None:
+        return load_nt_graph(nt_path)
+
+    predicate_terms = None
+    if predicates is not None:
+        predicate_terms = {f'<{predicate}>' for predicate in predicates}
+
+    ranges = get_line_aligned_ranges(nt_path, num_ranges=workers * 4)
+    state = {
+        'nt_path': nt_path,
+        'ranges': ranges,
+        'predicate_terms': predicate_terms
+    }
+
+    result = CompactTripleStore()
+    for terms, predicate_to_subjects_and_objects in run_in_pool(_parse_nt_ranges,
+                                                                num_items=len(ranges),
+                                                                state=state,
+                                                                workers=workers):
+        result.add_columns(terms, predicate_to_subjects_and_objects)
+
+    if store == 'graph':
+        # the same blank node label in two ranges is the same blank node
+        result = result.to_graph(bnode_prefix=f'{BNode()}_')
+
+    if verbose:
+        print(f'loaded {len(result)} triples from {nt_path} using {workers} workers')
+
+    return result
+
+
+def get_snapshot_path(nt_path):
+    """
+    the default path of the compiled snapshot of an N-Triples file,
+    e.g., res/premon/premon-2018a-fn17-noinf.index.pickle
+    """
+    return os.path.splitext(nt_path)[0] + '.index.pickle'
+
+
+@instrumented
+def compile_premon_snapshot(nt_path, snapshot_path=None, verbose=0):
+    """
+    compile the PreMOn N-Triples file into a binary snapshot of the PremonIndex,
+    which only contains the frame, frame element and label information used by this package.
+
+    :param str nt_path: path to PreMOn in N-Triples format
+    :param str snapshot_path: where to store the snapshot, default: see get_snapshot_path
+
+    :rtype: PremonIndex
+    :return: the index stored in the snapshot
+    """
+    if snapshot_path is None:
+        snapshot_path = get_snapshot_path(nt_path)
+
+    stat = os.stat(nt_path)
+    source_hash = file_sha256(nt_path)
+
+    index = PremonIndex.from_graph(load_nt_graph(nt_path))
+    index.source_hash = source_hash
+
+    snapshot = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'index': index.to_dict()
+    }
+
+    with open(snapshot_path, 'wb') as outfile:
+        pickle.dump(snapshot, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+    record_bytes_written(snapshot_path, os.path.getsize(snapshot_path))
+
+    if verbose:
+        print(f'compiled snapshot of {nt_path} ({len(index)} frames) to {snapshot_path}')
+
+    return index
+
+
+@instrumented
+def load_premon_snapshot(nt_path, snapshot_path=None, verbose=0):
+    """
+    load the compiled snapshot of the PreMOn N-Triples file.
+    The snapshot is (re)compiled if it does not exist or if it was
+    compiled from a different version of the N-Triples file.
+
+    The file hash is only recomputed when the size or modification time
+    of the N-Triples file differ from the ones stored in the snapshot.
+
+    :param str nt_path: path to PreMOn in N-Triples format
+    :param str snapshot_path: path to the snapshot, default: see get_snapshot_path
+
+    :rtype: PremonIndex
+    """
+    if snapshot_path is None:
+        snapshot_path = get_snapshot_path(nt_path)
+
+    if not os.path.exists(snapshot_path):
+        if verbose:
+            print(f'no snapshot found at {snapshot_path}, compiling it')
+        return compile_premon_snapshot(nt_path, snapshot_path=snapshot_path, verbose=verbose)
+
+    with open(snapshot_path, 'rb') as infile:
+        snapshot = pickle.load(infile)
+
+    index = PremonIndex.from_dict(snapshot['index'])
+
+    stat = os.stat(nt_path)
+    if all([snapshot['format_version'] == SNAPSHOT_FORMAT_VERSION,
+            snapshot['source_size'] == stat.st_size,
+            snapshot['source_mtime_ns'] == stat.st_mtime_ns]):
+        return index
+
+    if all([snapshot['format_version'] == SNAPSHOT_FORMAT_VERSION,
+            index.source_hash == file_sha256(nt_path)]):
+        # same content, only the file metadata changed
+        snapshot['source_size'] = stat.st_size
+        snapshot['source_mtime_ns'] = stat.st_mtime_ns
+        with open(snapshot_path, 'wb') as outfile:
+            pickle.dump(snapshot, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        return index
+
+    if verbose:
+        print(f'snapshot at {snapshot_path} is stale, recompiling it')
+    return compile_premon_snapshot(nt_path, snapshot_path=snapshot_path, verbose=verbose)
+
+
+@instrumented
+def load_premon(path=None, full_graph=False, reload=False, sparql_cache=True, workers=1, verbose=0):
+    """
+    load PreMOn and make it the shared instance returned by get_premon
+    (and LexicalDataD2TAnnotationTool.premon).
+    Each file is only loaded once per process unless reload is True.
+
+    :param str path: path to PreMOn in N-Triples format, default: res/premon/premon-2018a-fn17-noinf.nt
+    :param bool full_graph: if True, the full rdflib graph is loaded instead of the compiled snapshot
+    :param bool sparql_cache: if True, the SPARQL queries of this module on the full graph are cached, see enable_sparql_cache
+    :param int workers: number of processes that parse the full graph, see load_nt_parallel
+    :param bool reload: if True, load the file even if it is cached
+
+    :rtype: PremonIndex | rdflib.graph.Graph
+    """
+    global _shared_premon
+
+    if path is None:
+        path = DEFAULT_PREMON_NT
+    assert os.path.exists(path), f'{path} does not exist, please run bash install.sh'
+
+    key = (os.path.realpath(path), full_graph)
+    if reload or key not in _premon_cache:
+        if full_graph:
+            _premon_cache[key] = load_nt_parallel(nt_path=path, workers=workers, store='graph')
+            if sparql_cache:
+                enable_sparql_cache(_premon_cache[key], nt_path=path)
+        else:
+            _premon_cache[key] = load_premon_snapshot(nt_path=path, verbose=verbose)
+
+    _shared_premon = _premon_cache[key]
+    return _shared_premon
+
+
+def get_premon():
+    """
+    return the shared PreMOn instance, loading the default one on first access
+
+    :rtype: PremonIndex | rdflib.graph.Graph
+    """
+    if _shared_premon is None:
+        return load_premon()
+    return _shared_premon
+
+
 def get_rdf_label(graph, uri):
+    if isinstance(graph, PremonIndex):
+        return graph.get_label(uri)
+
     query = """SELECT ?o WHERE {
         <%s> rdfs:label ?o
     }"""
     the_query = query % uri
 
-    results = graph.query(the_query)
-
     labels = set()
-    for result in results:
-        label = str(result.asdict()['o'])
+    for label, in run_query(graph, the_query, ['o']):
         labels.add(label)
 
     assert len(labels) == 1, f'expected one label for {uri}, got {labels}'
 
-    return labels.pop()
+    return min(labels)
 
 if __name__ == '__main__':
     # should exist after running install.sh
-    path = 'res/premon/premon-2018a-fn17-noinf.tql'
-    g = load_nquads_file(path_to_nquad_file=path)
-    convert_nquads_to_nt(g, output_path='res/premon/premon-2018a-fn17-noinf.nt')
\ No newline at end of file
+    path = 'res/premon/premon-2018a-fn17-noinf.tql.gz'
+    convert_nquads_to_nt_streaming(nquads_path=path,
+                                   output_path='res/premon/premon-2018a-fn17-noinf.nt',
+                                   verbose=1)
\ No newline at end of file
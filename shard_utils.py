@@ -0,0 +1,133 @@
+import os
+import zlib
+import shutil
+from collections import defaultdict
+
+from .io_utils import dump_data, load_data, find_data_path, get_base_path
+
+SHARD_BY = {'first_char', 'hash'}
+
+
+def get_shard_key(lemma, shard_by='first_char', num_shards=64):
+    """
+    get the key of the shard that contains a lemma
+
+    first_char: the lowercased first character of the lemma if it is alphanumeric, else _
+    hash: crc32 of the UTF-8 encoded lemma modulo num_shards
+
+    :param str lemma: a lemma, e.g., verkiezing
+    :param str shard_by: first_char | hash
+    :param int num_shards: number of shards if shard_by is hash
+
+    :rtype: str
+    """
+    assert shard_by in SHARD_BY, f'{shard_by} is not supported: {" | ".join(sorted(SHARD_BY))}'
+
+    if shard_by == 'first_char':
+        first_char = lemma[:1].lower()
+        if first_char.isalnum():
+            return first_char
+        return '_'
+
+    return str(zlib.crc32(lemma.encode('utf-8')) % num_shards)
+
+
+def get_sharded_lookup_folder(lexical_lookup_path):
+    """
+    get the folder of the sharded layout of a lexical lookup,
+    e.g., typicality/lexical_lookup/LANGUAGE/EVENT_TYPE.json -> typicality/lexical_lookup/LANGUAGE/EVENT_TYPE
+    """
+    return get_base_path(lexical_lookup_path)
+
+
+def sharded_lookup_exists(lexical_lookup_path):
+    folder = get_sharded_lookup_folder(lexical_lookup_path)
+    return find_data_path(os.path.join(folder, 'index.json')) is not None
+
+
+def write_sharded_lexical_lookup(the_json,
+                                 lexical_lookup_path,
+                                 output_format='pretty',
+                                 shard_by='first_char',
+                                 num_shards=64):
+    """
+    write a lexical lookup (see typicality_utils.create_lexical_lookup_per_eventtype)
+    as a folder with a small index and one file per shard of lemmas:
+
+    EVENT_TYPE
+        index.json
+        ordered_frames.json
+        shards
+            SHARD_KEY.json: LEMMA -> the value of LEMMA in 'lexical_lookup'
+
+    index.json contains
+        'shard_by': first_char | hash (see get_shard_key)
+        'num_shards': number of shards if shard_by is hash
+        'ordered_frames': path of ordered_frames.json relative to the folder
+        'shards': SHARD_KEY -> path of the shard relative to the folder
+
+    :param dict the_json: the lexical lookup
+    :param str lexical_lookup_path: path of the lexical lookup in the single file layout
+    :param str output_format: pretty | minified | gzip | msgpack, used for all files
+
+    :rtype: str
+    :return: path of the index
+    """
+    assert shard_by in SHARD_BY, f'{shard_by} is not supported: {" | ".join(sorted(SHARD_BY))}'
+
+    folder = get_sharded_lookup_folder(lexical_lookup_path)
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+    shards_folder = os.path.join(folder, 'shards')
+    os.makedirs(shards_folder)
+
+    shard_key_to_lemmas = defaultdict(dict)
+    for lemma, pos_to_dropdown in the_json['lexical_lookup'].items():
+        shard_key = get_shard_key(lemma, shard_by=shard_by, num_shards=num_shards)
+        shard_key_to_lemmas[shard_key][lemma] = pos_to_dropdown
+
+    shard_key_to_path = {}
+    for shard_key, lemma_to_pos_to_dropdown in shard_key_to_lemmas.items():
+        shard_path = dump_data(lemma_to_pos_to_dropdown,
+                               os.path.join(shards_folder, f'{shard_key}.json'),
+                               output_format=output_format)
+        shard_key_to_path[shard_key] = os.path.relpath(shard_path, folder).replace(os.sep, '/')
+
+    ordered_frames_path = dump_data(the_json['ordered_frames'],
+                                    os.path.join(folder, 'ordered_frames.json'),
+                                    output_format=output_format)
+
+    index = {
+        'shard_by': shard_by,
+        'num_shards': num_shards,
+        'ordered_frames': os.path.relpath(ordered_frames_path, folder).replace(os.sep, '/'),
+        'shards': shard_key_to_path
+    }
+
+    return dump_data(index,
+                     os.path.join(folder, 'index.json'),
+                     output_format=output_format)
+
+
+def load_lemma_from_sharded_lookup(lexical_lookup_path, lemma):
+    """
+    load the entry of one lemma from a sharded lexical lookup,
+    only reading the index and the shard of the lemma
+
+    :param str lexical_lookup_path: path of the lexical lookup in the single file layout
+    :param str lemma: a lemma, e.g., verkiezing
+
+    :rtype: dict | None
+    :return: the value of the lemma in 'lexical_lookup', None if the lemma is not in the lookup
+    """
+    folder = get_sharded_lookup_folder(lexical_lookup_path)
+    index = load_data(os.path.join(folder, 'index.json'))
+
+    shard_key = get_shard_key(lemma,
+                              shard_by=index['shard_by'],
+                              num_shards=index['num_shards'])
+    if shard_key not in index['shards']:
+        return None
+
+    lemma_to_pos_to_dropdown = load_data(os.path.join(folder, index['shards'][shard_key]))
+    return lemma_to_pos_to_dropdown.get(lemma)
@@ -0,0 +1,94 @@
+import sqlite3
+
+# frames without a typicality score within a known event type get the score of initialize_typical_frames
+DEFAULT_TYPICALITY_SCORE = 0
+
+RANKED_FRAMES_QUERY = """
+SELECT COALESCE(t.score, %d), lu.frame_label, lu.frame_uri, lu.lu_uri, lu.lu_name, lu.lexicon_uri, le.pos
+FROM lexical_entries le
+JOIN lexical_units lu ON lu.lu_id = le.lu_id
+LEFT JOIN typicality_scores t ON t.frame_uri = lu.frame_uri AND t.event_type = ?
+WHERE le.language = ? AND le.lemma = ? %%s
+ORDER BY le.pos, le.position
+""" % DEFAULT_TYPICALITY_SCORE
+
+
+def open_database(db_path):
+    """
+    open a database created by sqlite_utils.export_to_sqlite in read-only mode
+
+    :rtype: sqlite3.Connection
+    """
+    return sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+
+
+def _assert_event_type_exists(connection, event_type):
+    """
+    the lexical lookups only exist for event types with typicality scores, see typicality_utils.load_typicality_scores
+    """
+    row = connection.execute('SELECT 1 FROM typicality_scores WHERE event_type = ? LIMIT 1',
+                             (event_type,)).fetchone()
+    assert row is not None, f'no typicality scores found for event type {event_type}'
+
+
+def _to_dropdown_values(rows):
+    pos_to_values = {}
+    for score, frame_label, frame_uri, lu_uri, lu_name, lexicon_uri, pos in rows:
+        dropdown_label = f'{frame_label} ({lu_name}) ({score})'
+        pos_to_values.setdefault(pos, []).append([score,
+                                                  dropdown_label,
+                                                  frame_uri,
+                                                  lu_uri,
+                                                  lu_name,
+                                                  lexicon_uri])
+
+    # sort by score, lexical units with the same score keep the order of lemma_to_pos_to_lus.json
+    for values in pos_to_values.values():
+        values.sort(key=lambda value: value[0], reverse=True)
+
+    return pos_to_values
+
+
+def get_ranked_frames(connection, language, lemma, pos, event_type):
+    """
+    get the ranked dropdown entries of a lemma and pos for an event type,
+    which are the same as in the lexical lookup of the event type.
+    Frames without a typicality score for the event type get DEFAULT_TYPICALITY_SCORE.
+    An AssertionError is raised for an event type without typicality scores, as for the lexical lookups.
+
+    :param sqlite3.Connection connection: see open_database
+    :param str language: nl | en
+    :param str lemma: e.g., verkiezing
+    :param str pos: e.g., N
+    :param str event_type: e.g., Q40231
+
+    :rtype: list
+    :return: list of [typicality_score, dropdown_label, frame_uri, lu_uri, lu_name, lexicon_url]
+    """
+    _assert_event_type_exists(connection, event_type)
+    rows = connection.execute(RANKED_FRAMES_QUERY % 'AND le.pos = ?',
+                              (event_type, language, lemma, pos))
+    return _to_dropdown_values(rows).get(pos, [])
+
+
+def get_lemma_lookup(connection, language, lemma, event_type):
+    """
+    get the entry of a lemma in the lexical lookup of an event type
+
+    :param sqlite3.Connection connection: see open_database
+
+    :rtype: dict
+    :return: POS -> ranked dropdown entries (see get_ranked_frames), and 'all_frames' -> sorted list of frame uris.
+    Empty if the lemma is not in the lexicon.
+    """
+    _assert_event_type_exists(connection, event_type)
+    rows = connection.execute(RANKED_FRAMES_QUERY % '',
+                              (event_type, language, lemma))
+    pos_to_values = _to_dropdown_values(rows)
+    if not pos_to_values:
+        return {}
+
+    pos_to_values['all_frames'] = sorted({value[2]
+                                          for values in pos_to_values.values()
+                                          for value in values})
+    return pos_to_values
@@ -0,0 +1,149 @@
+import os
+import sqlite3
+
+from .io_utils import load_data, find_data_path
+from .typicality_utils import load_lexicon, load_typicality_scores, get_event_types
+
+# scores are stored without type affinity, so that 0 and 1.0 remain 0 and 1.0
+# and the dropdown labels are the same as in the lexical lookups
+SCHEMA = """
+CREATE TABLE frames (
+    frame_id INTEGER PRIMARY KEY,
+    frame_uri TEXT NOT NULL UNIQUE,
+    frame_label TEXT NOT NULL,
+    definition TEXT,
+    framenet_url TEXT
+);
+
+CREATE TABLE frame_elements (
+    fe_id INTEGER PRIMARY KEY,
+    frame_id INTEGER NOT NULL REFERENCES frames (frame_id),
+    fe_uri TEXT NOT NULL,
+    fe_label TEXT NOT NULL,
+    fe_type TEXT,
+    definition TEXT
+);
+
+CREATE TABLE lexical_units (
+    lu_id INTEGER PRIMARY KEY,
+    lu_uri TEXT NOT NULL UNIQUE,
+    language TEXT NOT NULL,
+    lu_name TEXT NOT NULL,
+    framenet_lu_id,
+    definition TEXT,
+    frame_uri TEXT NOT NULL,
+    frame_label TEXT NOT NULL,
+    lexicon_uri TEXT NOT NULL
+);
+
+CREATE TABLE lexical_entries (
+    language TEXT NOT NULL,
+    lemma TEXT NOT NULL,
+    pos TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    lu_id INTEGER NOT NULL REFERENCES lexical_units (lu_id)
+);
+
+CREATE TABLE typicality_scores (
+    event_type TEXT NOT NULL,
+    frame_uri TEXT NOT NULL,
+    score,
+    PRIMARY KEY (event_type, frame_uri)
+) WITHOUT ROWID;
+
+CREATE INDEX frame_elements_frame_id ON frame_elements (frame_id);
+CREATE INDEX lexical_units_frame_uri ON lexical_units (frame_uri);
+CREATE INDEX lexical_entries_lookup ON lexical_entries (language, lemma, pos, position);
+"""
+
+
+def get_languages(output_folder):
+    """
+    get the languages for which there is a lexicon in the output folder
+
+    :rtype: list
+    """
+    lexicons_folder = os.path.join(output_folder, 'lexicons')
+    if not os.path.exists(lexicons_folder):
+        return []
+
+    return sorted(language
+                  for language in os.listdir(lexicons_folder)
+                  if os.path.isdir(os.path.join(lexicons_folder, language)))
+
+
+def export_to_sqlite(output_folder,
+                     db_path,
+                     languages=None,
+                     event_types=None,
+                     verbose=0):
+    """
+    export the lexical data of the output folder to one SQLite database with the tables
+    frames, frame_elements, lexical_units, lexical_entries and typicality_scores.
+    An existing database at db_path is replaced.
+
+    Use sqlite_query to query the database.
+
+    :param str output_folder: output folder containing the lexical data for the annotation tool
+    :param str db_path: path of the SQLite database
+    :param languages: iterable of languages, if None, all languages in the lexicons folder are exported
+    :param event_types: iterable of event types, if None, all event types with typicality scores are exported
+    """
+    if languages is None:
+        languages = get_languages(output_folder)
+    if event_types is None:
+        event_types = get_event_types(output_folder)
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    connection = sqlite3.connect(db_path)
+    try:
+        connection.executescript(SCHEMA)
+
+        # frames
+        num_frames = 0
+        frame_to_info_path = os.path.join(output_folder, 'lexicons', 'frame_to_info.json')
+        if find_data_path(frame_to_info_path) is not None:
+            frame_to_info = load_data(frame_to_info_path)
+            for frame_uri, info in sorted(frame_to_info.items()):
+                cursor = connection.execute('INSERT INTO frames (frame_uri, frame_label, definition, framenet_url) VALUES (?, ?, ?, ?)',
+                                            (frame_uri, info['frame_label'], info['definition'], info['framenet_url']))
+                frame_id = cursor.lastrowid
+                connection.executemany('INSERT INTO frame_elements (frame_id, fe_uri, fe_label, fe_type, definition) VALUES (?, ?, ?, ?, ?)',
+                                       [(frame_id, fe['rdf_uri'], fe['fe_label'], fe['fe_type'], fe['definition'])
+                                        for fe in info['frame_elements']])
+                num_frames += 1
+
+        # lexical units and lexical entries
+        num_lus = 0
+        for language in languages:
+            lu_to_info, lemma_to_pos_to_lus = load_lexicon(output_folder, language)
+
+            lu_uri_to_id = {}
+            for lu_uri, info in sorted(lu_to_info.items()):
+                cursor = connection.execute('INSERT INTO lexical_units (lu_uri, language, lu_name, framenet_lu_id, definition, frame_uri, frame_label, lexicon_uri) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                            (lu_uri, language, info['lu_name'], info['lu_id'], info['lu_definition'],
+                                             info['frame_uri'], info['frame_label'], info['lexicon_uri']))
+                lu_uri_to_id[lu_uri] = cursor.lastrowid
+            num_lus += len(lu_uri_to_id)
+
+            connection.executemany('INSERT INTO lexical_entries (language, lemma, pos, position, lu_id) VALUES (?, ?, ?, ?, ?)',
+                                   [(language, lemma, pos, position, lu_uri_to_id[lu_uri])
+                                    for lemma, pos_to_lus in lemma_to_pos_to_lus.items()
+                                    for pos, lu_uris in pos_to_lus.items()
+                                    for position, lu_uri in enumerate(lu_uris)])
+
+        # typicality scores
+        for event_type in event_types:
+            frame_to_score = load_typicality_scores(output_folder, event_type)
+            connection.executemany('INSERT INTO typicality_scores (event_type, frame_uri, score) VALUES (?, ?, ?)',
+                                   [(event_type, frame_uri, score)
+                                    for frame_uri, score in frame_to_score.items()])
+
+        connection.commit()
+    finally:
+        connection.close()
+
+    if verbose:
+        print(f'exported {num_frames} frames, {num_lus} LUs ({", ".join(languages)}) and the typicality scores of {len(event_types)} event types to {db_path}')
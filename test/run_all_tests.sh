@@ -1,4 +1,19 @@
 
 python import_it.py
 python create_folder_with_lexicon_data.py
-python typicality.py
\ No newline at end of file
+python typicality.py
+python test_rdf_utils.py
+python test_io_utils.py
+python test_shard_utils.py
+python test_typicality_matrix.py
+python test_mwe_matcher.py
+python test_normalized_utils.py
+python test_lemma_index.py
+python test_framenet_snapshot.py
+python test_sqlite_utils.py
+python test_typicality_journal.py
+python test_manifest_utils.py
+python test_incremental_rebuilds.py
+python test_instrumentation.py
+python test_premon_loading.py
+python test_lexical_lookup.py
@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.framenet_snapshot import FrameNetSnapshot, get_framenet_snapshot
+from LexicalDataD2TAnnotationTool.manifest_utils import framenet_fingerprint
+from LexicalDataD2TAnnotationTool.benchmark.synthetic_framenet import SyntheticFrameNet
+
+
+def get_small_framenet():
+    return SyntheticFrameNet(num_frames=3, lus_per_frame=2, fes_per_frame=2, seed=0)
+
+
+your_fn = get_small_framenet()
+snapshot = FrameNetSnapshot.from_framenet(your_fn)
+assert framenet_fingerprint(snapshot) == framenet_fingerprint(your_fn)
+
+fn_frame = your_fn.frames()[0]
+frame = snapshot.frames()[0]
+assert (frame.name, frame.definition, frame.URL) == (fn_frame.name, fn_frame.definition, fn_frame.URL)
+assert {fe.name: fe.coreType for fe in frame.FE.values()} == {fe.name: fe.coreType for fe in fn_frame.FE.values()}
+
+fn_lu = your_fn.lu(1)
+lu = snapshot.lu(1)
+assert (lu.name, lu.POS, lu.definition, lu.frame) == (fn_lu.name, fn_lu.POS, fn_lu.definition, frame)
+assert lu.lexemes == fn_lu.lexemes
+assert len(snapshot.frames()) == 3
+assert sum(len(frame.lexUnit) for frame in snapshot.frames()) == len(your_fn.lus())
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    path = os.path.join(tmp_dir, 'fn_snapshot.json')
+    loaded = FrameNetSnapshot.load(snapshot.save(path))
+    assert loaded.to_dict() == snapshot.to_dict()
+
+    assert get_framenet_snapshot(your_fn, path).to_dict() == snapshot.to_dict()
+
+    # the snapshot is recreated when the FrameNet changes
+    changed_fn = get_small_framenet()
+    changed_fn.frames()[0].definition = 'Another definition.'
+    lu_id = len(changed_fn.lus()) + 1
+    changed_fn.frames()[0].lexUnit['kiezen.v'] = SimpleNamespace(ID=lu_id, name='kiezen.v', POS='V', definition='', lexemes=[])
+    assert get_framenet_snapshot(changed_fn, path).lu(lu_id).name == 'kiezen.v'
+    assert get_framenet_snapshot(changed_fn, path).frames()[0].definition == 'Another definition.'
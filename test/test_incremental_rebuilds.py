@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.utils import run_in_pool
+from LexicalDataD2TAnnotationTool.io_utils import load_data
+from LexicalDataD2TAnnotationTool.manifest_utils import load_manifest
+from LexicalDataD2TAnnotationTool.rdf_utils import get_premon_index, load_nt_graph
+from LexicalDataD2TAnnotationTool.lexicon_utils import add_frame_to_info, add_lu_to_info, add_lemma_to_pos_to_lu_urls
+from LexicalDataD2TAnnotationTool.typicality_utils import initialize_typical_frames, update_typical_frames, refresh_lexical_lookups
+from LexicalDataD2TAnnotationTool.benchmark.synthetic_framenet import SyntheticFrameNet, write_premon_nt, get_premon_frame_uri
+
+
+def get_premon(your_fn):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nt_path = os.path.join(tmp_dir, 'premon.nt')
+        write_premon_nt(your_fn, nt_path)
+        return get_premon_index(load_nt_graph(nt_path))
+
+
+def get_mtime(path):
+    return os.stat(path).st_mtime_ns
+
+
+your_fn = SyntheticFrameNet(num_frames=5, lus_per_frame=2, fes_per_frame=2, seed=0)
+premon = get_premon(your_fn)
+
+# run_in_pool: the results do not depend on the number of workers
+def get_squares(state, indices):
+    return [state['numbers'][index] ** 2 for index in indices]
+
+state = {'numbers': list(range(10))}
+for workers in [1, 3]:
+    results = run_in_pool(get_squares, num_items=10, state=state, workers=workers)
+    assert [square for result in results for square in result] == [number ** 2 for number in range(10)]
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+
+    # workers=N results in the same output as workers=1
+    workers_to_output = {}
+    for workers in [1, 2]:
+        output_folder = os.path.join(tmp_dir, f'workers_{workers}')
+        os.mkdir(output_folder)
+        add_frame_to_info(output_folder, your_fn, premon, workers=workers)
+        add_lu_to_info(your_fn, 'en', premon, 'http://rdf.cltl.nl/', 1, 7, output_folder, workers=workers)
+        workers_to_output[workers] = (load_data(os.path.join(output_folder, 'lexicons', 'frame_to_info.json')),
+                                      load_data(os.path.join(output_folder, 'lexicons', 'en', 'lu_to_info.json')))
+    assert workers_to_output[1] == workers_to_output[2]
+    assert len(workers_to_output[1][0]) == len(your_fn.frames())
+    assert len(workers_to_output[1][1]) == len(your_fn.lus())
+
+    # without incremental, no fingerprints are computed, so the next incremental run regenerates the files
+    manifest = load_manifest(output_folder)
+    assert manifest['lexicons/frame_to_info.json'] is None
+    assert manifest['lexicons/en/lu_to_info.json'] is None
+
+    # a second incremental run skips its work
+    output_folder = os.path.join(tmp_dir, 'workers_1')
+    frame_to_info_path = os.path.join(output_folder, 'lexicons', 'frame_to_info.json')
+    lu_to_info_path = os.path.join(output_folder, 'lexicons', 'en', 'lu_to_info.json')
+    lemma_to_pos_to_lus_path = os.path.join(output_folder, 'lexicons', 'en', 'lemma_to_pos_to_lus.json')
+
+    add_frame_to_info(output_folder, your_fn, premon, incremental=True)
+    add_lu_to_info(your_fn, 'en', premon, 'http://rdf.cltl.nl/', 1, 7, output_folder, incremental=True)
+    add_lemma_to_pos_to_lu_urls(output_folder, 'en', incremental=True)
+    path_to_mtime = {path: get_mtime(path)
+                     for path in [frame_to_info_path, lu_to_info_path, lemma_to_pos_to_lus_path]}
+
+    add_frame_to_info(output_folder, your_fn, premon, incremental=True)
+    assert add_lu_to_info(your_fn, 'en', premon, 'http://rdf.cltl.nl/', 1, 7, output_folder, incremental=True) is None
+    add_lemma_to_pos_to_lu_urls(output_folder, 'en', incremental=True)
+    assert all(get_mtime(path) == mtime for path, mtime in path_to_mtime.items())
+
+    # changed inputs are regenerated
+    add_lu_to_info(your_fn, 'en', premon, 'http://rdf.cltl.nl/', 1, 8, output_folder, incremental=True)
+    add_frame_to_info(output_folder, your_fn, premon, incremental=True)
+    add_lemma_to_pos_to_lu_urls(output_folder, 'en', incremental=True)
+    assert get_mtime(lu_to_info_path) != path_to_mtime[lu_to_info_path]
+    assert get_mtime(frame_to_info_path) == path_to_mtime[frame_to_info_path]
+    assert get_mtime(lemma_to_pos_to_lus_path) != path_to_mtime[lemma_to_pos_to_lus_path]
+
+    # refresh_lexical_lookups only recreates the lexical lookups of which the inputs changed
+    for event_type in ['Q40231', 'Q1079023']:
+        initialize_typical_frames(output_folder, your_fn, premon, event_type)
+    assert refresh_lexical_lookups(output_folder, 'en', premon=premon, expected_num_frames=None) == ['Q1079023', 'Q40231']
+    assert refresh_lexical_lookups(output_folder, 'en', premon=premon, expected_num_frames=None) == []
+
+    update_typical_frames(output_folder, premon, 'Q40231', {'Frame_3': 0.8})
+    assert refresh_lexical_lookups(output_folder, 'en', premon=premon, workers=2, expected_num_frames=None) == ['Q40231']
+    lexical_lookup = load_data(os.path.join(output_folder, 'typicality', 'lexical_lookup', 'en', 'Q40231.json'))
+    assert lexical_lookup['ordered_frames'][0] == [0.8, 'Frame_3 (0.8)', get_premon_frame_uri('Frame_3')]
+
+    assert refresh_lexical_lookups(output_folder, 'en', premon=premon, output_format='gzip', expected_num_frames=None) == ['Q1079023', 'Q40231']
+    assert refresh_lexical_lookups(output_folder, 'en', premon=premon, output_format='gzip', expected_num_frames=None) == []
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.utils import run_in_pool
+from LexicalDataD2TAnnotationTool.instrumentation import instrument, instrumented, count, record_bytes_written
+
+
+@instrumented
+def write_frames(path, num_frames):
+    count('frames', num_frames)
+    record_bytes_written(path, 10 * num_frames)
+
+
+@instrumented
+def build(path):
+    count('lus', 3)
+    write_frames(path, 2)
+    write_frames(path, 5)
+
+
+@instrumented
+def fail():
+    count('sparql_queries')
+    raise ValueError('failed stage')
+
+
+def count_in_worker(state, indices):
+    write_frames(state['path'], len(indices))
+    return len(indices)
+
+
+@instrumented
+def build_in_pool(path, workers):
+    return run_in_pool(count_in_worker, num_items=10, state={'path': path}, workers=workers)
+
+
+# the stages are named after the module and the function, e.g., lexicon_utils.add_frame_to_info
+module = __name__
+
+# without instrument(), nothing is recorded
+build('frames.json')
+
+with instrument() as report:
+    build('frames.json')
+
+    # a stage also ends when the function raises
+    try:
+        fail()
+    except ValueError:
+        pass
+    count('frames', 100)
+
+stage_to_stats = report.to_dict()
+assert list(stage_to_stats) == [f'{module}.build', f'{module}.write_frames', f'{module}.fail']
+
+# the statistics of a stage include those of the stages it calls
+build_stats = stage_to_stats[f'{module}.build']
+assert (build_stats['calls'], build_stats['frames'], build_stats['lus']) == (1, 7, 3)
+assert build_stats['bytes_written'] == {'frames.json': 70}
+
+write_stats = stage_to_stats[f'{module}.write_frames']
+assert (write_stats['calls'], write_stats['frames'], write_stats['lus']) == (2, 7, 0)
+assert write_stats['seconds'] <= build_stats['seconds']
+
+fail_stats = stage_to_stats[f'{module}.fail']
+assert (fail_stats['calls'], fail_stats['sparql_queries'], fail_stats['frames']) == (1, 1, 0)
+
+# JSON export
+with tempfile.TemporaryDirectory() as tmp_dir:
+    json_path = os.path.join(tmp_dir, 'report.json')
+    the_json = report.to_json(json_path)
+    with open(json_path) as infile:
+        assert json.load(infile) == json.loads(the_json) == stage_to_stats
+
+# the work done in the processes of run_in_pool counts for the stage that started the pool
+for workers in [1, 2]:
+    with instrument() as report:
+        assert sum(build_in_pool('frames.json', workers)) == 10
+
+    stage_to_stats = report.to_dict()
+    pool_stats = stage_to_stats[f'{module}.build_in_pool']
+    assert (pool_stats['calls'], pool_stats['frames']) == (1, 10)
+    assert pool_stats['bytes_written'] == {'frames.json': 100}
+    assert stage_to_stats[f'{module}.write_frames']['frames'] == 10
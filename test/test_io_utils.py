@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.io_utils import dump_data, load_data, find_data_path, detect_output_format, msgpack
+from LexicalDataD2TAnnotationTool.io_utils import dumps_data, loads_data
+
+data = {
+    'lexical_lookup': {
+        'verkiezing': {
+            'N': [[0.8, 'Change_of_leadership (verkiezing.n) (0.8)', 'http://premon.fbk.eu/resource/fn17-change_of_leadership']]
+        }
+    },
+    'ordered_frames': []
+}
+
+output_formats = ['pretty', 'minified', 'gzip']
+if msgpack is not None:
+    output_formats.append('msgpack')
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    path = os.path.join(tmp_dir, 'Q40231.json')
+    for output_format in output_formats:
+        output_path = dump_data(data, path, output_format=output_format)
+        assert find_data_path(path) == output_path
+        assert detect_output_format(output_path) == output_format
+        assert load_data(path) == data
+
+    # only the file in the last output format is kept
+    assert len(os.listdir(tmp_dir)) == 1
+
+# the gzip output does not depend on the time at which it is written
+content = dumps_data(data, output_format='gzip')
+time.sleep(1)
+assert dumps_data(data, output_format='gzip') == content
+assert content[4:8] == bytes(4)
+assert loads_data(content) == data
@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.lemma_index import write_lemma_index, LemmaIndex
+
+lemma_to_value = {
+    'verkiezing': {'N': ['http://rdf.cltl.nl/fn_nl-0.1-1']},
+    'kiezen': {'V': ['http://rdf.cltl.nl/fn_nl-0.1-2', 'http://rdf.cltl.nl/fn_nl-0.1-3']},
+    'zich uitspreken': {'V': ['http://rdf.cltl.nl/fn_nl-0.1-4']},
+    'één': {'NUM': []},
+    'Amsterdam': {'PROPN': []}
+}
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    index_path = write_lemma_index(lemma_to_value,
+                                   os.path.join(tmp_dir, 'lemma_to_pos_to_lus.idx'),
+                                   metadata={'kind': 'lexicon'})
+    with LemmaIndex(index_path) as index:
+        assert len(index) == len(lemma_to_value)
+        assert index.metadata == {'kind': 'lexicon'}
+        assert sorted(index) == sorted(lemma_to_value)
+        for lemma, value in lemma_to_value.items():
+            assert lemma in index
+            assert index[lemma] == value
+        for lemma in ['', 'a', 'kiezer', 'zz', 'verkiezingen']:
+            assert index.get(lemma) is None
+
+    empty_path = write_lemma_index({}, os.path.join(tmp_dir, 'empty.idx'))
+    with LemmaIndex(empty_path) as index:
+        assert len(index) == 0
+        assert index.get('kiezen') is None
@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.io_utils import dump_data
+from LexicalDataD2TAnnotationTool.typicality_utils import build_lexical_lookup
+from LexicalDataD2TAnnotationTool.lexical_lookup import LexicalLookup
+
+premon_resource = 'http://premon.fbk.eu/resource/fn17-'
+lexicon_uri = 'http://rdf.cltl.nl/fn_nl-lexicon-0.1'
+frame_uri_to_label = {
+    f'{premon_resource}change_of_leadership': 'Change_of_leadership',
+    f'{premon_resource}choosing': 'Choosing',
+    f'{premon_resource}leadership': 'Leadership'
+}
+
+
+def get_lu_info(lu_id, lu_name, frame_label):
+    return {'lu_id': lu_id,
+            'lu_name': lu_name,
+            'lu_definition': None,
+            'frame_uri': f'{premon_resource}{frame_label.lower()}',
+            'frame_label': frame_label,
+            'lexicon_uri': lexicon_uri}
+
+
+lu_to_info = {
+    'http://rdf.cltl.nl/fn_nl-0.1-1': get_lu_info(1, 'verkiezing.n', 'Change_of_leadership'),
+    'http://rdf.cltl.nl/fn_nl-0.1-2': get_lu_info(2, 'verkiezing.n', 'Choosing'),
+    'http://rdf.cltl.nl/fn_nl-0.1-3': get_lu_info(3, 'kiezen.v', 'Choosing'),
+    'http://rdf.cltl.nl/fn_nl-0.1-4': get_lu_info(4, 'leider.n', 'Leadership'),
+    'http://rdf.cltl.nl/fn_nl-0.1-5': get_lu_info(5, 'verkiezing.v', 'Choosing')
+}
+
+lemma_to_pos_to_lus = {
+    'verkiezing': {'N': ['http://rdf.cltl.nl/fn_nl-0.1-2', 'http://rdf.cltl.nl/fn_nl-0.1-1'],
+                   'V': ['http://rdf.cltl.nl/fn_nl-0.1-5']},
+    'kiezen': {'V': ['http://rdf.cltl.nl/fn_nl-0.1-3']},
+    'leider': {'N': ['http://rdf.cltl.nl/fn_nl-0.1-4']}
+}
+
+event_type_to_frame_to_score = {
+    'Q40231': {f'{premon_resource}change_of_leadership': 0.8,
+               f'{premon_resource}choosing': 1.0,
+               f'{premon_resource}leadership': 0},
+    'Q1079023': {f'{premon_resource}change_of_leadership': 0.5,
+                 f'{premon_resource}choosing': 0.25,
+                 f'{premon_resource}leadership': 1.0}
+}
+
+
+def write_typicality_scores(output_folder, event_type, frame_to_score):
+    dump_data(frame_to_score, os.path.join(output_folder, 'typicality', 'typicality_scores', f'{event_type}.json'))
+
+
+def get_lexical_lookup(frame_to_score):
+    return build_lexical_lookup(frame_to_score=frame_to_score,
+                                frame_uri_to_label=frame_uri_to_label,
+                                lu_to_info=lu_to_info,
+                                lemma_to_pos_to_lus=lemma_to_pos_to_lus,
+                                expected_num_frames=None)['lexical_lookup']
+
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    os.makedirs(os.path.join(tmp_dir, 'lexicons', 'nl'))
+    os.makedirs(os.path.join(tmp_dir, 'typicality', 'typicality_scores'))
+    dump_data(lu_to_info, os.path.join(tmp_dir, 'lexicons', 'nl', 'lu_to_info.json'))
+    dump_data(lemma_to_pos_to_lus, os.path.join(tmp_dir, 'lexicons', 'nl', 'lemma_to_pos_to_lus.json'))
+    for event_type, frame_to_score in event_type_to_frame_to_score.items():
+        write_typicality_scores(tmp_dir, event_type, frame_to_score)
+
+    lookup = LexicalLookup(output_folder=tmp_dir, language='nl', cache_size=16, scores_cache_size=4)
+    assert sorted(lookup.get_event_types()) == ['Q1079023', 'Q40231']
+
+    # the same entries as the lexical lookup
+    for event_type, frame_to_score in event_type_to_frame_to_score.items():
+        lemma_to_pos_to_dropdown = get_lexical_lookup(frame_to_score)
+        for lemma, pos_to_dropdown in lemma_to_pos_to_dropdown.items():
+            assert lemma in lookup
+            assert lookup.get_lemma(lemma, event_type) == pos_to_dropdown
+            for pos in lemma_to_pos_to_lus[lemma]:
+                assert lookup.get(lemma, pos, event_type) == pos_to_dropdown[pos]
+
+    # unknown lemma or pos
+    assert 'stemmen' not in lookup
+    assert lookup.get('stemmen', 'V', 'Q40231') == []
+    assert lookup.get_lemma('stemmen', 'Q40231') == {}
+    assert lookup.get('kiezen', 'N', 'Q40231') == []
+
+    # unknown event type, as for the lexical lookups
+    try:
+        lookup.get('kiezen', 'V', 'Q5')
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError('expected an AssertionError for an event type without typicality scores')
+
+    # the scores are loaded once per event type, the entries once per (lemma, pos, event_type)
+    lookup.clear_cache()
+    lookup.get('verkiezing', 'N', 'Q40231')
+    lookup.get('verkiezing', 'N', 'Q40231')
+    lookup.get('verkiezing', 'V', 'Q40231')
+    cache_info = lookup.cache_info()
+    assert (cache_info['scores'].hits, cache_info['scores'].misses, cache_info['scores'].currsize) == (1, 1, 1)
+    assert (cache_info['values'].hits, cache_info['values'].misses, cache_info['values'].currsize) == (1, 2, 2)
+    assert cache_info['values'].maxsize == 16 and cache_info['scores'].maxsize == 4
+
+    # callers can not modify the cache
+    lookup.get('verkiezing', 'N', 'Q40231')[0][0] = 100
+    assert lookup.get('verkiezing', 'N', 'Q40231')[0][0] == 1.0
+
+    # updated scores are only used after the event type is invalidated
+    lookup.get('leider', 'N', 'Q1079023')
+    frame_to_score = dict(event_type_to_frame_to_score['Q40231'])
+    frame_to_score[f'{premon_resource}leadership'] = 0.9
+    write_typicality_scores(tmp_dir, 'Q40231', frame_to_score)
+    assert lookup.get('leider', 'N', 'Q40231')[0][0] == 0
+
+    lookup.invalidate('Q40231')
+    assert lookup.get_lemma('leider', 'Q40231') == get_lexical_lookup(frame_to_score)['leider']
+
+    # the entries of the other event types are kept
+    misses = lookup.cache_info()['values'].misses
+    assert lookup.get('leider', 'N', 'Q1079023')[0][0] == 1.0
+    assert lookup.cache_info()['values'].misses == misses
+
+    # invalidate without an event type discards the whole cache
+    lookup.invalidate()
+    assert lookup.cache_info()['values'].currsize == 0
+    assert lookup.cache_info()['scores'].currsize == 0
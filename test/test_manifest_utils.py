@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.manifest_utils import framenet_fingerprint
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    for folder in ['frame', 'lu']:
+        os.mkdir(os.path.join(tmp_dir, folder))
+    for filename, content in [('frameIndex.xml', '<frameIndex/>'),
+                              ('luIndex.xml', '<luIndex/>'),
+                              ('frame/Change_of_leadership.xml', '<definition>A new leader is appointed.</definition>'),
+                              ('lu/lu1.xml', '<lexeme name="verkiezing"/>')]:
+        with open(os.path.join(tmp_dir, filename), 'w') as outfile:
+            outfile.write(content)
+
+    # a FrameNet read from a folder, e.g., nltk's framenet
+    your_fn = SimpleNamespace(_root=tmp_dir)
+    fingerprint = framenet_fingerprint(your_fn)
+    assert framenet_fingerprint(your_fn) == fingerprint
+
+    # editing a frame or lexical unit changes the fingerprint
+    for filename, content in [('frame/Change_of_leadership.xml', '<definition>A leader is appointed.</definition>'),
+                              ('lu/lu1.xml', '<lexeme name="verkiezingen"/>')]:
+        with open(os.path.join(tmp_dir, filename), 'w') as outfile:
+            outfile.write(content)
+        new_fingerprint = framenet_fingerprint(your_fn)
+        assert new_fingerprint != fingerprint
+        fingerprint = new_fingerprint
@@ -0,0 +1,34 @@
+import os
+import sys
+import pickle
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.mwe_matcher import MultiwordMatcher
+
+lemma_to_pos_to_lus = {
+    'give': {'V': ['http://rdf.cltl.nl/fn_en-1.7-1']},
+    'give up': {'V': ['http://rdf.cltl.nl/fn_en-1.7-2']},
+    'up': {'ADV': ['http://rdf.cltl.nl/fn_en-1.7-3']},
+    'take after': {'V': ['http://rdf.cltl.nl/fn_en-1.7-4']},
+    "take someone's life": {'V': ['http://rdf.cltl.nl/fn_en-1.7-5']},
+    'life': {'N': ['http://rdf.cltl.nl/fn_en-1.7-6']},
+}
+
+matcher = MultiwordMatcher(lemma_to_pos_to_lus)
+
+tokens = ['She', 'give', 'up', 'smoking']
+assert matcher.match(tokens) == [(1, 2, 'give'), (1, 3, 'give up'), (2, 3, 'up')]
+
+tokens = ['he', 'take', "someone's", 'life', 'and', 'take', 'after', 'his', 'father']
+assert matcher.match(tokens) == [(1, 4, "take someone's life"), (3, 4, 'life'), (5, 7, 'take after')]
+
+candidates = matcher.get_candidates(['give', 'up'])
+assert candidates[1] == (0, 2, 'give up', {'V': ['http://rdf.cltl.nl/fn_en-1.7-2']})
+
+# the compiled matcher can be reused in other processes
+assert pickle.loads(pickle.dumps(matcher)).match(tokens) == matcher.match(tokens)
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    path = matcher.save(os.path.join(tmp_dir, 'matcher.json'), output_format='gzip')
+    assert MultiwordMatcher.load(path).match(tokens) == matcher.match(tokens)
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.typicality_utils import build_lexical_lookup
+from LexicalDataD2TAnnotationTool.normalized_utils import build_lexicon_table, write_lexicon_table, load_lexicon_table
+from LexicalDataD2TAnnotationTool.normalized_utils import build_normalized_lexical_lookup
+from LexicalDataD2TAnnotationTool.normalized_utils import load_lemma_from_normalized_lookup, normalized_to_lexical_lookup
+
+premon_resource = 'http://premon.fbk.eu/resource/fn17-'
+frame_uri_to_label = {
+    f'{premon_resource}change_of_leadership': 'Change_of_leadership',
+    f'{premon_resource}choosing': 'Choosing',
+    f'{premon_resource}leadership': 'Leadership'
+}
+
+lu_to_info = {
+    'http://rdf.cltl.nl/fn_nl-0.1-1': {'lu_name': 'verkiezing.n',
+                                       'frame_uri': f'{premon_resource}change_of_leadership',
+                                       'frame_label': 'Change_of_leadership',
+                                       'lexicon_uri': 'http://rdf.cltl.nl/fn_nl-lexicon-0.1'},
+    'http://rdf.cltl.nl/fn_nl-0.1-2': {'lu_name': 'verkiezing.n',
+                                       'frame_uri': f'{premon_resource}choosing',
+                                       'frame_label': 'Choosing',
+                                       'lexicon_uri': 'http://rdf.cltl.nl/fn_nl-lexicon-0.1'},
+    'http://rdf.cltl.nl/fn_nl-0.1-3': {'lu_name': 'kiezen.v',
+                                       'frame_uri': f'{premon_resource}choosing',
+                                       'frame_label': 'Choosing',
+                                       'lexicon_uri': 'http://rdf.cltl.nl/fn_nl-lexicon-0.1'}
+}
+
+lemma_to_pos_to_lus = {
+    'verkiezing': {'N': ['http://rdf.cltl.nl/fn_nl-0.1-2', 'http://rdf.cltl.nl/fn_nl-0.1-1']},
+    'kiezen': {'V': ['http://rdf.cltl.nl/fn_nl-0.1-3']}
+}
+
+frame_to_score = {
+    f'{premon_resource}change_of_leadership': 0.8,
+    f'{premon_resource}choosing': 1,
+    f'{premon_resource}leadership': 0
+}
+
+table = build_lexicon_table(frame_uri_to_label, lu_to_info, lemma_to_pos_to_lus)
+normalized_lookup = build_normalized_lexical_lookup(frame_to_score, table)
+assert normalized_lookup['scores'] == [1, 0.8, 0]
+
+the_json = build_lexical_lookup(frame_to_score=frame_to_score,
+                                frame_uri_to_label=frame_uri_to_label,
+                                lu_to_info=lu_to_info,
+                                lemma_to_pos_to_lus=lemma_to_pos_to_lus,
+                                expected_num_frames=None)
+assert normalized_to_lexical_lookup(table, normalized_lookup) == the_json
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    table_path = write_lexicon_table(table, tmp_dir)
+    assert os.path.basename(table_path) == 'lexicon_table.json'
+    loaded_table = load_lexicon_table(tmp_dir)
+    for lemma, pos_to_dropdown in the_json['lexical_lookup'].items():
+        assert load_lemma_from_normalized_lookup(loaded_table, normalized_lookup, lemma) == pos_to_dropdown
+    assert load_lemma_from_normalized_lookup(loaded_table, normalized_lookup, 'stemmen') is None
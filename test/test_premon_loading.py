@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+
+import rdflib
+
+# count the RDF files that are parsed while importing the package
+num_parsed = []
+parse = rdflib.Graph.parse
+def counting_parse(self, *args, **kwargs):
+    num_parsed.append(1)
+    return parse(self, *args, **kwargs)
+rdflib.Graph.parse = counting_parse
+
+sys.path.append('../../')
+import LexicalDataD2TAnnotationTool
+from LexicalDataD2TAnnotationTool import rdf_utils
+from LexicalDataD2TAnnotationTool.rdf_utils import load_premon, get_premon
+
+# importing the package does not load PreMOn
+assert num_parsed == []
+assert rdf_utils._shared_premon is None
+assert rdf_utils._premon_cache == {}
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    nt_path = os.path.join(tmp_dir, 'premon.nt')
+    frame_uri = '<http://premon.fbk.eu/resource/fn17-appointing>'
+    with open(nt_path, 'w') as outfile:
+        outfile.write(f'{frame_uri} <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://premon.fbk.eu/ontology/fn#Frame> .\n')
+        outfile.write(f'{frame_uri} <http://www.w3.org/2000/01/rdf-schema#label> "Appointing" .\n')
+
+    premon = load_premon(path=nt_path)
+
+    # the loaded PreMOn is shared and cached
+    assert get_premon() is premon
+    assert get_premon() is get_premon()
+    assert LexicalDataD2TAnnotationTool.premon is premon
+    assert load_premon(path=nt_path) is premon
+    assert load_premon(path=nt_path, reload=True) is not premon
+    assert premon.get_label('http://premon.fbk.eu/resource/fn17-appointing') == 'Appointing'
+
+rdflib.Graph.parse = parse
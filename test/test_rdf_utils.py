@@ -0,0 +1,149 @@
+import sys
+from rdflib import Graph
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.rdf_utils import PremonIndex, get_premon_index
+from LexicalDataD2TAnnotationTool.rdf_utils import get_rdf_uri, get_rdf_label, get_fe_uris_and_labels
+
+nt = """
+<http://premon.fbk.eu/resource/fn17-appointing> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://premon.fbk.eu/ontology/fn#Frame> .
+<http://premon.fbk.eu/resource/fn17-appointing> <http://www.w3.org/2000/01/rdf-schema#label> "Appointing" .
+<http://premon.fbk.eu/resource/fn17-appointing> <http://premon.fbk.eu/ontology/core#semRole> <http://premon.fbk.eu/resource/fn17-appointing@official> .
+<http://premon.fbk.eu/resource/fn17-appointing> <http://premon.fbk.eu/ontology/core#semRole> <http://premon.fbk.eu/resource/fn17-appointing@selector> .
+<http://premon.fbk.eu/resource/fn17-appointing@official> <http://www.w3.org/2000/01/rdf-schema#label> "Official" .
+<http://premon.fbk.eu/resource/fn17-appointing@selector> <http://www.w3.org/2000/01/rdf-schema#label> "Selector" .
+"""
+
+premon = Graph()
+premon.parse(data=nt, format='nt')
+index = get_premon_index(premon)
+
+assert isinstance(index, PremonIndex)
+assert get_premon_index(index) is index
+assert len(index) == 1
+
+frame_uri = 'http://premon.fbk.eu/resource/fn17-appointing'
+assert get_rdf_uri(index, 'Appointing') == get_rdf_uri(premon, 'Appointing') == frame_uri
+assert get_rdf_label(index, frame_uri) == get_rdf_label(premon, frame_uri) == 'Appointing'
+assert get_fe_uris_and_labels(index, frame_uri) == get_fe_uris_and_labels(premon, frame_uri) == {
+    'Official': 'http://premon.fbk.eu/resource/fn17-appointing@official',
+    'Selector': 'http://premon.fbk.eu/resource/fn17-appointing@selector'
+}
+
+from LexicalDataD2TAnnotationTool.rdf_utils import get_fe_uris_and_labels_of_frames
+
+for premon_format in [premon, index]:
+    frame_uri_to_label_to_fe_uri = get_fe_uris_and_labels_of_frames(premon_format)
+    assert frame_uri_to_label_to_fe_uri == {frame_uri: get_fe_uris_and_labels(premon, frame_uri)}
+    assert get_fe_uris_and_labels_of_frames(premon_format, frame_uris=[]) == {}
+
+import os
+import tempfile
+from LexicalDataD2TAnnotationTool.rdf_utils import compile_premon_snapshot, load_premon_snapshot
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    nt_path = os.path.join(tmp_dir, 'premon.nt')
+    with open(nt_path, 'w') as outfile:
+        outfile.write(nt)
+
+    compiled = compile_premon_snapshot(nt_path)
+    loaded = load_premon_snapshot(nt_path)
+    assert loaded.to_dict() == compiled.to_dict() == dict(index.to_dict(), source_hash=compiled.source_hash)
+
+    # a changed N-Triples file makes the snapshot stale
+    with open(nt_path, 'a') as outfile:
+        outfile.write('<http://premon.fbk.eu/resource/fn17-abandonment> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://premon.fbk.eu/ontology/fn#Frame> .\n')
+        outfile.write('<http://premon.fbk.eu/resource/fn17-abandonment> <http://www.w3.org/2000/01/rdf-schema#label> "Abandonment" .\n')
+    reloaded = load_premon_snapshot(nt_path)
+    assert reloaded.source_hash != compiled.source_hash
+    assert get_rdf_uri(reloaded, 'Abandonment') == 'http://premon.fbk.eu/resource/fn17-abandonment'
+
+import gzip
+from rdflib import Graph
+from LexicalDataD2TAnnotationTool.rdf_utils import convert_nquads_to_nt_streaming, load_nquads_file, PREMON_PREDICATES
+
+nquads = """<http://premon.fbk.eu/resource/fn17-appointing> <http://www.w3.org/2000/01/rdf-schema#label> "Appointing" <http://premon.fbk.eu/resource/fn17> .
+<http://premon.fbk.eu/resource/fn17-appointing> <http://www.w3.org/2000/01/rdf-schema#comment> "A \\"quoted\\" <comment> ." <http://premon.fbk.eu/resource/fn17> .
+_:b0 <http://www.w3.org/2000/01/rdf-schema#label> "label"@en .
+"""
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    nquads_path = os.path.join(tmp_dir, 'premon.tql')
+    with open(nquads_path, 'w') as outfile:
+        outfile.write(nquads)
+    nquads_gz_path = nquads_path + '.gz'
+    with gzip.open(nquads_gz_path, 'wt') as outfile:
+        outfile.write(nquads)
+
+    nt_path = os.path.join(tmp_dir, 'premon.nt')
+    expected = Graph()
+    for triple in load_nquads_file(nquads_path).triples((None, None, None)):
+        expected.add(triple)
+
+    for path in [nquads_path, nquads_gz_path]:
+        assert convert_nquads_to_nt_streaming(path, nt_path) == 3
+        g = Graph()
+        g.parse(nt_path, format='nt')
+        assert len(g) == len(expected) == 3
+        assert set(g.predicate_objects()) == set(expected.predicate_objects())
+
+    assert convert_nquads_to_nt_streaming(nquads_path, nt_path, predicates=PREMON_PREDICATES) == 2
+
+from LexicalDataD2TAnnotationTool.rdf_utils import load_nt_graph, enable_sparql_cache, get_sparql_cache
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    nt_path = os.path.join(tmp_dir, 'premon.nt')
+    with open(nt_path, 'w') as outfile:
+        outfile.write(nt)
+
+    # the second graph only gets its results from the on-disk tier
+    for expected_disk_hits in [0, 3]:
+        graph = load_nt_graph(nt_path)
+        sparql_cache = enable_sparql_cache(graph, nt_path)
+        assert get_sparql_cache(graph) is sparql_cache
+        assert get_rdf_uri(graph, 'Appointing') == frame_uri
+        assert get_rdf_label(graph, frame_uri) == 'Appointing'
+        assert get_fe_uris_and_labels(graph, frame_uri) == get_fe_uris_and_labels(index, frame_uri)
+        assert get_rdf_uri(graph, 'Appointing') == frame_uri
+        assert sparql_cache.info()['disk_hits'] == expected_disk_hits
+        assert sparql_cache.info()['memory_hits'] == 1
+        sparql_cache.close()
+
+    # a changed N-Triples file is not answered from the cache
+    with open(nt_path, 'a') as outfile:
+        outfile.write('<http://premon.fbk.eu/resource/fn17-appointing> <http://www.w3.org/2000/01/rdf-schema#label> "Appointing2" .\n')
+    graph = load_nt_graph(nt_path)
+    sparql_cache = enable_sparql_cache(graph, nt_path)
+    assert get_rdf_uri(graph, 'Appointing2') == frame_uri
+    assert sparql_cache.info()['misses'] == 1
+    sparql_cache.close()
+
+from rdflib.compare import isomorphic
+from LexicalDataD2TAnnotationTool.rdf_utils import load_nt_parallel, get_line_aligned_ranges
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    nt_path = os.path.join(tmp_dir, 'premon.nt')
+    with open(nt_path, 'w') as outfile:
+        outfile.write(nt)
+        outfile.write('_:b0 <http://www.w3.org/2000/01/rdf-schema#comment> "A \\"quoted\\" comment" .\n')
+        outfile.write('<http://premon.fbk.eu/resource/fn17> <http://www.w3.org/2000/01/rdf-schema#seeAlso> _:b0 .\n')
+        outfile.write('_:b0 <http://www.w3.org/2004/02/skos/core#prefLabel> "caf\\u00E9"@fr .\n')
+        outfile.write('_:b0 <http://purl.org/dc/terms/issued> "2018"^^<http://www.w3.org/2001/XMLSchema#gYear> .\n')
+
+    with open(nt_path, 'rb') as infile:
+        content = infile.read()
+    for num_ranges in [1, 3, 100]:
+        ranges = get_line_aligned_ranges(nt_path, num_ranges)
+        assert b''.join(content[start:end] for start, end in ranges) == content
+        assert all(content[end - 1:end] == b'\n' for _, end in ranges)
+
+    expected = load_nt_graph(nt_path)
+    for workers in [1, 2]:
+        assert isomorphic(load_nt_parallel(nt_path, workers=workers, store='graph'), expected)
+        assert len(load_nt_parallel(nt_path, workers=workers, predicates=PREMON_PREDICATES)) == 6
+
+        store = load_nt_parallel(nt_path, workers=workers, store='compact')
+        assert len(store) == len(expected)
+        assert len(store.terms) == len(set(store.terms))
+        assert sorted(store.triples()) == sorted(load_nt_parallel(nt_path, workers=1, store='compact').triples())
+        assert get_premon_index(store).to_dict() == index.to_dict()
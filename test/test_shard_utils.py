@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.shard_utils import get_shard_key
+from LexicalDataD2TAnnotationTool.shard_utils import write_sharded_lexical_lookup, load_lemma_from_sharded_lookup
+
+assert get_shard_key('Verkiezing') == 'v'
+assert get_shard_key("'s avonds") == '_'
+assert get_shard_key('verkiezing', shard_by='hash', num_shards=16) in {str(i) for i in range(16)}
+
+the_json = {
+    'ordered_frames': [[0.8, 'Change_of_leadership (0.8)', 'http://premon.fbk.eu/resource/fn17-change_of_leadership']],
+    'lexical_lookup': {
+        'verkiezing': {
+            'N': [[0.8,
+                   'Change_of_leadership (verkiezing.n) (0.8)',
+                   'http://premon.fbk.eu/resource/fn17-change_of_leadership',
+                   'http://rdf.cltl.nl/fn_nl-0.1-1',
+                   'verkiezing.n',
+                   'http://rdf.cltl.nl/fn_nl-lexicon-0.1']],
+            'all_frames': ['http://premon.fbk.eu/resource/fn17-change_of_leadership']
+        },
+        'kiezen': {
+            'all_frames': []
+        }
+    }
+}
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    lexical_lookup_path = os.path.join(tmp_dir, 'Q40231.json')
+    for shard_by in ['first_char', 'hash']:
+        write_sharded_lexical_lookup(the_json, lexical_lookup_path, shard_by=shard_by, num_shards=4)
+        for lemma, pos_to_dropdown in the_json['lexical_lookup'].items():
+            assert load_lemma_from_sharded_lookup(lexical_lookup_path, lemma) == pos_to_dropdown
+        assert load_lemma_from_sharded_lookup(lexical_lookup_path, 'stemmen') is None
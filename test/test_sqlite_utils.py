@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.io_utils import dump_data
+from LexicalDataD2TAnnotationTool.typicality_utils import build_lexical_lookup
+from LexicalDataD2TAnnotationTool.sqlite_utils import export_to_sqlite
+from LexicalDataD2TAnnotationTool.sqlite_query import open_database, get_ranked_frames, get_lemma_lookup
+
+premon_resource = 'http://premon.fbk.eu/resource/fn17-'
+lexicon_uri = 'http://rdf.cltl.nl/fn_nl-lexicon-0.1'
+frame_uri_to_label = {
+    f'{premon_resource}change_of_leadership': 'Change_of_leadership',
+    f'{premon_resource}choosing': 'Choosing',
+    f'{premon_resource}leadership': 'Leadership'
+}
+
+
+def get_lu_info(lu_id, lu_name, frame_label):
+    return {'lu_id': lu_id,
+            'lu_name': lu_name,
+            'lu_definition': None,
+            'frame_uri': f'{premon_resource}{frame_label.lower()}',
+            'frame_label': frame_label,
+            'lexicon_uri': lexicon_uri}
+
+
+lu_to_info = {
+    'http://rdf.cltl.nl/fn_nl-0.1-1': get_lu_info(1, 'verkiezing.n', 'Change_of_leadership'),
+    'http://rdf.cltl.nl/fn_nl-0.1-2': get_lu_info(2, 'verkiezing.n', 'Choosing'),
+    'http://rdf.cltl.nl/fn_nl-0.1-3': get_lu_info(3, 'kiezen.v', 'Choosing'),
+    'http://rdf.cltl.nl/fn_nl-0.1-4': get_lu_info(4, 'leider.n', 'Leadership'),
+    'http://rdf.cltl.nl/fn_nl-0.1-5': get_lu_info(5, 'verkiezing.v', 'Choosing')
+}
+
+lemma_to_pos_to_lus = {
+    'verkiezing': {'N': ['http://rdf.cltl.nl/fn_nl-0.1-2', 'http://rdf.cltl.nl/fn_nl-0.1-1'],
+                   'V': ['http://rdf.cltl.nl/fn_nl-0.1-5']},
+    'kiezen': {'V': ['http://rdf.cltl.nl/fn_nl-0.1-3']},
+    'leider': {'N': ['http://rdf.cltl.nl/fn_nl-0.1-4']}
+}
+
+event_type_to_frame_to_score = {
+    'Q40231': {f'{premon_resource}change_of_leadership': 0.8,
+               f'{premon_resource}choosing': 1.0,
+               f'{premon_resource}leadership': 0},
+    # no score for leadership
+    'Q1079023': {f'{premon_resource}change_of_leadership': 0.5,
+                 f'{premon_resource}choosing': 0.25}
+}
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    os.makedirs(os.path.join(tmp_dir, 'lexicons', 'nl'))
+    os.makedirs(os.path.join(tmp_dir, 'typicality', 'typicality_scores'))
+    dump_data(lu_to_info, os.path.join(tmp_dir, 'lexicons', 'nl', 'lu_to_info.json'))
+    dump_data(lemma_to_pos_to_lus, os.path.join(tmp_dir, 'lexicons', 'nl', 'lemma_to_pos_to_lus.json'))
+    for event_type, frame_to_score in event_type_to_frame_to_score.items():
+        dump_data(frame_to_score, os.path.join(tmp_dir, 'typicality', 'typicality_scores', f'{event_type}.json'))
+
+    db_path = os.path.join(tmp_dir, 'lexical_data.db')
+    export_to_sqlite(tmp_dir, db_path)
+    connection = open_database(db_path)
+
+    # the same entries as the lexical lookup
+    the_json = build_lexical_lookup(frame_to_score=event_type_to_frame_to_score['Q40231'],
+                                    frame_uri_to_label=frame_uri_to_label,
+                                    lu_to_info=lu_to_info,
+                                    lemma_to_pos_to_lus=lemma_to_pos_to_lus,
+                                    expected_num_frames=None)
+    for lemma, pos_to_dropdown in the_json['lexical_lookup'].items():
+        assert get_lemma_lookup(connection, 'nl', lemma, 'Q40231') == pos_to_dropdown
+        for pos in lemma_to_pos_to_lus[lemma]:
+            assert get_ranked_frames(connection, 'nl', lemma, pos, 'Q40231') == pos_to_dropdown[pos]
+    assert get_lemma_lookup(connection, 'nl', 'stemmen', 'Q40231') == {}
+
+    # frames without a score get the score 0, as in initialize_typical_frames
+    frame_to_score = dict(event_type_to_frame_to_score['Q1079023'])
+    frame_to_score[f'{premon_resource}leadership'] = 0
+    the_json = build_lexical_lookup(frame_to_score=frame_to_score,
+                                    frame_uri_to_label=frame_uri_to_label,
+                                    lu_to_info=lu_to_info,
+                                    lemma_to_pos_to_lus=lemma_to_pos_to_lus,
+                                    expected_num_frames=None)
+    for lemma, pos_to_dropdown in the_json['lexical_lookup'].items():
+        assert get_lemma_lookup(connection, 'nl', lemma, 'Q1079023') == pos_to_dropdown
+
+    # unknown event type, as for the lexical lookups
+    for get_entries, args in [(get_ranked_frames, ('nl', 'kiezen', 'V', 'Q5')),
+                              (get_lemma_lookup, ('nl', 'kiezen', 'Q5'))]:
+        try:
+            get_entries(connection, *args)
+        except AssertionError:
+            pass
+        else:
+            raise AssertionError(f'{get_entries.__name__} accepted an unknown event type')
+    connection.close()
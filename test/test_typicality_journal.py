@@ -0,0 +1,107 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.io_utils import dump_data, load_data
+from LexicalDataD2TAnnotationTool.typicality_utils import update_typical_frames_bulk, compact_typicality_journal
+from LexicalDataD2TAnnotationTool.typicality_utils import load_typicality_scores, read_typicality_journal
+from LexicalDataD2TAnnotationTool.typicality_utils import append_to_typicality_journal, get_typicality_journal_path
+from LexicalDataD2TAnnotationTool.typicality_utils import get_compacting_journal_path
+from LexicalDataD2TAnnotationTool import typicality_utils
+
+change_of_leadership = 'http://premon.fbk.eu/resource/fn17-change_of_leadership'
+appointing = 'http://premon.fbk.eu/resource/fn17-appointing'
+killing = 'http://premon.fbk.eu/resource/fn17-killing'
+
+initial_scores = {change_of_leadership: 0, appointing: 0, killing: 0}
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    scores_folder = os.path.join(tmp_dir, 'typicality', 'typicality_scores')
+    os.makedirs(scores_folder)
+    for event_type in ['Q40231', 'Q1079023']:
+        dump_data(initial_scores, os.path.join(scores_folder, f'{event_type}.json'))
+    scores_path = os.path.join(scores_folder, 'Q40231.json')
+
+    # append -> load
+    rows = [('Q40231', change_of_leadership, 0.8),
+            ('Q40231', appointing, 0.4),
+            ('Q1079023', killing, 0.1),
+            ('Q2', killing, 0.5)]
+    updated = update_typical_frames_bulk(tmp_dir,
+                                         premon=None,
+                                         rows=rows,
+                                         frame_format='premon_frame_uri',
+                                         journal=True,
+                                         compact_threshold=None)
+    assert updated == ['Q1079023', 'Q40231']
+    assert load_data(scores_path) == initial_scores
+    assert read_typicality_journal(tmp_dir, 'Q40231') == {change_of_leadership: 0.8, appointing: 0.4}
+
+    # later updates of a frame replace earlier ones
+    update_typical_frames_bulk(tmp_dir,
+                               premon=None,
+                               rows=[('Q40231', appointing, 0.6)],
+                               frame_format='premon_frame_uri',
+                               journal=True,
+                               compact_threshold=None)
+    expected = {change_of_leadership: 0.8, appointing: 0.6, killing: 0}
+    assert load_typicality_scores(tmp_dir, 'Q40231') == expected
+
+    # compact -> load
+    assert compact_typicality_journal(tmp_dir) == ['Q1079023', 'Q40231']
+    assert not os.path.exists(get_typicality_journal_path(tmp_dir, 'Q40231'))
+    assert load_data(scores_path) == expected
+    assert load_typicality_scores(tmp_dir, 'Q40231') == expected
+    assert load_typicality_scores(tmp_dir, 'Q1079023') == {change_of_leadership: 0, appointing: 0, killing: 0.1}
+
+    # the number of updates is counted, also if another process appended to the journal
+    assert append_to_typicality_journal(tmp_dir, 'Q40231', {killing: 0.2}) == 1
+    with open(get_typicality_journal_path(tmp_dir, 'Q40231'), 'a') as outfile:
+        outfile.write(f'["{killing}", 0.3]\n')
+    assert append_to_typicality_journal(tmp_dir, 'Q40231', {appointing: 0.7}) == 3
+    compact_typicality_journal(tmp_dir, event_types=['Q40231'])
+
+    # the journal was compacted or removed since the last append, e.g., by another process
+    assert append_to_typicality_journal(tmp_dir, 'Q40231', {killing: 0.2}) == 1
+    os.remove(get_typicality_journal_path(tmp_dir, 'Q40231'))
+    assert append_to_typicality_journal(tmp_dir, 'Q40231', {killing: 0.2}) == 1
+    assert append_to_typicality_journal(tmp_dir, 'Q40231', {appointing: 0.7}) == 2
+    compact_typicality_journal(tmp_dir, event_types=['Q40231'])
+
+    # the journal is compacted once it contains compact_threshold updates
+    for index, score in enumerate([0.1, 0.2, 0.3]):
+        update_typical_frames_bulk(tmp_dir,
+                                   premon=None,
+                                   rows=[('Q40231', killing, score)],
+                                   frame_format='premon_frame_uri',
+                                   journal=True,
+                                   compact_threshold=3)
+        assert os.path.exists(get_typicality_journal_path(tmp_dir, 'Q40231')) == (index < 2)
+    assert load_data(scores_path) == {change_of_leadership: 0.8, appointing: 0.7, killing: 0.3}
+
+    # updates appended by another process during a compaction remain pending
+    append_to_typicality_journal(tmp_dir, 'Q40231', {killing: 0.4})
+    original_dump_data = typicality_utils.dump_data
+
+    def dump_data_while_appending(*args, **kwargs):
+        append_to_typicality_journal(tmp_dir, 'Q40231', {appointing: 0.9})
+        return original_dump_data(*args, **kwargs)
+
+    typicality_utils.dump_data = dump_data_while_appending
+    try:
+        compact_typicality_journal(tmp_dir, event_types=['Q40231'])
+    finally:
+        typicality_utils.dump_data = original_dump_data
+    assert load_data(scores_path) == {change_of_leadership: 0.8, appointing: 0.7, killing: 0.4}
+    assert read_typicality_journal(tmp_dir, 'Q40231') == {appointing: 0.9}
+
+    # the journal of an interrupted compaction is used until it is merged
+    journal_path = get_typicality_journal_path(tmp_dir, 'Q40231')
+    os.replace(journal_path, get_compacting_journal_path(journal_path))
+    append_to_typicality_journal(tmp_dir, 'Q40231', {killing: 0.5})
+    expected = {change_of_leadership: 0.8, appointing: 0.9, killing: 0.5}
+    assert load_typicality_scores(tmp_dir, 'Q40231') == expected
+    assert compact_typicality_journal(tmp_dir) == ['Q40231']
+    assert os.listdir(os.path.dirname(journal_path)) == []
+    assert load_data(scores_path) == expected
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+
+sys.path.append('../../')
+from LexicalDataD2TAnnotationTool.io_utils import dump_data, load_data
+from LexicalDataD2TAnnotationTool.typicality_matrix import TypicalityMatrix
+
+change_of_leadership = 'http://premon.fbk.eu/resource/fn17-change_of_leadership'
+appointing = 'http://premon.fbk.eu/resource/fn17-appointing'
+killing = 'http://premon.fbk.eu/resource/fn17-killing'
+
+event_type_to_frame_to_score = {
+    'Q40231': {change_of_leadership: 0.8, appointing: 0.4, killing: 0},
+    'Q1079023': {change_of_leadership: 0.2, appointing: 0, killing: 0},
+}
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    scores_folder = os.path.join(tmp_dir, 'typicality', 'typicality_scores')
+    os.makedirs(scores_folder)
+    for event_type, frame_to_score in event_type_to_frame_to_score.items():
+        dump_data(frame_to_score, os.path.join(scores_folder, f'{event_type}.json'))
+
+    matrix = TypicalityMatrix.from_folder(tmp_dir)
+    assert matrix.shape == (2, 3)
+
+    # export results in the same typicality scores
+    matrix.to_folder(tmp_dir)
+    for event_type, frame_to_score in event_type_to_frame_to_score.items():
+        assert load_data(os.path.join(scores_folder, f'{event_type}.json')) == frame_to_score
+
+assert matrix.top_k(2) == {'Q1079023': [(change_of_leadership, 0.2), (appointing, 0)],
+                           'Q40231': [(change_of_leadership, 0.8), (appointing, 0.4)]}
+assert matrix.get_frame_ranks(appointing) == {'Q1079023': 2, 'Q40231': 2}
+assert matrix.top_event_types(change_of_leadership, k=1) == [('Q40231', 1, 0.8)]
+
+matrix.update([('Q40231', killing, 1.0), ('Q2', killing, 0.5)])
+assert matrix.shape == (3, 3)
+assert matrix.get_scores('Q2') == {killing: 0.5}
+assert matrix.top_k(1, event_types=['Q40231']) == {'Q40231': [(killing, 1)]}
+
+# only the k highest scores are selected, ties at the k-th score are taken in the order of the frame URIs
+frame_uris = [f'http://premon.fbk.eu/resource/fn17-frame_{index:02d}' for index in range(20)]
+tied_matrix = TypicalityMatrix(['Q1'], frame_uris)
+tied_matrix.update([('Q1', frame_uri, 0.5) for frame_uri in frame_uris[::-1]] +
+                   [('Q1', frame_uris[15], 1), ('Q1', frame_uris[3], 0)])
+assert tied_matrix.top_k(3) == {'Q1': [(frame_uris[15], 1), (frame_uris[0], 0.5), (frame_uris[1], 0.5)]}
+assert tied_matrix.top_k(19)['Q1'][-1] == (frame_uris[19], 0.5)
+assert tied_matrix.top_k(25)['Q1'][-1] == (frame_uris[3], 0)
+
+# scores that are not representable as float32 and 1.0 instead of 1 are exported unchanged
+exact_frame_to_score = {change_of_leadership: 0.123456789, appointing: 1 / 3, killing: 1.0}
+with tempfile.TemporaryDirectory() as tmp_dir:
+    scores_folder = os.path.join(tmp_dir, 'typicality', 'typicality_scores')
+    os.makedirs(scores_folder)
+    exact_path = dump_data(exact_frame_to_score, os.path.join(scores_folder, 'Q40231.json'))
+    with open(exact_path) as infile:
+        exact_content = infile.read()
+
+    exact_matrix = TypicalityMatrix.from_folder(tmp_dir)
+    assert exact_matrix.get_scores('Q40231') == exact_frame_to_score
+    assert isinstance(exact_matrix.get_scores('Q40231')[killing], float)
+
+    exact_matrix.save(os.path.join(tmp_dir, 'matrix.npz'))
+    TypicalityMatrix.load(os.path.join(tmp_dir, 'matrix.npz')).to_folder(tmp_dir)
+    with open(exact_path) as infile:
+        assert infile.read() == exact_content
+
+normalized = matrix.normalize('sum')
+assert normalized.get_scores('Q1079023') == {change_of_leadership: 1, appointing: 0, killing: 0}
+assert normalized.get_scores('Q2') == {killing: 1}
@@ -63,3 +63,16 @@ create_lexical_lookup_per_eventtype(event_type='Q40231',
                                     output_folder=out_dir,
                                     overwrite=True,
                                     verbose=2)
+
+
+# the in-memory lookup gives the same entries as the lexical lookup on disk
+import json
+from LexicalDataD2TAnnotationTool import LexicalLookup
+
+lookup = LexicalLookup(output_folder=out_dir, language='en')
+with open(f'{out_dir}/typicality/lexical_lookup/en/Q40231.json') as infile:
+    lemma_to_pos_to_dropdown = json.load(infile)['lexical_lookup']
+
+for lemma in ['leadership', 'appoint']:
+    assert lemma in lemma_to_pos_to_dropdown, f'{lemma} is not in the lexical lookup'
+    assert lookup.get_lemma(lemma, 'Q40231') == lemma_to_pos_to_dropdown[lemma]
@@ -0,0 +1,349 @@
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .io_utils import dump_data, find_data_path, detect_output_format
+from .typicality_utils import load_typicality_scores, get_event_types, remove_typicality_journal
+
+NORMALIZATIONS = {'max', 'sum', 'minmax'}
+
+
+def _is_integer_score(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def _to_json_score(value, is_integer=False):
+    """
+    convert a score of the matrix to the number written to the typicality scores,
+    i.e., an int for scores that were imported as an int (e.g., 0 in initialize_typical_frames), a float otherwise
+    """
+    if is_integer:
+        return int(value)
+    return float(value)
+
+
+class TypicalityMatrix:
+    """
+    the typicality scores of many event types as a dense float64 array (event types x frames).
+
+    Frames without a score for an event type are NaN.
+    Which scores were imported as an int is kept in integer_scores,
+    so that exporting the matrix results in the same typicality scores as were imported, e.g., 0 stays 0 and 1.0 stays 1.0.
+
+    Requires numpy: pip install numpy
+
+    :param list event_types: the event types, i.e., the rows
+    :param list frame_uris: the PreMOn frame URIs, i.e., the columns
+    :param scores: array of shape (len(event_types), len(frame_uris)), if None, all scores are NaN
+    :param integer_scores: boolean array of the same shape, True for scores that are exported as an int,
+    if None, all scores are exported as a float
+    """
+    def __init__(self, event_types, frame_uris, scores=None, integer_scores=None):
+        assert np is not None, 'TypicalityMatrix requires numpy: pip install numpy'
+
+        self.event_types = list(event_types)
+        self.frame_uris = list(frame_uris)
+        self.event_type_to_id = {event_type: index for index, event_type in enumerate(self.event_types)}
+        self.frame_uri_to_id = {frame_uri: index for index, frame_uri in enumerate(self.frame_uris)}
+        assert len(self.event_type_to_id) == len(self.event_types), 'the event types should be unique'
+        assert len(self.frame_uri_to_id) == len(self.frame_uris), 'the frame URIs should be unique'
+
+        shape = (len(self.event_types), len(self.frame_uris))
+        if scores is None:
+            scores = np.full(shape, np.nan, dtype=np.float64)
+        self.scores = np.array(scores, dtype=np.float64)
+        assert self.scores.shape == shape, f'expected scores of shape {shape}, got {self.scores.shape}'
+
+        if integer_scores is None:
+            integer_scores = np.zeros(shape, dtype=bool)
+        self.integer_scores = np.array(integer_scores, dtype=bool)
+        assert self.integer_scores.shape == shape, f'expected integer_scores of shape {shape}, got {self.integer_scores.shape}'
+
+    def __repr__(self):
+        return f'TypicalityMatrix({len(self.event_types)} event types x {len(self.frame_uris)} frames)'
+
+    @property
+    def shape(self):
+        return self.scores.shape
+
+    @classmethod
+    def from_folder(cls, output_folder, event_types=None):
+        """
+        import the typicality scores of an output folder (typicality/typicality_scores),
+        including pending updates in the journals
+
+        :param str output_folder: the main folder for the lexical data
+        :param event_types: iterable of event types, if None, all event types with typicality scores are used
+
+        :rtype: TypicalityMatrix
+        """
+        if event_types is None:
+            event_types = get_event_types(output_folder)
+        event_types = list(event_types)
+
+        event_type_to_frame_to_score = {event_type: load_typicality_scores(output_folder, event_type)
+                                        for event_type in event_types}
+
+        frame_uris = sorted({frame_uri
+                             for frame_to_score in event_type_to_frame_to_score.values()
+                             for frame_uri in frame_to_score})
+
+        matrix = cls(event_types, frame_uris)
+        for row, event_type in enumerate(event_types):
+            frame_to_score = event_type_to_frame_to_score[event_type]
+            columns = [matrix.frame_uri_to_id[frame_uri] for frame_uri in frame_to_score]
+            matrix.scores[row, columns] = list(frame_to_score.values())
+            matrix.integer_scores[row, columns] = [_is_integer_score(score) for score in frame_to_score.values()]
+
+        return matrix
+
+    def to_folder(self, output_folder, event_types=None, output_format=None, verbose=0):
+        """
+        export the scores to the typicality scores of an output folder (typicality/typicality_scores/EVENT_TYPE.json),
+        existing typicality scores and journals of the event types are replaced
+
+        :param event_types: iterable of event types, if None, all event types of the matrix are exported
+        :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data.
+        If None, the output format of an existing file is kept, pretty otherwise.
+
+        :rtype: list
+        :return: the paths of the written files
+        """
+        if event_types is None:
+            event_types = self.event_types
+
+        scores_folder = os.path.join(output_folder, 'typicality', 'typicality_scores')
+        os.makedirs(scores_folder, exist_ok=True)
+
+        paths = []
+        for event_type in event_types:
+            event_type_path = os.path.join(scores_folder, f'{event_type}.json')
+
+            the_output_format = output_format
+            if the_output_format is None:
+                existing_path = find_data_path(event_type_path)
+                the_output_format = 'pretty' if existing_path is None else detect_output_format(existing_path)
+
+            paths.append(dump_data(self.get_scores(event_type),
+                                   event_type_path,
+                                   output_format=the_output_format))
+            remove_typicality_journal(output_folder, event_type)
+
+        if verbose:
+            print(f'exported the typicality scores of {len(paths)} event types to {scores_folder}')
+
+        return paths
+
+    def save(self, path):
+        """
+        save the matrix to a numpy .npz file
+        """
+        np.savez_compressed(path,
+                            event_types=np.array(self.event_types, dtype=str),
+                            frame_uris=np.array(self.frame_uris, dtype=str),
+                            scores=self.scores,
+                            integer_scores=self.integer_scores)
+
+    @classmethod
+    def load(cls, path):
+        """
+        load a matrix saved with TypicalityMatrix.save
+
+        :rtype: TypicalityMatrix
+        """
+        with np.load(path) as data:
+            return cls(data['event_types'].tolist(),
+                       data['frame_uris'].tolist(),
+                       data['scores'],
+                       data['integer_scores'] if 'integer_scores' in data else None)
+
+    def get_scores(self, event_type):
+        """
+        :rtype: dict
+        :return: PreMOn frame URI -> typicality score of the frames with a score for the event type
+        """
+        row_id = self.event_type_to_id[event_type]
+        row = self.scores[row_id]
+        integer_row = self.integer_scores[row_id]
+        return {self.frame_uris[column]: _to_json_score(row[column], integer_row[column])
+                for column in np.flatnonzero(~np.isnan(row))}
+
+    def get_score(self, event_type, frame_uri):
+        """
+        :rtype: float
+        :return: the typicality score, NaN if the frame has no score for the event type
+        """
+        return float(self.scores[self.event_type_to_id[event_type], self.frame_uri_to_id[frame_uri]])
+
+    def add_event_types(self, event_types):
+        """
+        add rows for event types that are not in the matrix yet, their scores are NaN
+        """
+        new_event_types = [event_type
+                           for event_type in dict.fromkeys(event_types)
+                           if event_type not in self.event_type_to_id]
+        if not new_event_types:
+            return
+
+        for event_type in new_event_types:
+            self.event_type_to_id[event_type] = len(self.event_types)
+            self.event_types.append(event_type)
+
+        new_shape = (len(new_event_types), len(self.frame_uris))
+        self.scores = np.vstack([self.scores, np.full(new_shape, np.nan, dtype=np.float64)])
+        self.integer_scores = np.vstack([self.integer_scores, np.zeros(new_shape, dtype=bool)])
+
+    def update(self, rows):
+        """
+        update many scores at once, unknown event types are added
+
+        :param rows: iterable of (event_type, PreMOn frame URI, score),
+        see typicality_utils.get_typicality_frame_uri to get the frame URI of a frame label
+        """
+        rows = list(rows)
+        if not rows:
+            return
+
+        event_types, frame_uris, values = zip(*rows)
+
+        unknown_frame_uris = set(frame_uris) - set(self.frame_uri_to_id)
+        assert not unknown_frame_uris, f'unknown frame URIs: {sorted(unknown_frame_uris)}'
+
+        self.add_event_types(event_types)
+
+        row_ids = np.fromiter((self.event_type_to_id[event_type] for event_type in event_types),
+                              dtype=np.intp, count=len(rows))
+        column_ids = np.fromiter((self.frame_uri_to_id[frame_uri] for frame_uri in frame_uris),
+                                 dtype=np.intp, count=len(rows))
+
+        # with duplicate (event type, frame) pairs, the last score is used
+        self.scores[row_ids, column_ids] = np.asarray(values, dtype=np.float64)
+        self.integer_scores[row_ids, column_ids] = [_is_integer_score(value) for value in values]
+
+    def normalize(self, method='sum'):
+        """
+        normalize the scores of each event type, frames without a score are ignored
+
+        :param str method: sum (scores sum to 1) | max (highest score is 1) | minmax (scores between 0 and 1).
+        Event types of which all scores are equal to 0 (or to each other for minmax) are left unchanged.
+
+        :rtype: TypicalityMatrix
+        :return: a new matrix with the normalized scores
+        """
+        assert method in NORMALIZATIONS, f'{method} is not supported: {" | ".join(sorted(NORMALIZATIONS))}'
+
+        scores = self.scores.copy()
+        has_score = ~np.isnan(scores).all(axis=1)
+
+        if method == 'minmax':
+            offset = np.zeros(len(scores), dtype=np.float64)
+            offset[has_score] = np.nanmin(scores[has_score], axis=1)
+            scores -= offset[:, None]
+
+        if method == 'sum':
+            denominator = np.nansum(scores, axis=1)
+        else:
+            denominator = np.zeros(len(scores), dtype=np.float64)
+            denominator[has_score] = np.nanmax(scores[has_score], axis=1)
+
+        if method == 'minmax':
+            # event types with only one distinct score
+            scores[denominator == 0] = self.scores[denominator == 0]
+
+        denominator[denominator == 0] = 1
+        scores /= denominator[:, None]
+
+        # scores that are left unchanged keep their type
+        integer_scores = self.integer_scores & (scores == self.scores)
+
+        return TypicalityMatrix(self.event_types, self.frame_uris, scores, integer_scores)
+
+    def _get_rows(self, event_types):
+        if event_types is None:
+            return list(self.event_types), self.scores, self.integer_scores
+        event_types = list(event_types)
+        row_ids = [self.event_type_to_id[event_type] for event_type in event_types]
+        return event_types, self.scores[row_ids], self.integer_scores[row_ids]
+
+    def top_k(self, k=10, event_types=None):
+        """
+        get the k frames with the highest score for each event type.
+        Frames with the same score are ordered by frame URI.
+
+        :param int k: number of frames per event type
+        :param event_types: iterable of event types, if None, all event types are used
+
+        :rtype: dict
+        :return: event type -> list of (PreMOn frame URI, score)
+        """
+        event_types, scores, integer_scores = self._get_rows(event_types)
+        k = min(k, len(self.frame_uris))
+
+        negated = np.where(np.isnan(scores), np.inf, -scores)
+        if 0 < k < len(self.frame_uris):
+            # only select the k highest scores of each event type, without sorting all frames
+            columns = np.argpartition(negated, k - 1, axis=1)[:, :k]
+            top_negated = np.take_along_axis(negated, columns, axis=1)
+
+            # argpartition picks any of the frames with the same score as the k-th frame,
+            # those event types are sorted fully, so that ties are selected in the order of the frame URIs
+            kth = top_negated.max(axis=1, keepdims=True)
+            ambiguous = ((negated == kth).sum(axis=1) != (top_negated == kth).sum(axis=1)) & np.isfinite(kth[:, 0])
+            for row_id in np.flatnonzero(ambiguous):
+                columns[row_id] = np.argsort(negated[row_id], kind='stable')[:k]
+                top_negated[row_id] = negated[row_id, columns[row_id]]
+        else:
+            columns = np.tile(np.arange(k), (len(event_types), 1))
+            top_negated = negated[:, :k]
+
+        # sort the k frames by score, and frames with the same score by (sorted) frame URI
+        order = np.lexsort((columns, top_negated), axis=1)
+        columns = np.take_along_axis(columns, order, axis=1)
+        top_scores = np.take_along_axis(scores, columns, axis=1)
+        top_integer_scores = np.take_along_axis(integer_scores, columns, axis=1)
+
+        event_type_to_top_k = {}
+        for event_type, row_columns, row_scores, row_integer_scores in zip(event_types, columns, top_scores, top_integer_scores):
+            event_type_to_top_k[event_type] = [(self.frame_uris[column], _to_json_score(score, is_integer))
+                                               for column, score, is_integer in zip(row_columns, row_scores, row_integer_scores)
+                                               if not np.isnan(score)]
+        return event_type_to_top_k
+
+    def get_frame_ranks(self, frame_uri, event_types=None):
+        """
+        get the rank of a frame for each event type,
+        i.e., 1 + the number of frames with a higher score
+
+        :rtype: dict
+        :return: event type -> rank, event types without a score for the frame are left out
+        """
+        event_types, scores, _ = self._get_rows(event_types)
+        frame_scores = scores[:, self.frame_uri_to_id[frame_uri]]
+
+        # NaN compares as False, so frames without a score are never counted as higher
+        ranks = (scores > frame_scores[:, None]).sum(axis=1) + 1
+
+        return {event_type: int(rank)
+                for event_type, rank, score in zip(event_types, ranks, frame_scores)
+                if not np.isnan(score)}
+
+    def top_event_types(self, frame_uri, k=10):
+        """
+        get the event types that rank a frame highest
+
+        :rtype: list
+        :return: list of (event type, rank, score), sorted by rank and then by score
+        """
+        frame_scores = self.scores[:, self.frame_uri_to_id[frame_uri]]
+        frame_integer_scores = self.integer_scores[:, self.frame_uri_to_id[frame_uri]]
+        event_type_to_rank = self.get_frame_ranks(frame_uri)
+
+        ranked = sorted(event_type_to_rank.items(),
+                        key=lambda item: (item[1], -frame_scores[self.event_type_to_id[item[0]]]))
+
+        return [(event_type, rank, _to_json_score(frame_scores[self.event_type_to_id[event_type]],
+                                                  frame_integer_scores[self.event_type_to_id[event_type]]))
+                for event_type, rank in ranked[:k]]
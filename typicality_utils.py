@@ -1,19 +1,42 @@
 import os
-import json
+import csv
 import copy
+import json
+import shutil
 from operator import itemgetter
 
-from .rdf_utils import get_rdf_uri, get_rdf_label
+from .rdf_utils import get_rdf_uri, get_rdf_label, get_premon_index, get_premon
+from .utils import run_in_pool, file_sha256
+from .manifest_utils import compute_fingerprint, premon_fingerprint, read_fingerprint, write_fingerprint, remove_fingerprint
+from .io_utils import dump_data, load_data, find_data_path, detect_output_format, remove_data, OUTPUT_FORMATS
+from .instrumentation import instrumented, count, record_bytes_written
+from .shard_utils import write_sharded_lexical_lookup, sharded_lookup_exists, get_sharded_lookup_folder
+from .normalized_utils import build_lexicon_table, write_lexicon_table, build_normalized_lexical_lookup, get_lexicon_table_path
+
+LAYOUTS = ['single', 'sharded', 'normalized']
+
+# number of frames of FrameNet 1.7, i.e., the frames with a typicality score after initialize_typical_frames
+FRAMENET_NUM_FRAMES = 1221
+
+# journal path -> (size in bytes, number of updates) after the last append in this process,
+# so that appending does not read the journal to count its updates
+_journal_path_to_size_and_count = {}
 
+
+@instrumented
 def initialize_typical_frames(output_folder,
                               fn_en,
                               premon,
                               event_type,
                               overwrite=False,
+                              output_format='pretty',
                               verbose=0):
     """
     initialize a JSON file mapping all frame URIs to zero
     (can be updated later with typicality scores)
+
+    :param fn_en: english framenet in the nltk format or a FrameNetSnapshot (see framenet_snapshot.get_framenet_snapshot)
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
     """
     typical_folder = os.path.join(output_folder, 'typicality')
     if not os.path.exists(typical_folder):
@@ -23,7 +46,7 @@ def initialize_typical_frames(output_folder,
         os.mkdir(scores_folder)
 
     event_type_path = os.path.join(scores_folder, f'{event_type}.json')
-    if os.path.exists(event_type_path):
+    if find_data_path(event_type_path) is not None:
         if overwrite:
             if verbose >= 1:
                 print(f'file for {event_type} exists, but will be overwritten')
@@ -32,6 +55,8 @@ def initialize_typical_frames(output_folder,
                 print(f'file exists and will not be overwritten, exiting function.')
             return
 
+    premon = get_premon_index(premon)
+
     frame_uri_to_zero = {}
     for frame in fn_en.frames():
         label = frame.name
@@ -40,13 +65,12 @@ def initialize_typical_frames(output_folder,
                                     frame_label=label)
 
         frame_uri_to_zero[frame_rdf_uri] = 0
+    count('frames', len(frame_uri_to_zero))
 
-    with open(event_type_path, 'w') as outfile:
-        json.dump(frame_uri_to_zero,
-                  outfile,
-                  indent=4,
-                  ensure_ascii=False,
-                  sort_keys=True)
+    event_type_path = dump_data(frame_uri_to_zero,
+                                event_type_path,
+                                output_format=output_format)
+    remove_typicality_journal(output_folder, event_type)
 
     if verbose:
         print(f'initialized event type typicality JSON at {event_type_path}')
@@ -54,13 +78,37 @@ def initialize_typical_frames(output_folder,
 
 
 
+def get_typicality_frame_uri(premon, frame, frame_format='fn_label'):
+    """
+    get the PreMOn frame URI of a frame in the input of update_typical_frames
+
+    :param premon: PreMOn graph or PremonIndex, only used for fn_label
+    :param str frame_format: fn_label | premon_frame_uri
+    """
+    if frame_format == 'fn_label':
+        return get_rdf_uri(premon_nt=premon,
+                           frame_label=frame)
+
+    assert frame.startswith('http://premon.fbk.eu/resource/'), f'you provided {frame}, but it should start with http://premon.fbk.eu/resource/'
+    return frame
+
+
+@instrumented
 def update_typical_frames(output_folder,
                           premon,
                           event_type,
                           frame_to_typicality,
                           frame_format='fn_label',
+                          output_format=None,
                           verbose=0):
+    """
+    update the typicality scores of an event type
 
+    :param dict frame_to_typicality: frame -> typicality score
+    :param str frame_format: fn_label | premon_frame_uri
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data.
+    If None, the output format of the existing file is kept.
+    """
     accepted_formats = {'fn_label', 'premon_frame_uri'}
     assert frame_format in accepted_formats, f'{frame_format}'
 
@@ -70,83 +118,361 @@ def update_typical_frames(output_folder,
         os.mkdir(scores_folder)
 
     event_type_path = os.path.join(scores_folder, f'{event_type}.json')
-    if not os.path.exists(event_type_path):
+    existing_path = find_data_path(event_type_path)
+    if existing_path is None:
         print(f'{event_type_path} does not exist, please first initialize.')
         return
     else:
-        frame_to_score = json.load(open(event_type_path))
-
-    for frame, score in frame_to_typicality.items():
+        event_type_path = existing_path
+        frame_to_score = load_typicality_scores(output_folder, event_type)
 
-        if frame_format == 'fn_label':
-            rdf_uri = get_rdf_uri(premon_nt=premon,
-                                  frame_label=frame)
+    if output_format is None:
+        output_format = detect_output_format(event_type_path)
 
-        elif frame_format == 'premon_frame_uri':
-            rdf_uri = frame
-            assert rdf_uri.startswith('http://premon.fbk.eu/resource/'), f'you provided {rdf_uri}, but it should start with http://premon.fbk.eu/resource/'
+    if frame_format == 'fn_label':
+        premon = get_premon_index(premon)
 
+    for frame, score in frame_to_typicality.items():
+        rdf_uri = get_typicality_frame_uri(premon, frame, frame_format)
         frame_to_score[rdf_uri] = score
+    count('frames', len(frame_to_typicality))
+
+    event_type_path = dump_data(frame_to_score,
+                                event_type_path,
+                                output_format=output_format)
+    remove_typicality_journal(output_folder, event_type)
 
     if verbose:
         print()
         print(f'updated: {event_type_path}')
         print(f'updated scores for {len(frame_to_typicality)} frames')
 
-    with open(event_type_path, 'w') as outfile:
-        json.dump(frame_to_score,
-                  outfile,
-                  indent=4,
-                  ensure_ascii=False,
-                  sort_keys=True)
 
+def get_typicality_journal_path(output_folder, event_type):
+    """
+    get the path of the journal with the pending typicality score updates of an event type
 
+    :rtype: str
+    :return: typicality/typicality_journal/EVENT_TYPE.jsonl in the output folder
+    """
+    return os.path.join(output_folder, 'typicality', 'typicality_journal', f'{event_type}.jsonl')
 
-def create_lexical_lookup_per_eventtype(event_type,
-                                        language,
-                                        premon,
-                                        output_folder,
-                                        overwrite=False,
-                                        verbose=0):
+
+def get_compacting_journal_path(journal_path):
     """
-    create a JSON file mapping
+    get the path to which a journal is moved while it is compacted, e.g., typicality_journal/EVENT_TYPE.jsonl.compacting
+    """
+    return f'{journal_path}.compacting'
 
-    'ordered_frames'
-        list of lists
-        [
-            [typicality_score, dropdown label, PreMOn URI],
-            ..
-        ]
 
-    'lexical_lookup'
-        LEMMA
-            POS
-                [typicality_score, dropdown label, PreMON frame URI, LU_NAME, LU_URI]
-            'all_frames':
-                [PreMOn frame URI, PreMOn URI, ...]
+def _read_journal_file(journal_path, frame_to_score):
+    if os.path.exists(journal_path):
+        with open(journal_path, encoding='utf-8') as infile:
+            for line in infile:
+                if line.strip():
+                    frame_uri, score = json.loads(line)
+                    frame_to_score[frame_uri] = score
+
+
+def read_typicality_journal(output_folder, event_type):
+    """
+    read the pending typicality score updates of an event type,
+    i.e., of a journal that is being compacted (see compact_typicality_journal) and of the journal.
+    Later updates of a frame replace earlier ones.
+
+    :rtype: dict
+    :return: PreMOn frame URI -> typicality score, empty if there is no journal
+    """
+    journal_path = get_typicality_journal_path(output_folder, event_type)
+
+    frame_to_score = {}
+    _read_journal_file(get_compacting_journal_path(journal_path), frame_to_score)
+    _read_journal_file(journal_path, frame_to_score)
+
+    return frame_to_score
+
+
+def append_to_typicality_journal(output_folder, event_type, frame_to_score):
+    """
+    append typicality score updates to the journal of an event type
+
+    :param dict frame_to_score: PreMOn frame URI -> typicality score
+
+    :rtype: int
+    :return: the number of updates in the journal
+    """
+    journal_path = get_typicality_journal_path(output_folder, event_type)
+    journal_folder = os.path.dirname(journal_path)
+    if not os.path.exists(journal_folder):
+        os.mkdir(journal_folder)
+
+    lines = [json.dumps([frame_uri, score], ensure_ascii=False) + '\n'
+             for frame_uri, score in frame_to_score.items()]
+    content = ''.join(lines).encode('utf-8')
+
+    # the journal is only read if it was changed since the last append in this process, e.g., by another process.
+    # A journal that was compacted or removed in the meantime has no updates.
+    size = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+    previous_size, num_updates = _journal_path_to_size_and_count.get(journal_path, (0, 0))
+    if size != previous_size:
+        num_updates = 0
+        if os.path.exists(journal_path):
+            with open(journal_path, 'rb') as infile:
+                num_updates = sum(1 for _ in infile)
+
+    with open(journal_path, 'ab') as outfile:
+        outfile.write(content)
+    record_bytes_written(journal_path, len(content))
+
+    num_updates += len(lines)
+    _journal_path_to_size_and_count[journal_path] = (size + len(content), num_updates)
+
+    return num_updates
+
+
+def remove_typicality_journal(output_folder, event_type):
+    """
+    remove the journal of an event type and a journal that is being compacted, if existing
+    """
+    journal_path = get_typicality_journal_path(output_folder, event_type)
+    _journal_path_to_size_and_count.pop(journal_path, None)
+    for path in [journal_path, get_compacting_journal_path(journal_path)]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def load_typicality_rows(path, delimiter='\t'):
+    """
+    load the input of update_typical_frames_bulk from a table with the columns
+    event_type, frame and score (without header)
+
+    :param str path: e.g., a .tsv or .csv file
+    :param str delimiter: column delimiter, e.g., , for a csv file
+
+    :rtype: generator
+    :return: (event_type, frame, score) tuples, the score is a float
+    """
+    with open(path, encoding='utf-8', newline='') as infile:
+        for row in csv.reader(infile, delimiter=delimiter):
+            if row:
+                event_type, frame, score = row
+                yield event_type, frame, float(score)
+
+
+@instrumented
+def update_typical_frames_bulk(output_folder,
+                               premon,
+                               rows,
+                               frame_format='fn_label',
+                               journal=False,
+                               compact_threshold=10000,
+                               output_format=None,
+                               verbose=0):
+    """
+    update the typicality scores of many event types at once.
+
+    The rows are grouped per event type, so that the scores of each event type
+    are read and written only once, and the frame labels are resolved using a PremonIndex.
+
+    With journal=True, the updates are appended to the journal of each event type
+    (typicality/typicality_journal/EVENT_TYPE.jsonl) instead of rewriting the typicality scores.
+    Pending updates are used by load_typicality_scores, and are merged into the typicality scores
+    by compact_typicality_journal, update_typical_frames, or automatically once the journal
+    of an event type contains compact_threshold updates.
+
+    :param premon: PreMOn graph or PremonIndex, only used for fn_label
+    :param rows: iterable of (event_type, frame, score), e.g., a list of tuples or load_typicality_rows
+    :param str frame_format: fn_label | premon_frame_uri
+    :param bool journal: append the updates to the journals instead of rewriting the typicality scores
+    :param int compact_threshold: number of updates in a journal after which it is compacted,
+    if None, journals are never compacted automatically
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data.
+    If None, the output format of the existing file is kept.
+
+    :rtype: list
+    :return: sorted list of the updated event types
+    """
+    accepted_formats = {'fn_label', 'premon_frame_uri'}
+    assert frame_format in accepted_formats, f'{frame_format}'
+
+    if frame_format == 'fn_label':
+        premon = get_premon_index(premon)
+
+    scores_folder = os.path.join(output_folder, 'typicality', 'typicality_scores')
+
+    event_type_to_frame_to_score = {}
+    for event_type, frame, score in rows:
+        rdf_uri = get_typicality_frame_uri(premon, frame, frame_format)
+        event_type_to_frame_to_score.setdefault(event_type, {})[rdf_uri] = score
+
+    updated = []
+    num_scores = 0
+    for event_type, frame_to_typicality in sorted(event_type_to_frame_to_score.items()):
+
+        event_type_path = find_data_path(os.path.join(scores_folder, f'{event_type}.json'))
+        if event_type_path is None:
+            print(f'no typicality scores for {event_type}, please first initialize. Skipping its updates.')
+            continue
+
+        if journal:
+            journal_size = append_to_typicality_journal(output_folder, event_type, frame_to_typicality)
+            if compact_threshold is not None and journal_size >= compact_threshold:
+                compact_typicality_journal(output_folder,
+                                           event_types=[event_type],
+                                           output_format=output_format)
+        else:
+            frame_to_score = load_typicality_scores(output_folder, event_type)
+            frame_to_score.update(frame_to_typicality)
+
+            dump_data(frame_to_score,
+                      event_type_path,
+                      output_format=output_format or detect_output_format(event_type_path))
+            remove_typicality_journal(output_folder, event_type)
+
+        updated.append(event_type)
+        num_scores += len(frame_to_typicality)
+    count('frames', num_scores)
+
+    if verbose:
+        print(f'updated {num_scores} typicality scores of {len(updated)} event types')
+
+    return updated
+
+
+@instrumented
+def compact_typicality_journal(output_folder,
+                               event_types=None,
+                               output_format=None,
+                               verbose=0):
+    """
+    merge the pending updates in the journals into the typicality scores and remove the journals.
+
+    The journal is first moved to EVENT_TYPE.jsonl.compacting (see get_compacting_journal_path),
+    so that updates appended by other processes during the compaction go to a new journal instead of being lost.
+    A journal that is being compacted is used by load_typicality_scores until it is merged,
+    e.g., if a compaction was interrupted, it is merged by the next compaction.
+
+    :param event_types: iterable of event types, if None, all event types with a journal are compacted
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data.
+    If None, the output format of the existing file is kept.
+
+    :rtype: list
+    :return: sorted list of the compacted event types
+    """
+    journal_folder = os.path.dirname(get_typicality_journal_path(output_folder, ''))
+    if event_types is None:
+        event_types = []
+        if os.path.exists(journal_folder):
+            event_types = {filename.split('.jsonl')[0]
+                           for filename in os.listdir(journal_folder)
+                           if filename.endswith(('.jsonl', '.jsonl.compacting'))}
+
+    compacted = []
+    for event_type in sorted(event_types):
+        journal_path = get_typicality_journal_path(output_folder, event_type)
+        compacting_path = get_compacting_journal_path(journal_path)
+        if not any([os.path.exists(compacting_path), os.path.exists(journal_path)]):
+            continue
+
+        event_type_path = find_data_path(os.path.join(output_folder, 'typicality', 'typicality_scores', f'{event_type}.json'))
+        assert event_type_path is not None, f'no typicality scores found for event type {event_type}'
+
+        # first the journal of an interrupted compaction, then the journal
+        for move_journal in [False, True]:
+            if move_journal:
+                if not os.path.exists(journal_path):
+                    break
+                os.replace(journal_path, compacting_path)
+                _journal_path_to_size_and_count.pop(journal_path, None)
+            elif not os.path.exists(compacting_path):
+                continue
+
+            # only the moved journal is merged, updates appended since then remain pending
+            frame_to_score = load_data(event_type_path)
+            _read_journal_file(compacting_path, frame_to_score)
+            event_type_path = dump_data(frame_to_score,
+                                        event_type_path,
+                                        output_format=output_format or detect_output_format(event_type_path))
+            os.remove(compacting_path)
+
+        compacted.append(event_type)
+
+    if verbose:
+        print(f'compacted the typicality journals of {len(compacted)} event types')
+
+    return compacted
+
+
+@instrumented
+def load_lexicon(output_folder, language):
+    """
+    load lu_to_info.json and lemma_to_pos_to_lus.json of a language
 
-    :param str event_type: an event_type for which there exists typicality scores
-    :param str language: supported: nl | en
     :param str output_folder: the main folder for the lexical data
+    :param str language: supported: nl | en
+
+    :rtype: tuple
+    :return: (lu_to_info, lemma_to_pos_to_lus)
     """
     lu_to_info_path = os.path.join(output_folder, 'lexicons', language, 'lu_to_info.json')
-    assert os.path.exists(lu_to_info_path), f'no lexicon found for language ({language}). Please first create lu_to_info.json.'
+    assert find_data_path(lu_to_info_path) is not None, f'no lexicon found for language ({language}). Please first create lu_to_info.json.'
 
-    with open(lu_to_info_path) as infile:
-        lu_to_info = json.load(infile)
+    lu_to_info = load_data(lu_to_info_path)
 
     lemma_to_pos_to_lus_path = os.path.join(output_folder, 'lexicons', language, 'lemma_to_pos_to_lus.json')
-    assert os.path.exists(lemma_to_pos_to_lus_path), f'no lexicon found for language ({language}). Please first create lemma_to_pos_to_lus.json.'
+    assert find_data_path(lemma_to_pos_to_lus_path) is not None, f'no lexicon found for language ({language}). Please first create lemma_to_pos_to_lus.json.'
+
+    lemma_to_pos_to_lus = load_data(lemma_to_pos_to_lus_path)
+
+    return lu_to_info, lemma_to_pos_to_lus
+
 
-    with open(lemma_to_pos_to_lus_path) as infile:
-        lemma_to_pos_to_lus = json.load(infile)
+@instrumented
+def load_typicality_scores(output_folder, event_type):
+    """
+    load the typicality scores of an event type,
+    including the pending updates in its journal (see update_typical_frames_bulk)
 
+    :rtype: dict
+    :return: PreMOn frame URI -> typicality score
+    """
     event_type_path = os.path.join(output_folder, 'typicality', 'typicality_scores', f'{event_type}.json')
-    assert os.path.exists(event_type_path), f'no typicality scores found for event type {event_type}'
+    assert find_data_path(event_type_path) is not None, f'no typicality scores found for event type {event_type}'
+
+    frame_to_score = load_data(event_type_path)
+    frame_to_score.update(read_typicality_journal(output_folder, event_type))
+
+    return frame_to_score
+
 
-    with open(event_type_path) as infile:
-        frame_to_score = json.load(infile)
+def get_event_types(output_folder):
+    """
+    get the event types for which there are typicality scores
+
+    :rtype: list
+    :return: sorted list of event types
+    """
+    scores_folder = os.path.join(output_folder, 'typicality', 'typicality_scores')
+    if not os.path.exists(scores_folder):
+        return []
+
+    event_types = set()
+    for filename in os.listdir(scores_folder):
+        for extension in OUTPUT_FORMATS.values():
+            if filename.endswith(extension):
+                event_types.add(filename[:-len(extension)])
+
+    return sorted(event_types)
+
+
+def get_lexical_lookup_folder(output_folder, language):
+    """
+    get the folder with the lexical lookups of a language,
+    the folders are created if needed
 
+    :rtype: str
+    :return: typicality/lexical_lookup/LANGUAGE in the output folder
+    """
     lexical_lookup_dir = os.path.join(output_folder, 'typicality', 'lexical_lookup')
     if not os.path.exists(lexical_lookup_dir):
         os.mkdir(lexical_lookup_dir)
@@ -155,18 +481,207 @@ def create_lexical_lookup_per_eventtype(event_type,
     if not os.path.exists(lexical_lang_lookup_dir):
         os.mkdir(lexical_lang_lookup_dir)
 
-    lexical_lookup_path = os.path.join(lexical_lang_lookup_dir, f'{event_type}.json')
-    if all([os.path.exists(lexical_lookup_path),
-                           not overwrite]):
-        print(f'lexical look up path exists: {lexical_lookup_path}')
-        print('will not overwrite it, exiting function')
-        return
+    return lexical_lang_lookup_dir
+
+
+def get_lexical_lookup_path(output_folder, language, event_type):
+    """
+    get the path of the lexical lookup of an event type,
+    the folders are created if needed
+
+    :rtype: str
+    :return: typicality/lexical_lookup/LANGUAGE/EVENT_TYPE.json in the output folder
+    """
+    lexical_lang_lookup_dir = get_lexical_lookup_folder(output_folder, language)
+    return os.path.join(lexical_lang_lookup_dir, f'{event_type}.json')
+
+
+def get_frame_uri_to_label(premon, frame_uris):
+    """
+    get the label of each frame uri
+
+    :param premon: PreMOn graph or PremonIndex
+    :param frame_uris: iterable of PreMOn frame URIs
 
+    :rtype: dict
+    :return: PreMOn frame URI -> frame label
+    """
+    premon = get_premon_index(premon)
+    return {frame_uri: get_rdf_label(premon, frame_uri)
+            for frame_uri in frame_uris}
+
+
+def get_lexicon_table(premon, lu_to_info, lemma_to_pos_to_lus):
+    """
+    create the table shared by the normalized lexical lookups of a language (see normalized_utils.build_lexicon_table),
+    with all PreMOn frames, so that the table is the same for all event types
+
+    :param premon: PreMOn graph or PremonIndex
+
+    :rtype: dict
+    """
+    premon = get_premon_index(premon)
+    frame_uris = set(premon.frame_label_to_uri.values())
+    frame_uris.update(lu_info['frame_uri'] for lu_info in lu_to_info.values())
+
+    return build_lexicon_table(frame_uri_to_label=get_frame_uri_to_label(premon, frame_uris),
+                               lu_to_info=lu_to_info,
+                               lemma_to_pos_to_lus=lemma_to_pos_to_lus)
+
+
+def get_lexicon_fingerprint(output_folder, language):
+    """
+    compute a fingerprint of lu_to_info.json and lemma_to_pos_to_lus.json of a language
+
+    :rtype: str
+    """
+    inputs = {}
+    for filename in ['lu_to_info.json', 'lemma_to_pos_to_lus.json']:
+        path = find_data_path(os.path.join(output_folder, 'lexicons', language, filename))
+        assert path is not None, f'no lexicon found for language ({language}). Please first create {filename}.'
+        inputs[filename] = file_sha256(path)
+
+    return compute_fingerprint(inputs)
+
+
+def get_typicality_scores_fingerprint(output_folder, event_type):
+    """
+    compute a fingerprint of the typicality scores of an event type, including its journal
+
+    :rtype: str
+    """
+    event_type_path = find_data_path(os.path.join(output_folder, 'typicality', 'typicality_scores', f'{event_type}.json'))
+    assert event_type_path is not None, f'no typicality scores found for event type {event_type}'
+
+    inputs = {'typicality_scores': file_sha256(event_type_path)}
+
+    journal_path = get_typicality_journal_path(output_folder, event_type)
+    if os.path.exists(journal_path):
+        inputs['journal'] = file_sha256(journal_path)
+
+    compacting_path = get_compacting_journal_path(journal_path)
+    if os.path.exists(compacting_path):
+        inputs['compacting_journal'] = file_sha256(compacting_path)
+
+    return compute_fingerprint(inputs)
+
+
+def get_lexical_lookup_fingerprint(lexicon_fingerprint,
+                                   scores_fingerprint,
+                                   premon_fingerprint,
+                                   output_format='pretty',
+                                   layout='single',
+                                   shard_by='first_char',
+                                   num_shards=64):
+    """
+    compute the fingerprint of the inputs of the lexical lookup of an event type,
+    which is stored next to the lexical lookup (see manifest_utils.write_fingerprint)
+
+    :param str lexicon_fingerprint: see get_lexicon_fingerprint
+    :param str scores_fingerprint: see get_typicality_scores_fingerprint
+    :param str premon_fingerprint: see manifest_utils.premon_fingerprint
+
+    :rtype: str
+    """
+    return compute_fingerprint({'lexicon': lexicon_fingerprint,
+                                'typicality_scores': scores_fingerprint,
+                                'premon': premon_fingerprint,
+                                'output_format': output_format,
+                                'layout': layout,
+                                'shard_by': shard_by,
+                                'num_shards': num_shards})
+
+
+def get_dropdown_values(lu_uris, lu_to_info, frame_to_score):
+    """
+    get the ranked dropdown entries of the lexical units of a lemma and pos
+
+    :param list lu_uris: lexical unit uris, e.g., from lemma_to_pos_to_lus.json
+    :param dict lu_to_info: see load_lexicon
+    :param dict frame_to_score: PreMOn frame URI -> typicality score
+
+    :rtype: list
+    :return: list of [typicality_score, dropdown_label, frame_uri, lu_uri, lu_name, lexicon_url],
+    sorted by typicality score
+    """
+    values = []
+    for lu_uri in lu_uris:
+
+        lu_info = lu_to_info[lu_uri]
+        lu_name = lu_info['lu_name']
+        lexicon_url = lu_info['lexicon_uri']
+
+        frame_uri = lu_info['frame_uri']
+        frame_label = lu_info['frame_label']
+        typicality_score = frame_to_score[frame_uri]
+
+        dropdown_label = f'{frame_label} ({lu_name}) ({typicality_score})'
+
+        values.append([typicality_score,
+                       dropdown_label,
+                       frame_uri,
+                       lu_uri,
+                       lu_name,
+                       lexicon_url])
+
+    values.sort(key=itemgetter(0),
+                reverse=True)
+
+    return values
+
+
+def build_lemma_lookup(pos_to_lu_uris, lu_to_info, frame_to_score):
+    """
+    get the entry of a lemma in the lexical lookup of an event type
+
+    :param dict pos_to_lu_uris: the value of a lemma in lemma_to_pos_to_lus.json
+
+    :rtype: dict
+    :return: POS -> ranked dropdown entries (see get_dropdown_values), and 'all_frames' -> sorted list of frame uris
+    """
+    pos_to_dropdown = {}
+    frames_for_lemma = set()
+
+    for pos, lu_uris in pos_to_lu_uris.items():
+        values = get_dropdown_values(lu_uris=lu_uris,
+                                     lu_to_info=lu_to_info,
+                                     frame_to_score=frame_to_score)
+        pos_to_dropdown[pos] = values
+
+        frames_for_lemma.update(value[2] for value in values)
+
+    # list of 'all_frames'
+    pos_to_dropdown['all_frames'] = sorted(frames_for_lemma)
+
+    return pos_to_dropdown
+
+
+@instrumented
+def build_lexical_lookup(frame_to_score,
+                         frame_uri_to_label,
+                         lu_to_info,
+                         lemma_to_pos_to_lus,
+                         expected_num_frames=FRAMENET_NUM_FRAMES):
+    """
+    create the lexical lookup of one event type,
+    see create_lexical_lookup_per_eventtype for the format
+
+    :param dict frame_to_score: PreMOn frame URI -> typicality score
+    :param dict frame_uri_to_label: PreMOn frame URI -> frame label, see get_frame_uri_to_label
+    :param dict lu_to_info: see load_lexicon
+    :param dict lemma_to_pos_to_lus: see load_lexicon
+    :param int expected_num_frames: the number of frames with a typicality score,
+    if None, it is not checked, e.g., for a synthetic FrameNet
+
+    :rtype: dict
+    """
+    if expected_num_frames is not None:
+        assert len(frame_to_score) == expected_num_frames, f'expected {expected_num_frames} frames, got {len(frame_to_score)}'
 
     # get frame uri -> frame label
     frame_uri_to_info = {}
     for frame_uri, score in frame_to_score.items():
-        label = get_rdf_label(premon, frame_uri)
+        label = frame_uri_to_label[frame_uri]
         frame_uri_to_info[frame_uri] = [score,
                                         f'{label} ({score})',
                                         frame_uri]
@@ -177,62 +692,390 @@ def create_lexical_lookup_per_eventtype(event_type,
                         reverse=True)
 
     lemma_to_pos_to_dropdown = {}
-    all_frames = set(frame_uri_to_info)
-    assert len(all_frames) == 1221
 
     for lemma, pos_to_lu_uris in lemma_to_pos_to_lus.items():
-        lemma_to_pos_to_dropdown[lemma] = {}
-        frames_for_lemma = set()
+        lemma_to_pos_to_dropdown[lemma] = build_lemma_lookup(pos_to_lu_uris=pos_to_lu_uris,
+                                                             lu_to_info=lu_to_info,
+                                                             frame_to_score=frame_to_score)
+    count('frames', len(frame_to_score))
+    count('lus', len(lu_to_info))
 
-        for pos, lu_uris in pos_to_lu_uris.items():
+    the_json = {
+        'ordered_frames' : ordered_frames,
+        'lexical_lookup' : lemma_to_pos_to_dropdown
+    }
 
-            values = []
-            for lu_uri in lu_uris:
+    return the_json
 
-                lu_info = lu_to_info[lu_uri]
-                lu_name = lu_info['lu_name']
-                lexicon_url = lu_info['lexicon_uri']
 
-                frame_uri = lu_info['frame_uri']
-                frame_label = lu_info['frame_label']
-                typicality_score = frame_to_score[frame_uri]
+def lexical_lookup_exists(lexical_lookup_path):
+    """
+    check whether a lexical lookup exists in any output format or layout,
+    for the normalized layout, the table of the language is not checked
+    """
+    return any([find_data_path(lexical_lookup_path) is not None,
+                sharded_lookup_exists(lexical_lookup_path)])
 
-                dropdown_label = f'{frame_label} ({lu_name}) ({typicality_score})'
 
-                values.append([typicality_score,
-                               dropdown_label,
-                               frame_uri,
-                               lu_uri,
-                               lu_name,
-                               lexicon_url])
+@instrumented
+def write_lexical_lookup(the_json,
+                         lexical_lookup_path,
+                         output_format='pretty',
+                         layout='single',
+                         shard_by='first_char',
+                         num_shards=64):
+    """
+    write a lexical lookup, the lexical lookup in the other layout is removed
 
-                frames_for_lemma.add(frame_uri)
+    :param dict the_json: the lexical lookup, see normalized_utils.build_normalized_lexical_lookup for the normalized layout
+    :param str layout: single | sharded | normalized, see shard_utils.write_sharded_lexical_lookup for the sharded layout.
+    The normalized layout is written to the same path as the single layout.
+    :param str shard_by: first_char | hash, only used for the sharded layout
+    :param int num_shards: number of shards if shard_by is hash
 
-            values.sort(key=itemgetter(0),
-                        reverse=True)
+    :rtype: str
+    :return: the path of the written file, the index for the sharded layout
+    """
+    assert layout in LAYOUTS, f'{layout} is not supported: {" | ".join(LAYOUTS)}'
 
-            lemma_to_pos_to_dropdown[lemma][pos] = values
+    if layout == 'sharded':
+        remove_data(lexical_lookup_path)
+        return write_sharded_lexical_lookup(the_json,
+                                            lexical_lookup_path,
+                                            output_format=output_format,
+                                            shard_by=shard_by,
+                                            num_shards=num_shards)
 
-        # list of 'all_frames'
-        lemma_to_pos_to_dropdown[lemma]['all_frames'] = list(frames_for_lemma)
+    sharded_folder = get_sharded_lookup_folder(lexical_lookup_path)
+    if os.path.exists(sharded_folder):
+        shutil.rmtree(sharded_folder)
 
-    the_json = {
-        'ordered_frames' : ordered_frames,
-        'lexical_lookup' : lemma_to_pos_to_dropdown
+    return dump_data(the_json,
+                     lexical_lookup_path,
+                     output_format=output_format)
+
+
+@instrumented
+def create_lexical_lookup_per_eventtype(event_type,
+                                        language,
+                                        premon,
+                                        output_folder,
+                                        overwrite=False,
+                                        output_format='pretty',
+                                        layout='single',
+                                        shard_by='first_char',
+                                        num_shards=64,
+                                        expected_num_frames=FRAMENET_NUM_FRAMES,
+                                        verbose=0):
+    """
+    create a JSON file mapping
+
+    'ordered_frames'
+        list of lists
+        [
+            [typicality_score, dropdown label, PreMOn URI],
+            ..
+        ]
+
+    'lexical_lookup'
+        LEMMA
+            POS
+                [typicality_score, dropdown label, PreMON frame URI, LU_NAME, LU_URI]
+            'all_frames':
+                [PreMOn frame URI, PreMOn URI, ...]
+
+    :param str event_type: an event_type for which there exists typicality scores
+    :param str language: supported: nl | en
+    :param str output_folder: the main folder for the lexical data
+    For the normalized layout, the file only contains the IDs and the typicality scores of the frames
+    (see normalized_utils.build_normalized_lexical_lookup),
+    and the frames and lexical units are written once per language to typicality/lexical_lookup/LANGUAGE/lexicon_table.json
+
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
+    :param str layout: single | sharded | normalized, see write_lexical_lookup
+    :param str shard_by: first_char | hash, only used for the sharded layout
+    :param int num_shards: number of shards if shard_by is hash
+    :param int expected_num_frames: the number of frames with a typicality score, see build_lexical_lookup
+    """
+    lu_to_info, lemma_to_pos_to_lus = load_lexicon(output_folder, language)
+
+    frame_to_score = load_typicality_scores(output_folder, event_type)
+
+    lexical_lookup_path = get_lexical_lookup_path(output_folder, language, event_type)
+    if all([lexical_lookup_exists(lexical_lookup_path),
+                           not overwrite]):
+        print(f'lexical look up path exists: {lexical_lookup_path}')
+        print('will not overwrite it, exiting function')
+        return
+
+    premon = get_premon_index(premon)
+
+    if layout == 'normalized':
+        table = get_lexicon_table(premon, lu_to_info, lemma_to_pos_to_lus)
+        write_lexicon_table(table,
+                            get_lexical_lookup_folder(output_folder, language),
+                            output_format=output_format)
+        the_json = build_normalized_lexical_lookup(frame_to_score, table)
+    else:
+        frame_uri_to_label = get_frame_uri_to_label(premon, frame_to_score)
+        the_json = build_lexical_lookup(frame_to_score=frame_to_score,
+                                        frame_uri_to_label=frame_uri_to_label,
+                                        lu_to_info=lu_to_info,
+                                        lemma_to_pos_to_lus=lemma_to_pos_to_lus,
+                                        expected_num_frames=expected_num_frames)
+
+    fingerprint = get_lexical_lookup_fingerprint(lexicon_fingerprint=get_lexicon_fingerprint(output_folder, language),
+                                                 scores_fingerprint=get_typicality_scores_fingerprint(output_folder, event_type),
+                                                 premon_fingerprint=premon_fingerprint(premon),
+                                                 output_format=output_format,
+                                                 layout=layout,
+                                                 shard_by=shard_by,
+                                                 num_shards=num_shards)
+    remove_fingerprint(lexical_lookup_path)
+
+    written_path = write_lexical_lookup(the_json,
+                                        lexical_lookup_path,
+                                        output_format=output_format,
+                                        layout=layout,
+                                        shard_by=shard_by,
+                                        num_shards=num_shards)
+    # removed before and written after the lexical lookup, so that an interrupted write is regenerated
+    # by refresh_lexical_lookups
+    write_fingerprint(lexical_lookup_path, fingerprint)
+
+    if verbose:
+        print(f'written lexical lookup for {event_type} to {written_path}')
+
+
+def _create_lexical_lookups_of_chunk(state, event_type_indices):
+    """
+    create the lexical lookups of the event types in state['event_types'] with the provided indices
+
+    :rtype: list
+    :return: the event types for which a lexical lookup was written
+    """
+    output_folder = state['output_folder']
+    language = state['language']
+
+    written = []
+    for event_type_index in event_type_indices:
+        event_type = state['event_types'][event_type_index]
+
+        lexical_lookup_path = get_lexical_lookup_path(output_folder, language, event_type)
+        if lexical_lookup_exists(lexical_lookup_path) and not state['overwrite']:
+            continue
+
+        frame_to_score = load_typicality_scores(output_folder, event_type)
+
+        if state['layout'] == 'normalized':
+            the_json = build_normalized_lexical_lookup(frame_to_score, state['table'])
+        else:
+            # frames that are not in the shared labels, e.g., if the score files contain different frames
+            frame_uri_to_label = state['frame_uri_to_label']
+            missing_frame_uris = set(frame_to_score) - set(frame_uri_to_label)
+            if missing_frame_uris:
+                frame_uri_to_label = dict(frame_uri_to_label)
+                frame_uri_to_label.update(get_frame_uri_to_label(state['premon'], missing_frame_uris))
+
+            the_json = build_lexical_lookup(frame_to_score=frame_to_score,
+                                            frame_uri_to_label=frame_uri_to_label,
+                                            lu_to_info=state['lu_to_info'],
+                                            lemma_to_pos_to_lus=state['lemma_to_pos_to_lus'],
+                                            expected_num_frames=state['expected_num_frames'])
+
+        fingerprint = get_lexical_lookup_fingerprint(lexicon_fingerprint=state['lexicon_fingerprint'],
+                                                     scores_fingerprint=get_typicality_scores_fingerprint(output_folder, event_type),
+                                                     premon_fingerprint=state['premon_fingerprint'],
+                                                     output_format=state['output_format'],
+                                                     layout=state['layout'],
+                                                     shard_by=state['shard_by'],
+                                                     num_shards=state['num_shards'])
+        remove_fingerprint(lexical_lookup_path)
+
+        write_lexical_lookup(the_json,
+                             lexical_lookup_path,
+                             output_format=state['output_format'],
+                             layout=state['layout'],
+                             shard_by=state['shard_by'],
+                             num_shards=state['num_shards'])
+        write_fingerprint(lexical_lookup_path, fingerprint)
+        written.append(event_type)
+
+    return written
+
+
+@instrumented
+def create_lexical_lookups(language,
+                           premon,
+                           output_folder,
+                           event_types=None,
+                           overwrite=False,
+                           workers=1,
+                           output_format='pretty',
+                           layout='single',
+                           shard_by='first_char',
+                           num_shards=64,
+                           expected_num_frames=FRAMENET_NUM_FRAMES,
+                           verbose=0):
+    """
+    create the lexical lookups of many event types,
+    see create_lexical_lookup_per_eventtype for the format.
+
+    The lexicon of the language is loaded and the frame labels are resolved only once
+    for all event types. For the normalized layout, the table of the language is also written only once.
+
+    :param str language: supported: nl | en
+    :param premon: PreMOn graph or PremonIndex
+    :param str output_folder: the main folder for the lexical data
+    :param event_types: iterable of event types, if None, all event types
+    in typicality/typicality_scores are used
+    :param bool overwrite: if False, existing lexical lookups are not recreated
+    :param int workers: number of processes over which the event types are divided
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
+    :param str layout: single | sharded | normalized, see write_lexical_lookup
+    :param str shard_by: first_char | hash, only used for the sharded layout
+    :param int num_shards: number of shards if shard_by is hash
+    :param int expected_num_frames: the number of frames with a typicality score, see build_lexical_lookup
+
+    :rtype: list
+    :return: the event types for which a lexical lookup was written
+    """
+    if event_types is None:
+        event_types = get_event_types(output_folder)
+    event_types = list(event_types)
+
+    lu_to_info, lemma_to_pos_to_lus = load_lexicon(output_folder, language)
+
+    premon = get_premon_index(premon)
+
+    # create the folders before the workers do
+    lexical_lookup_folder = get_lexical_lookup_folder(output_folder, language)
+
+    frame_uri_to_label = {}
+    table = None
+    if layout == 'normalized':
+        table = get_lexicon_table(premon, lu_to_info, lemma_to_pos_to_lus)
+        write_lexicon_table(table,
+                            lexical_lookup_folder,
+                            output_format=output_format)
+    elif event_types:
+        frame_to_score = load_typicality_scores(output_folder, event_types[0])
+        frame_uri_to_label = get_frame_uri_to_label(premon, frame_to_score)
+
+    state = {
+        'event_types': event_types,
+        'output_folder': output_folder,
+        'language': language,
+        'premon': premon,
+        'overwrite': overwrite,
+        'output_format': output_format,
+        'layout': layout,
+        'shard_by': shard_by,
+        'num_shards': num_shards,
+        'expected_num_frames': expected_num_frames,
+        'frame_uri_to_label': frame_uri_to_label,
+        'table': table,
+        'lexicon_fingerprint': get_lexicon_fingerprint(output_folder, language),
+        'premon_fingerprint': premon_fingerprint(premon),
+        'lu_to_info': lu_to_info,
+        'lemma_to_pos_to_lus': lemma_to_pos_to_lus
     }
 
-    with open(lexical_lookup_path, 'w') as outfile:
-        json.dump(the_json,
-                  outfile,
-                  indent=4,
-                  ensure_ascii=False,
-                  sort_keys=True)
+    written = []
+    for chunk_result in run_in_pool(_create_lexical_lookups_of_chunk,
+                                    num_items=len(event_types),
+                                    state=state,
+                                    workers=workers):
+        written.extend(chunk_result)
 
     if verbose:
-        print(f'written lexical lookup for {event_type} to {lexical_lookup_path}')
+        print(f'written lexical lookups for {len(written)} of {len(event_types)} event types')
+
+    return written
+
+
+@instrumented
+def refresh_lexical_lookups(output_folder,
+                            language,
+                            premon=None,
+                            event_types=None,
+                            workers=1,
+                            output_format='pretty',
+                            layout='single',
+                            shard_by='first_char',
+                            num_shards=64,
+                            expected_num_frames=FRAMENET_NUM_FRAMES,
+                            verbose=0):
+    """
+    only recreate the lexical lookups of which the inputs changed,
+    i.e., the typicality scores of the event type, lu_to_info.json and lemma_to_pos_to_lus.json of the language,
+    PreMOn, or the output format and layout.
 
+    The fingerprint of the inputs of each lexical lookup is stored next to it,
+    e.g., typicality/lexical_lookup/nl/Q40231.fingerprint
 
+    :param str output_folder: the main folder for the lexical data
+    :param str language: supported: nl | en
+    :param premon: PreMOn graph or PremonIndex, if None, LexicalDataD2TAnnotationTool.premon is used
+    :param event_types: iterable of event types, if None, all event types
+    in typicality/typicality_scores are used
+    :param int workers: number of processes over which the stale event types are divided
+    :param str output_format: pretty | minified | gzip | msgpack, see io_utils.dump_data
+    :param str layout: single | sharded | normalized, see write_lexical_lookup
+    :param str shard_by: first_char | hash, only used for the sharded layout
+    :param int num_shards: number of shards if shard_by is hash
+    :param int expected_num_frames: the number of frames with a typicality score, see build_lexical_lookup
+
+    :rtype: list
+    :return: the event types for which a lexical lookup was written
+    """
+    if premon is None:
+        premon = get_premon()
+    premon = get_premon_index(premon)
+
+    if event_types is None:
+        event_types = get_event_types(output_folder)
+    event_types = list(event_types)
 
+    lexicon_fingerprint = get_lexicon_fingerprint(output_folder, language)
+    the_premon_fingerprint = premon_fingerprint(premon)
 
+    stale_event_types = []
+    for event_type in event_types:
+        lexical_lookup_path = get_lexical_lookup_path(output_folder, language, event_type)
+        fingerprint = get_lexical_lookup_fingerprint(lexicon_fingerprint=lexicon_fingerprint,
+                                                     scores_fingerprint=get_typicality_scores_fingerprint(output_folder, event_type),
+                                                     premon_fingerprint=the_premon_fingerprint,
+                                                     output_format=output_format,
+                                                     layout=layout,
+                                                     shard_by=shard_by,
+                                                     num_shards=num_shards)
 
+        if not lexical_lookup_exists(lexical_lookup_path) or read_fingerprint(lexical_lookup_path) != fingerprint:
+            stale_event_types.append(event_type)
+
+    # the normalized lexical lookups can not be used without the table of the language
+    if layout == 'normalized':
+        table_path = get_lexicon_table_path(get_lexical_lookup_folder(output_folder, language))
+        if find_data_path(table_path) is None:
+            stale_event_types = event_types
+
+    written = []
+    if stale_event_types:
+        written = create_lexical_lookups(language=language,
+                                         premon=premon,
+                                         output_folder=output_folder,
+                                         event_types=stale_event_types,
+                                         overwrite=True,
+                                         workers=workers,
+                                         output_format=output_format,
+                                         layout=layout,
+                                         shard_by=shard_by,
+                                         num_shards=num_shards,
+                                         expected_num_frames=expected_num_frames)
+
+    if verbose:
+        print(f'{len(event_types) - len(stale_event_types)} of {len(event_types)} lexical lookups are up to date, '
+              f'recreated {len(written)}')
 
+    return written
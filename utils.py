@@ -1,5 +1,16 @@
 import os
 import shutil
+import hashlib
+import multiprocessing
+
+try:
+    from .instrumentation import collect_worker_stats, merge_worker_stats
+except ImportError:
+    # imported as a top-level module, e.g., by rdf_utils in install.sh
+    from instrumentation import collect_worker_stats, merge_worker_stats
+
+# state shared with the processes of run_in_pool, inherited when they are forked
+_pool_state = None
 
 
 def remove_and_create_folder(fldr):
@@ -8,4 +19,55 @@ def remove_and_create_folder(fldr):
     """
     if  os.path.exists(fldr):
         shutil.rmtree(fldr)
-    os.mkdir(fldr)
\ No newline at end of file
+    os.mkdir(fldr)
+
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    Compute the sha256 hexdigest of the content of a file.
+    """
+    sha = hashlib.sha256()
+    with open(path, 'rb') as infile:
+        for chunk in iter(lambda: infile.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _call_with_pool_state(function_and_chunk):
+    function, chunk = function_and_chunk
+    return collect_worker_stats(function, _pool_state, chunk)
+
+
+def run_in_pool(function, num_items, state, workers=1):
+    """
+    Split range(num_items) into contiguous chunks and call function(state, chunk) for each chunk.
+
+    With workers > 1, the chunks are divided over a pool of forked processes,
+    which inherit a read-only copy of state instead of receiving it pickled.
+    If forking is not supported on the platform, the chunks are processed sequentially.
+
+    The results are returned in the order of the chunks,
+    so the outcome does not depend on the number of workers.
+    The statistics of the processes are added to the active instrumentation report, if any.
+    """
+    if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return [function(state, range(num_items))]
+
+    global _pool_state
+
+    num_chunks = min(num_items, workers * 4)
+    chunks = [range(i * num_items // num_chunks, (i + 1) * num_items // num_chunks)
+              for i in range(num_chunks)]
+
+    _pool_state = state
+    try:
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            results_and_stats = pool.map(_call_with_pool_state,
+                                         [(function, chunk) for chunk in chunks])
+    finally:
+        _pool_state = None
+
+    results = []
+    for result, stage_to_stats in results_and_stats:
+        merge_worker_stats(stage_to_stats)
+        results.append(result)
+    return results